@@ -0,0 +1,68 @@
+"""
+Compares time and peak memory of preprocessing_utils.label_encode against the CategoricalEncoder.
+
+Usage: python -m benchmarks.benchmark_encoder --rows 10000 100000 --cols 8
+"""
+import argparse
+import time
+import tracemalloc
+from typing import Callable, Tuple
+
+import numpy as np
+
+from entity_embeddings.encoder import CategoricalEncoder
+from entity_embeddings.util import preprocessing_utils
+from entity_embeddings.util.dataframe_utils import create_random_dataframe
+
+COLUMNS = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+
+
+def make_mixed_dataframe(rows: int, cols: int):
+    df = create_random_dataframe(rows, cols, COLUMNS[:cols])
+    for column in df.columns[::2]:
+        df[column] = np.char.add('level_', df[column].values.astype(str)).astype(object)
+
+    return df
+
+
+def label_encoder(df, target):
+    X, _ = preprocessing_utils.get_X_y_columnar(df, target)
+    return preprocessing_utils.label_encode(np.column_stack(X))
+
+
+def categorical_encoder(df, target):
+    X, _ = preprocessing_utils.get_X_y_columnar(df, target)
+    return CategoricalEncoder().fit_transform(X, [column for column in df.columns if column != target])
+
+
+def measure(function: Callable, *args) -> Tuple[float, int]:
+    tracemalloc.start()
+    start = time.perf_counter()
+    function(*args)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return elapsed, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='+', default=[10000, 100000, 1000000])
+    parser.add_argument('--cols', type=int, default=8)
+    args = parser.parse_args()
+
+    print('%10s %16s %16s %16s %16s' % ('rows', 'label_encode s', 'peak MB', 'factorize s', 'peak MB'))
+    for rows in args.rows:
+        df = make_mixed_dataframe(rows, args.cols)
+        target = df.columns[-1]
+
+        legacy_time, legacy_peak = measure(label_encoder, df, target)
+        new_time, new_peak = measure(categorical_encoder, df, target)
+
+        print('%10d %16.3f %16.1f %16.3f %16.1f' % (rows, legacy_time, legacy_peak / 2 ** 20,
+                                                    new_time, new_peak / 2 ** 20))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+"""
+Compares the build and training step times of the per-column embedding network against the fused one.
+
+Usage: python -m benchmarks.benchmark_fused_embeddings --cols 10 50 200 --batch-size 128
+"""
+import argparse
+import time
+
+import numpy as np
+
+from entity_embeddings.config import Config
+from entity_embeddings.network.network import EmbeddingNetwork
+from entity_embeddings.processor.target_type import TargetType
+
+
+def make_config(cols: int, rows: int, unique_values: int, batch_size: int, fused: bool) -> Config:
+    X = np.random.randint(0, unique_values, size=(rows, cols))
+    y = np.random.randint(0, 2, size=rows)
+
+    return Config.make_default_config_from_arrays(X=X,
+                                                  y=y,
+                                                  target_type=TargetType.BINARY_CLASSIFICATION,
+                                                  train_ratio=0.9,
+                                                  batch_size=batch_size,
+                                                  fused_embeddings=fused)
+
+
+def measure(config: Config, steps: int):
+    start = time.perf_counter()
+    network = EmbeddingNetwork(config)
+    build_time = time.perf_counter() - start
+
+    X, y = config.df.drop(columns=config.target_name).values, config.df[config.target_name].values
+    X_batch = network._inputs_for_fit(X[:config.batch_size])
+    y_batch = y[:config.batch_size]
+
+    # the first step builds the training function, so it is left out of the measure
+    network.model.train_on_batch(X_batch, y_batch)
+
+    start = time.perf_counter()
+    for _ in range(steps):
+        network.model.train_on_batch(X_batch, y_batch)
+    step_time = (time.perf_counter() - start) / steps
+
+    return build_time, step_time
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--cols', type=int, nargs='+', default=[10, 50, 200])
+    parser.add_argument('--unique-values', type=int, default=100)
+    parser.add_argument('--batch-size', type=int, default=128)
+    parser.add_argument('--steps', type=int, default=50)
+    args = parser.parse_args()
+
+    print('%6s %16s %16s %16s %16s %10s' % ('cols', 'per-column build', 'step ms', 'fused build', 'step ms', 'speedup'))
+    for cols in args.cols:
+        results = []
+        for fused in (False, True):
+            config = make_config(cols, args.batch_size * 2, args.unique_values, args.batch_size, fused)
+            results.append(measure(config, args.steps))
+
+        (column_build, column_step), (fused_build, fused_step) = results
+        print('%6d %16.3f %16.3f %16.3f %16.3f %9.1fx' % (cols, column_build, column_step * 1000,
+                                                          fused_build, fused_step * 1000, column_step / fused_step))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""
+Compares the throughput (rows/sec) of preprocessing_utils.get_X_y against preprocessing_utils.get_X_y_columnar.
+
+Usage: python -m benchmarks.benchmark_get_X_y --rows 10000 100000 --cols 8
+"""
+import argparse
+import time
+from typing import Callable
+
+from entity_embeddings.util import preprocessing_utils
+from entity_embeddings.util.dataframe_utils import create_random_dataframe
+
+COLUMNS = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+
+
+def row_wise(df, target):
+    X, y = preprocessing_utils.get_X_y(df, target)
+    return preprocessing_utils.label_encode(X)
+
+
+def columnar(df, target):
+    X, y = preprocessing_utils.get_X_y_columnar(df, target)
+    return preprocessing_utils.label_encode_columns(X)
+
+
+def best_time(function: Callable, repeat: int, *args) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function(*args)
+        timings.append(time.perf_counter() - start)
+
+    return min(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='+', default=[1000, 10000, 100000])
+    parser.add_argument('--cols', type=int, default=8)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    columns = COLUMNS[:args.cols]
+    target = columns[-1]
+
+    print('%10s %20s %20s %10s' % ('rows', 'row-wise rows/sec', 'columnar rows/sec', 'speedup'))
+    for rows in args.rows:
+        df = create_random_dataframe(rows, args.cols, columns)
+
+        row_wise_time = best_time(row_wise, args.repeat, df, target)
+        columnar_time = best_time(columnar, args.repeat, df, target)
+
+        print('%10d %20.0f %20.0f %9.1fx' % (rows,
+                                             rows / row_wise_time,
+                                             rows / columnar_time,
+                                             row_wise_time / columnar_time))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+"""
+Measures the import time, peak memory and loaded backends of each entry point of the package, in fresh interpreters.
+
+Usage: python -m benchmarks.benchmark_import_time --repeats 5 --output imports.json
+       python -m benchmarks.benchmark_import_time --package-path ../previous --output previous.json
+       python -m benchmarks.benchmark_import_time --compare previous.json
+"""
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from typing import Dict, List
+
+import numpy as np
+
+from entity_embeddings.artifacts import EmbeddingArtifacts, save_artifacts
+from entity_embeddings.encoder import ColumnVocabulary, Vocabulary
+
+HEAVY_MODULES = ('tensorflow', 'keras', 'sklearn', 'scipy', 'matplotlib', 'pandas')
+
+# each scenario is run after the interpreter started, by the code below
+SCENARIOS = {'python': 'pass',
+             'package': 'import entity_embeddings',
+             'inference': 'from entity_embeddings.inference import EmbeddingStore\n'
+                          'EmbeddingStore.load(ARTIFACTS_PATH).transform_row(["x", 10])',
+             'config': 'from entity_embeddings import Config',
+             'training': 'from entity_embeddings import Embedder'}
+
+CHILD_TEMPLATE = '''
+import json, resource, sys, time
+ARTIFACTS_PATH = %(artifacts_path)r
+start = time.perf_counter()
+%(code)s
+seconds = time.perf_counter() - start
+peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * (1 if sys.platform == 'darwin' else 1024)
+print(json.dumps({'seconds': seconds, 'peak_bytes': peak,
+                  'loaded': [name for name in %(heavy)r if name in sys.modules]}))
+'''
+
+
+def make_artifacts(path: str) -> None:
+    vocabulary = Vocabulary([ColumnVocabulary('A', np.array(['x', 'y', 'z'])),
+                             ColumnVocabulary('B', np.array([10, 20]))])
+    save_artifacts(EmbeddingArtifacts.from_weights([np.random.rand(3, 2), np.random.rand(2, 3)], vocabulary), path)
+
+
+def run_scenario(code: str, package_path: str, artifacts_path: str) -> Dict:
+    """
+    Used to run a scenario in a fresh interpreter
+    :return: the seconds, the peak bytes and the heavy modules loaded, as reported by the interpreter
+    """
+    environment = dict(os.environ, PYTHONPATH=os.pathsep.join([package_path, os.environ.get('PYTHONPATH', '')]))
+    child = CHILD_TEMPLATE % {'artifacts_path': artifacts_path, 'code': code, 'heavy': HEAVY_MODULES}
+
+    output = subprocess.run([sys.executable, '-c', child], env=environment, stdout=subprocess.PIPE,
+                            stderr=subprocess.PIPE, universal_newlines=True)
+    if output.returncode != 0:
+        return {'error': output.stderr.strip().splitlines()[-1]}
+
+    return json.loads(output.stdout.strip().splitlines()[-1])
+
+
+def compare_results(results: List[Dict], baseline: List[Dict]) -> None:
+    previous = {result['scenario']: result for result in baseline}
+
+    print('\n%-12s %12s %12s %16s %16s' % ('scenario', 'seconds', 'before', 'peak MB', 'before'))
+    for result in results:
+        before = previous.get(result['scenario'])
+        if before is None or 'error' in result or 'error' in before:
+            continue
+
+        print('%-12s %12.3f %12.3f %16.1f %16.1f' % (result['scenario'], result['seconds'], before['seconds'],
+                                                     result['peak_bytes'] / 2 ** 20, before['peak_bytes'] / 2 ** 20))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scenarios', nargs='+', choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument('--repeats', type=int, default=5, help='the median of this many runs is kept for each one')
+    parser.add_argument('--package-path', default=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                        help='the directory holding the entity_embeddings package to be measured')
+    parser.add_argument('--output', default='benchmark_import_time.json')
+    parser.add_argument('--compare', help='the results of a previous run, to be compared against')
+    args = parser.parse_args()
+
+    artifacts_path = tempfile.mkdtemp(prefix='benchmark_import_time_')
+    results = []
+    try:
+        make_artifacts(artifacts_path)
+
+        print('%-12s %12s %12s   %s' % ('scenario', 'seconds', 'peak MB', 'heavy modules loaded'))
+        for scenario in args.scenarios:
+            runs = [run_scenario(SCENARIOS[scenario], args.package_path, artifacts_path) for _ in range(args.repeats)]
+            if 'error' in runs[0]:
+                print('%-12s %s' % (scenario, runs[0]['error']))
+                results.append({'scenario': scenario, 'error': runs[0]['error']})
+                continue
+
+            result = {'scenario': scenario,
+                      'seconds': float(np.median([run['seconds'] for run in runs])),
+                      'peak_bytes': int(np.median([run['peak_bytes'] for run in runs])),
+                      'loaded': runs[0]['loaded']}
+            results.append(result)
+
+            print('%-12s %12.3f %12.1f   %s' % (scenario, result['seconds'], result['peak_bytes'] / 2 ** 20,
+                                                ', '.join(result['loaded']) or '-'))
+    finally:
+        shutil.rmtree(artifacts_path, ignore_errors=True)
+
+    with open(args.output, 'w') as f:
+        json.dump({'package_path': args.package_path, 'results': results}, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare_results(results, json.load(f)['results'])
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,51 @@
+"""
+Measures how CategoricalEncoder.fit_transform scales with the number of thread and process workers.
+
+Usage: python -m benchmarks.benchmark_parallel_encoding --rows 100000 --cols 300 --workers 1 2 4 8
+"""
+import argparse
+import os
+import time
+from typing import List
+
+import numpy as np
+
+from entity_embeddings.encoder import CategoricalEncoder
+
+
+def make_wide_columns(rows: int, cols: int) -> List[np.ndarray]:
+    random_state = np.random.RandomState(0)
+    columns = [random_state.randint(0, 10 ** (1 + index % 4), rows) for index in range(cols)]
+
+    return [np.char.add('level_', column.astype(str)).astype(object) if index % 2 else column
+            for index, column in enumerate(columns)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--cols', type=int, default=300)
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    X = make_wide_columns(args.rows, args.cols)
+    names = ['column_%d' % index for index in range(args.cols)]
+
+    print('%d rows, %d columns, %d cores' % (args.rows, len(names), os.cpu_count()))
+    print('%8s %12s %10s %12s %10s' % ('workers', 'threads s', 'speedup', 'processes s', 'speedup'))
+
+    baseline = None
+    for workers in args.workers:
+        elapsed = []
+        for use_multiprocessing in (False, True):
+            start = time.perf_counter()
+            CategoricalEncoder(workers=workers, use_multiprocessing=use_multiprocessing).fit_transform(X, names)
+            elapsed.append(time.perf_counter() - start)
+
+        baseline = baseline or elapsed[0]
+        print('%8d %12.3f %10.2f %12.3f %10.2f' % (workers, elapsed[0], baseline / elapsed[0],
+                                                    elapsed[1], baseline / elapsed[1]))
+
+
+if __name__ == '__main__':
+    main()
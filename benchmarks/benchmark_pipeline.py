@@ -0,0 +1,236 @@
+"""
+Measures the time and the peak traced memory of each stage of the embedding pipeline, failing when a stage regressed
+against a previous run.
+
+Usage: python -m benchmarks.benchmark_pipeline --rows 10000 100000 --cols 10 --cardinality 100 --output results.json
+       python -m benchmarks.benchmark_pipeline --rows 10000 --compare baseline.json --tolerance 0.2
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable, Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from entity_embeddings.config import Config
+from entity_embeddings.encoder import CategoricalEncoder
+from entity_embeddings.options import SamplingOptions
+from entity_embeddings.processor.target_type import TargetType
+from entity_embeddings.util import preprocessing_utils
+from entity_embeddings.util.sampling_utils import Sampling
+
+RESULTS_FORMAT_VERSION = 1
+TARGET_NAME = 'target'
+
+# the stages faster and lighter than these are too noisy to be compared
+MIN_COMPARED_SECONDS = 0.01
+MIN_COMPARED_BYTES = 2 ** 20
+
+PREPROCESSING_STAGES = ['get_X_y', 'get_X_y_columnar', 'label_encode', 'categorical_encoder', 'transpose_to_list']
+MODEL_STAGES = ['build_network', 'fit_epoch', 'get_weights', 'save_embeddings', 'plot_history', 'visualizations']
+STAGES = PREPROCESSING_STAGES + MODEL_STAGES
+
+
+def make_dataframe(rows: int, cols: int, cardinality: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Used to create a random DataFrame with a given number of values per column and a positive target
+    """
+    random_state = np.random.RandomState(seed)
+    df = pd.DataFrame(random_state.randint(0, cardinality, size=(rows, cols)),
+                      columns=['feature_%d' % index for index in range(cols)])
+    df[TARGET_NAME] = random_state.randint(1, 100, size=rows)
+
+    return df
+
+
+def measure(function: Callable, *args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = function(*args)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return result, elapsed, peak
+
+
+def run_pipeline(df: pd.DataFrame, stages: List[str], epochs: int, batch_size: int, max_legacy_rows: int) \
+        -> Dict[str, Tuple[float, int]]:
+    """
+    Used to run the selected stages on a given DataFrame, each one on the output of the previous ones
+    :return: the seconds and the peak bytes of each stage, by name
+    """
+    measures = {}
+
+    if 'get_X_y' in stages and len(df) <= max_legacy_rows:
+        _, seconds, peak = measure(preprocessing_utils.get_X_y, df, TARGET_NAME)
+        measures['get_X_y'] = seconds, peak
+
+    (X, y), seconds, peak = measure(preprocessing_utils.get_X_y_columnar, df, TARGET_NAME)
+    measures['get_X_y_columnar'] = seconds, peak
+
+    if 'label_encode' in stages:
+        _, seconds, peak = measure(preprocessing_utils.label_encode, np.column_stack(X))
+        measures['label_encode'] = seconds, peak
+
+    names = [column for column in df.columns if column != TARGET_NAME]
+    (X_encoded, vocabulary), seconds, peak = measure(CategoricalEncoder().fit_transform, X, names)
+    measures['categorical_encoder'] = seconds, peak
+
+    if 'transpose_to_list' in stages:
+        _, seconds, peak = measure(preprocessing_utils.transpose_to_list, X_encoded)
+        measures['transpose_to_list'] = seconds, peak
+
+    if not set(stages) & set(MODEL_STAGES):
+        return {stage: measures[stage] for stage in stages if stage in measures}
+
+    # the model stages need keras, so they are only imported when selected
+    from entity_embeddings.network.network import EmbeddingNetwork
+    from entity_embeddings.util import model_utils, visualization_utils
+
+    artifacts_path = tempfile.mkdtemp(prefix='benchmark_pipeline_')
+    try:
+        config = Config.make_default_config_from_df(df,
+                                                    TARGET_NAME,
+                                                    TargetType.REGRESSION,
+                                                    train_ratio=0.9,
+                                                    epochs=epochs,
+                                                    batch_size=batch_size,
+                                                    artifacts_path=artifacts_path,
+                                                    sampling_options=SamplingOptions(Sampling.NONE))
+
+        network, seconds, peak = measure(EmbeddingNetwork, config)
+        measures['build_network'] = seconds, peak
+
+        train_size = int(config.train_ratio * len(X_encoded))
+        y = config.target_processor.process_target(y.tolist())
+        history, seconds, peak = measure(network.fit, X_encoded[:train_size], y[:train_size],
+                                         X_encoded[train_size:], y[train_size:])
+        measures['fit_epoch'] = seconds / epochs, peak
+
+        weights, seconds, peak = measure(model_utils.get_weights, network.model, config)
+        measures['get_weights'] = seconds, peak
+
+        _, seconds, peak = measure(model_utils.save_embeddings, weights, vocabulary, config)
+        measures['save_embeddings'] = seconds, peak
+
+        _, seconds, peak = measure(visualization_utils.make_plot_from_history, history, artifacts_path)
+        measures['plot_history'] = seconds, peak
+
+        if 'visualizations' in stages:
+            _, seconds, peak = measure(visualization_utils.make_visualizations_from_config, config)
+            measures['visualizations'] = seconds, peak
+    finally:
+        shutil.rmtree(artifacts_path, ignore_errors=True)
+
+    return {stage: measures[stage] for stage in stages if stage in measures}
+
+
+def get_metadata(label: str) -> Dict:
+    metadata = {'format_version': RESULTS_FORMAT_VERSION,
+                'label': label,
+                'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'cpu_count': os.cpu_count(),
+                'numpy': np.__version__,
+                'pandas': pd.__version__}
+
+    if 'keras' in sys.modules:
+        metadata['keras'] = getattr(sys.modules['keras'], '__version__', None)
+
+    return metadata
+
+
+def get_key(result: Dict) -> Tuple:
+    return result['stage'], result['rows'], result['cols'], result['cardinality']
+
+
+def compare_results(results: List[Dict], baseline: List[Dict], tolerance: float) -> List[str]:
+    """
+    Used to find the stages slower or heavier than in the baseline, beyond a given tolerance
+    :param results: the results of the current run
+    :param baseline: the results of the previous run
+    :param tolerance: the relative increase allowed, such as 0.2 for 20%
+    :return: the description of each regression found
+    """
+    previous = {get_key(result): result for result in baseline}
+
+    print('\n%-20s %10s %6s %12s %10s %10s' % ('stage', 'rows', 'cols', 'cardinality', 'time', 'memory'))
+    regressions = []
+    for result in results:
+        if get_key(result) not in previous:
+            continue
+
+        before = previous[get_key(result)]
+        time_ratio = result['seconds'] / max(before['seconds'], 1e-9)
+        memory_ratio = result['peak_bytes'] / max(before['peak_bytes'], 1)
+
+        print('%-20s %10d %6d %12d %9.2fx %9.2fx' % (get_key(result) + (time_ratio, memory_ratio)))
+        for name, ratio, measured in (('time', time_ratio, result['seconds'] >= MIN_COMPARED_SECONDS),
+                                      ('memory', memory_ratio, result['peak_bytes'] >= MIN_COMPARED_BYTES)):
+            if measured and ratio > 1 + tolerance:
+                regressions.append('%s of %s with %d rows, %d cols and %d values grew %.2fx' %
+                                   ((name,) + get_key(result) + (ratio,)))
+
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, nargs='+', default=[10000, 100000])
+    parser.add_argument('--cols', type=int, nargs='+', default=[10])
+    parser.add_argument('--cardinality', type=int, nargs='+', default=[10, 1000])
+    parser.add_argument('--stages', nargs='+', choices=STAGES, default=STAGES)
+    parser.add_argument('--epochs', type=int, default=2)
+    parser.add_argument('--batch-size', type=int, default=128)
+    parser.add_argument('--repeats', type=int, default=3, help='the best of this many runs is kept for each stage')
+    parser.add_argument('--max-legacy-rows', type=int, default=10000,
+                        help='get_X_y iterates over the rows, so it is skipped on larger tables')
+    parser.add_argument('--label', default='current', help='the name of this run, such as a version')
+    parser.add_argument('--output', default='benchmark_pipeline.json')
+    parser.add_argument('--compare', help='the results of a previous run, to be compared against')
+    parser.add_argument('--tolerance', type=float, default=0.2)
+    args = parser.parse_args()
+
+    results = []
+    print('%-20s %10s %6s %12s %12s %12s' % ('stage', 'rows', 'cols', 'cardinality', 'seconds', 'peak MB'))
+    for rows in args.rows:
+        for cols in args.cols:
+            for cardinality in args.cardinality:
+                df = make_dataframe(rows, cols, cardinality)
+                runs = [run_pipeline(df, args.stages, args.epochs, args.batch_size, args.max_legacy_rows)
+                        for _ in range(args.repeats)]
+                measures = {stage: (min(run[stage][0] for run in runs), min(run[stage][1] for run in runs))
+                            for stage in runs[0]}
+
+                for stage, (seconds, peak) in measures.items():
+                    print('%-20s %10d %6d %12d %12.4f %12.1f' % (stage, rows, cols, cardinality, seconds,
+                                                                 peak / 2 ** 20))
+                    results.append({'stage': stage, 'rows': rows, 'cols': cols, 'cardinality': cardinality,
+                                    'seconds': seconds, 'peak_bytes': peak})
+
+    with open(args.output, 'w') as f:
+        json.dump({'metadata': get_metadata(args.label), 'results': results}, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+
+        regressions = compare_results(results, baseline['results'], args.tolerance)
+        for regression in regressions:
+            print('regression: %s' % regression)
+
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
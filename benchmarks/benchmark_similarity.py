@@ -0,0 +1,60 @@
+"""
+Measures the recall and the latency of the IVFIndex against the exact search, for several numbers of probed clusters.
+
+Usage: python -m benchmarks.benchmark_similarity --rows 100000 --dim 16 --queries 100 --k 10 --n-probes 1 4 16 64
+"""
+import argparse
+import time
+
+import numpy as np
+
+from entity_embeddings.similarity import IVFIndex, Metric, exact_search
+
+
+def make_table(rows: int, dim: int, seed: int = 0) -> np.ndarray:
+    # embeddings are rarely uniform, so they are drawn around a few hundred centers
+    random_state = np.random.RandomState(seed)
+    centers = random_state.randn(max(1, rows // 500), dim) * 3
+    return (centers[random_state.randint(0, len(centers), rows)] + random_state.randn(rows, dim)).astype(np.float32)
+
+
+def measure(search, queries: np.ndarray) -> tuple:
+    start = time.perf_counter()
+    ids = np.concatenate([search(query)[0] for query in queries])
+    return ids, (time.perf_counter() - start) / len(queries)
+
+
+def get_recall(ids: np.ndarray, expected: np.ndarray) -> float:
+    return float(np.mean([len(np.intersect1d(found, exact)) / len(exact) for found, exact in zip(ids, expected)]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=100000)
+    parser.add_argument('--dim', type=int, default=16)
+    parser.add_argument('--queries', type=int, default=100)
+    parser.add_argument('--k', type=int, default=10)
+    parser.add_argument('--n-lists', type=int, default=None)
+    parser.add_argument('--n-probes', type=int, nargs='+', default=[1, 4, 16, 64])
+    parser.add_argument('--metric', default=Metric.COSINE, choices=Metric.OPTIONS)
+    args = parser.parse_args()
+
+    table = make_table(args.rows, args.dim)
+    queries = table[np.random.RandomState(1).choice(args.rows, args.queries, replace=False)]
+
+    start = time.perf_counter()
+    index = IVFIndex.build(table, args.metric, args.n_lists, seed=0)
+    print('built an index of %d lists in %.2fs' % (index.n_lists, time.perf_counter() - start))
+
+    expected, elapsed = measure(lambda query: exact_search(table, query, args.k, args.metric), queries)
+
+    print('%10s %10s %14s %10s' % ('search', 'n_probe', 'latency us', 'recall'))
+    print('%10s %10s %14.1f %10.3f' % ('exact', '-', elapsed * 1e6, 1.0))
+
+    for n_probe in args.n_probes:
+        ids, elapsed = measure(lambda query: index.search(query, args.k, n_probe), queries)
+        print('%10s %10d %14.1f %10.3f' % ('ivf', n_probe, elapsed * 1e6, get_recall(ids, expected)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,70 @@
+"""
+Measures the latency of EmbeddingStore.transform_row and the throughput of EmbeddingStore.transform.
+
+Usage: python -m benchmarks.benchmark_transform --cols 10 100 --levels 1000 --batch-sizes 1 100 10000
+"""
+import argparse
+import time
+
+import numpy as np
+
+from entity_embeddings.config import get_embedding_size
+from entity_embeddings.encoder import CategoricalEncoder
+from entity_embeddings.inference import EmbeddingStore
+
+
+def make_store(cols: int, levels: int) -> EmbeddingStore:
+    columns = [np.char.add('level_', np.arange(levels).astype(str)).astype(object) for _ in range(cols)]
+    _, vocabulary = CategoricalEncoder().fit_transform(columns, ['feature_%d' % index for index in range(cols)])
+    weights = [np.random.rand(levels, get_embedding_size(levels)).astype(np.float32) for _ in range(cols)]
+
+    return EmbeddingStore.from_weights(weights, vocabulary)
+
+
+def make_batch(store: EmbeddingStore, rows: int):
+    return [np.random.choice(column.values, size=rows) for column in store.vocabulary]
+
+
+def measure_row(store: EmbeddingStore, repeats: int) -> float:
+    rows = [list(row) for row in zip(*make_batch(store, repeats))]
+
+    start = time.perf_counter()
+    for row in rows:
+        store.transform_row(row)
+
+    return (time.perf_counter() - start) / repeats
+
+
+def measure_batch(store: EmbeddingStore, rows: int, repeats: int) -> float:
+    batch = make_batch(store, rows)
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        store.transform(batch)
+
+    return (time.perf_counter() - start) / repeats
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--cols', type=int, nargs='+', default=[10, 100])
+    parser.add_argument('--levels', type=int, default=1000)
+    parser.add_argument('--batch-sizes', type=int, nargs='+', default=[1, 100, 10000])
+    parser.add_argument('--repeats', type=int, default=1000)
+    args = parser.parse_args()
+
+    print('%6s %12s %14s %14s' % ('cols', 'batch size', 'latency us', 'rows/s'))
+    for cols in args.cols:
+        store = make_store(cols, args.levels)
+
+        elapsed = measure_row(store, args.repeats)
+        print('%6d %12s %14.1f %14.0f' % (cols, 'row', elapsed * 1e6, 1 / elapsed))
+
+        for batch_size in args.batch_sizes:
+            repeats = max(1, args.repeats * 100 // batch_size)
+            elapsed = measure_batch(store, batch_size, min(repeats, args.repeats))
+            print('%6d %12d %14.1f %14.0f' % (cols, batch_size, elapsed * 1e6, batch_size / elapsed))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,3 +1,25 @@
-from entity_embeddings.config import Config
-from entity_embeddings.embedder import Embedder
-from entity_embeddings.processor.target_type import TargetType
\ No newline at end of file
+"""
+The public names of the package are imported on first use, so that importing a part of it, such as the inference, does
+not load the training backends.
+"""
+from entity_embeddings.util.lazy_utils import make_lazy
+
+make_lazy(__name__, {'Config': 'entity_embeddings.config',
+                     'BatchFeeding': 'entity_embeddings.options',
+                     'EmbeddingBudget': 'entity_embeddings.options',
+                     'SamplingOptions': 'entity_embeddings.options',
+                     'TrainingControl': 'entity_embeddings.options',
+                     'VocabularyOptions': 'entity_embeddings.options',
+                     'CrossValidation': 'entity_embeddings.search',
+                     'Embedder': 'entity_embeddings.embedder',
+                     'EmbeddingStore': 'entity_embeddings.inference',
+                     'OutOfVocabulary': 'entity_embeddings.inference',
+                     'CallbackSink': 'entity_embeddings.instrumentation',
+                     'JsonSink': 'entity_embeddings.instrumentation',
+                     'LogSink': 'entity_embeddings.instrumentation',
+                     'MetricsSink': 'entity_embeddings.instrumentation',
+                     'SizeWeighting': 'entity_embeddings.planner',
+                     'TargetType': 'entity_embeddings.processor.target_type',
+                     'HyperparameterSearch': 'entity_embeddings.search',
+                     'CategorySimilarity': 'entity_embeddings.similarity',
+                     'Sampling': 'entity_embeddings.util.sampling_utils'})
@@ -0,0 +1,7 @@
+from entity_embeddings.util.lazy_utils import make_lazy
+
+make_lazy(__name__, {'EmbeddingArtifacts': 'entity_embeddings.artifacts.artifacts',
+                     'load_artifacts': 'entity_embeddings.artifacts.artifacts',
+                     'save_artifacts': 'entity_embeddings.artifacts.artifacts',
+                     'get_warm_start_tables': 'entity_embeddings.artifacts.warm_start',
+                     'grow_vocabulary': 'entity_embeddings.artifacts.warm_start'})
@@ -0,0 +1,194 @@
+"""
+This file contains the format in which the trained embeddings are stored: a single flat embeddings.npy, one .npy file
+per vocabulary and a manifest.json describing them, so that they can be memory-mapped when loaded.
+"""
+import json
+import os
+import shutil
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from entity_embeddings.encoder import ColumnVocabulary, HashedColumnVocabulary, Vocabulary
+
+ARTIFACTS_FORMAT_VERSION = 1
+DEFAULT_EMBEDDINGS_DIRNAME = 'embeddings'
+MANIFEST_FILENAME = 'manifest.json'
+EMBEDDINGS_FILENAME = 'embeddings.npy'
+VOCABULARIES_DIRNAME = 'vocabularies'
+VOCABULARY_FILENAME_FORMAT = '%d.npy'
+INDEXES_DIRNAME = 'indexes'
+
+
+class EmbeddingArtifacts:
+    """
+    Used to hold the embeddings of an artifacts directory, each embedding matrix being a view over a single buffer
+    """
+
+    def __init__(self, buffer: np.ndarray, output_dims: List[int], vocabulary: Vocabulary):
+        """
+        :param buffer: the flat float32 buffer holding every embedding matrix, one after the other
+        :param output_dims: the embedding size of each category
+        :param vocabulary: the Vocabulary of the categories, in the same order of the embedding matrices
+        """
+        self.buffer = buffer
+        self.output_dims = [int(output_dim) for output_dim in output_dims]
+        self.vocabulary = vocabulary
+
+    @property
+    def input_dims(self) -> List[int]:
+        return [len(column) for column in self.vocabulary]
+
+    @property
+    def offsets(self) -> List[int]:
+        sizes = np.multiply(self.input_dims, self.output_dims)
+        return np.concatenate([[0], np.cumsum(sizes)[:-1]]).astype(int).tolist()
+
+    @property
+    def tables(self) -> List[np.ndarray]:
+        return [self.buffer[offset:offset + input_dim * output_dim].reshape(input_dim, output_dim)
+                for offset, input_dim, output_dim in zip(self.offsets, self.input_dims, self.output_dims)]
+
+    def get_table(self, name: str) -> np.ndarray:
+        return self.tables[self.vocabulary.names.index(name)]
+
+    @classmethod
+    def from_weights(cls, weights: List[np.ndarray], vocabulary: Vocabulary) -> 'EmbeddingArtifacts':
+        """
+        Used to gather a list of embedding matrices, such as the one of model_utils.get_weights, into a single buffer
+        :param weights: the embedding matrix of each category, in the same order of the vocabulary
+        :param vocabulary: the Vocabulary of the categories
+        :return: an EmbeddingArtifacts object
+        """
+        if len(weights) != len(vocabulary):
+            raise ValueError("You should provide one embedding matrix for each column of the vocabulary")
+
+        for table, column in zip(weights, vocabulary):
+            if len(table) != len(column):
+                raise ValueError("You should provide one embedding for each value of the column %s" % column.name)
+
+        buffer = np.concatenate([np.ravel(table) for table in weights]).astype(np.float32, copy=False)
+        return cls(buffer, [table.shape[1] for table in weights], vocabulary)
+
+
+def save_artifacts(artifacts: EmbeddingArtifacts, path: str) -> None:
+    """
+    Used to save the given embeddings into a directory, writing the manifest last
+    :param artifacts: the EmbeddingArtifacts to be saved
+    :param path: the directory where the embeddings should be saved
+    """
+    os.makedirs(os.path.join(path, VOCABULARIES_DIRNAME), exist_ok=True)
+
+    manifest_path = os.path.join(path, MANIFEST_FILENAME)
+    if os.path.exists(manifest_path):
+        os.remove(manifest_path)
+
+    # the indexes saved next to the embeddings were built over the ones being replaced
+    shutil.rmtree(os.path.join(path, INDEXES_DIRNAME), ignore_errors=True)
+
+    np.save(os.path.join(path, EMBEDDINGS_FILENAME), np.ascontiguousarray(artifacts.buffer, dtype=np.float32))
+
+    columns = []
+    for index, (column, offset, output_dim) in enumerate(zip(artifacts.vocabulary, artifacts.offsets,
+                                                              artifacts.output_dims)):
+        entry = {'name': column.name, 'offset': offset, 'rows': len(column), 'dim': output_dim}
+
+        # a hashed column has no values to be saved, only the parameters of its hashing
+        if isinstance(column, HashedColumnVocabulary):
+            entry.update(hashed={'n_buckets': column.n_buckets, 'n_hashes': column.n_hashes})
+        else:
+            vocabulary_file = os.path.join(VOCABULARIES_DIRNAME, VOCABULARY_FILENAME_FORMAT % index)
+            values, missing, pickled = _to_storable(column.values)
+            np.save(os.path.join(path, vocabulary_file), values, allow_pickle=pickled)
+
+            entry.update(vocabulary=vocabulary_file, missing=missing is not None, missing_position=missing,
+                         pickled=pickled, other=column.other)
+
+        columns.append(entry)
+
+    manifest = {'format_version': ARTIFACTS_FORMAT_VERSION,
+                'embeddings': EMBEDDINGS_FILENAME,
+                'dtype': 'float32',
+                'columns': columns}
+
+    with open(manifest_path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+
+
+def load_artifacts(path: str, mmap_mode: str = 'r') -> EmbeddingArtifacts:
+    """
+    Used to load the embeddings saved with save_artifacts
+    :param path: the directory where the embeddings were saved
+    :param mmap_mode: how the files should be memory-mapped, or None to read them into memory
+    :return: an EmbeddingArtifacts object
+    """
+    manifest = read_manifest(path)
+
+    buffer = np.load(os.path.join(path, manifest['embeddings']), mmap_mode=mmap_mode)
+
+    columns = []
+    for column in manifest['columns']:
+        if column.get('hashed'):
+            columns.append(HashedColumnVocabulary(column['name'], **column['hashed']))
+            continue
+
+        # older manifests always had the missing value last
+        missing = column.get('missing_position', column['rows'] - int(column.get('other', False)) - 1)
+        values = _from_storable(os.path.join(path, column['vocabulary']), missing if column['missing'] else None,
+                                column['pickled'], mmap_mode)
+        columns.append(ColumnVocabulary(column['name'], values, column.get('other', False)))
+
+    return EmbeddingArtifacts(buffer, [column['dim'] for column in manifest['columns']], Vocabulary(columns))
+
+
+def read_manifest(path: str) -> Dict:
+    """
+    Used to read the manifest of an artifacts directory, checking that its format can be loaded
+    :param path: the directory where the embeddings were saved
+    :return: the manifest, as a dict
+    """
+    manifest_path = os.path.join(path, MANIFEST_FILENAME)
+    if not os.path.exists(manifest_path):
+        raise ValueError("You should provide a directory containing saved embeddings")
+
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+
+    if manifest.get('format_version') != ARTIFACTS_FORMAT_VERSION:
+        raise ValueError("You should provide embeddings saved with the format version %d" % ARTIFACTS_FORMAT_VERSION)
+
+    return manifest
+
+
+def _to_storable(values: np.ndarray) -> Tuple[np.ndarray, Optional[int], bool]:
+    """
+    Used to convert the values of a vocabulary into an array that can be saved without pickling, unless it mixes types
+    :param values: the values of a ColumnVocabulary
+    :return: a tuple containing the array to be saved, the position of the missing value removed and if it is pickled
+    """
+    if values.dtype != object:
+        return values, None, False
+
+    positions = [position for position, value in enumerate(values) if _is_missing(value)]
+    missing = positions[0] if len(positions) == 1 else None
+    present = np.delete(values, missing) if missing is not None else values
+
+    if all(isinstance(value, str) for value in present):
+        return present.astype(str), missing, False
+
+    return values, None, True
+
+
+def _from_storable(path: str, missing: Optional[int], pickled: bool, mmap_mode: str) -> np.ndarray:
+    if pickled:
+        return np.load(path, allow_pickle=True)
+
+    values = np.load(path, mmap_mode=mmap_mode)
+    if missing is not None:
+        values = np.insert(values.astype(object), missing, np.nan)
+
+    return values
+
+
+def _is_missing(value) -> bool:
+    return isinstance(value, float) and value != value
@@ -0,0 +1,81 @@
+"""
+This file contains what is needed to warm start a run from the artifacts of a previous one, keeping the codes and the
+embeddings the values already had.
+"""
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+from entity_embeddings.artifacts.artifacts import EmbeddingArtifacts
+from entity_embeddings.encoder import ColumnVocabulary, HashedColumnVocabulary, Vocabulary
+
+
+def grow_column_vocabulary(previous: ColumnVocabulary, current: ColumnVocabulary) -> ColumnVocabulary:
+    """
+    Used to append the values of a column seen for the first time to its previous vocabulary, unless it was pruned
+    :param previous: the ColumnVocabulary of the previous run
+    :param current: the ColumnVocabulary learned on the current data
+    :return: the grown ColumnVocabulary
+    """
+    if previous.other:
+        return previous
+
+    new_values = current.values[pd.Index(previous.values).get_indexer(current.values) < 0]
+    if not len(new_values):
+        return previous
+
+    if previous.values.dtype != new_values.dtype:
+        return ColumnVocabulary(previous.name, np.append(previous.values.astype(object), new_values.astype(object)))
+
+    return ColumnVocabulary(previous.name, np.append(previous.values, new_values))
+
+
+def grow_vocabulary(previous: Vocabulary, current: Vocabulary) -> Vocabulary:
+    """
+    Used to grow the vocabulary of every column of a previous run with the values of the current data
+    :param previous: the Vocabulary of the previous run
+    :param current: the Vocabulary learned on the current data, with the same columns
+    :return: the grown Vocabulary, whose codes of the previous values are the ones they had
+    """
+    if previous.names != current.names:
+        raise ValueError("You should provide the same feature columns of the previous run to warm start from it")
+
+    columns = []
+    for previous_column, current_column in zip(previous, current):
+        if isinstance(previous_column, HashedColumnVocabulary) or isinstance(current_column, HashedColumnVocabulary):
+            if not (isinstance(previous_column, HashedColumnVocabulary) and
+                    isinstance(current_column, HashedColumnVocabulary) and
+                    len(previous_column) == len(current_column) and
+                    previous_column.n_hashes == current_column.n_hashes):
+                raise ValueError("You should provide the same hashing of the column %s used by the previous run"
+                                 % previous_column.name)
+            columns.append(previous_column)
+        else:
+            columns.append(grow_column_vocabulary(previous_column, current_column))
+
+    return Vocabulary(columns)
+
+
+def grow_table(table: np.ndarray, n_rows: int) -> np.ndarray:
+    """
+    Used to add rows to an embedding matrix, initialized with the mean of its learned rows
+    :param table: the (rows, embedding size) learned matrix
+    :param n_rows: how many rows the grown matrix should have
+    :return: the (n_rows, embedding size) float32 matrix
+    """
+    grown = np.empty((n_rows, table.shape[1]), dtype=np.float32)
+    grown[:len(table)] = table
+    grown[len(table):] = np.mean(table, axis=0)
+
+    return grown
+
+
+def get_warm_start_tables(artifacts: EmbeddingArtifacts, vocabulary: Vocabulary) -> List[np.ndarray]:
+    """
+    Used to get the embedding matrices a warm started network should begin with
+    :param artifacts: the EmbeddingArtifacts of the previous run
+    :param vocabulary: the Vocabulary returned by grow_vocabulary
+    :return: the embedding matrix of each column, with one row for each of its codes
+    """
+    return [grow_table(table, len(column)) for table, column in zip(artifacts.tables, vocabulary)]
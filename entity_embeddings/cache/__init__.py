@@ -0,0 +1 @@
+from entity_embeddings.cache.cache import CacheEntry, PreprocessingCache
@@ -0,0 +1,254 @@
+"""
+This file contains the PreprocessingCache class, which stores the pre-processed data as .npy files, so that a repeated
+run over the same data can load them memory-mapped.
+"""
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+from entity_embeddings.encoder import Vocabulary
+
+# bump it whenever the content of the cache entries changes
+CACHE_FORMAT_VERSION = 1
+
+DEFAULT_CACHE_DIRNAME = 'cache'
+DEFAULT_CACHE_MAX_BYTES = 10 * 2 ** 30
+
+# how many bytes from the beginning and from the end of a file are hashed in its fingerprint
+FINGERPRINT_SAMPLE_BYTES = 2 ** 20
+
+FEATURES_FILENAME = 'X.npy'
+TARGETS_FILENAME = 'y.npy'
+VOCABULARY_FILENAME = 'vocabulary.npz'
+METADATA_FILENAME = 'metadata.json'
+
+STAGING_PREFIX = '.staging-'
+
+# a staging directory left for longer belongs to a killed run
+STALE_STAGING_SECONDS = 24 * 60 * 60
+
+
+def fingerprint_file(path: str) -> str:
+    """
+    Used to compute a fingerprint of a given file from its size, its modification time and the bytes at both ends
+    :param path: where the file is located
+    :return: the hexadecimal fingerprint
+    """
+    stat = os.stat(path)
+    digest = hashlib.sha1(('%d:%d' % (stat.st_size, stat.st_mtime_ns)).encode())
+
+    with open(path, 'rb') as f:
+        digest.update(f.read(FINGERPRINT_SAMPLE_BYTES))
+        if stat.st_size > 2 * FINGERPRINT_SAMPLE_BYTES:
+            f.seek(-FINGERPRINT_SAMPLE_BYTES, os.SEEK_END)
+            digest.update(f.read(FINGERPRINT_SAMPLE_BYTES))
+
+    return digest.hexdigest()
+
+
+def fingerprint_dataframe(df: pd.DataFrame) -> str:
+    """
+    Used to compute a fingerprint of a given DataFrame from the hash of its columns and values
+    :param df: the DataFrame
+    :return: the hexadecimal fingerprint
+    """
+    digest = hashlib.sha1(json.dumps([str(column) for column in df.columns]).encode())
+    digest.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+
+    return digest.hexdigest()
+
+
+def make_cache_key(data_fingerprint: str, **parameters) -> str:
+    """
+    Used to make the key of a cache entry from the fingerprint of the data and the parameters used to pre-process it
+    :param data_fingerprint: the fingerprint of the data file or DataFrame
+    :param parameters: every parameter that changes the result of the pre-processing
+    :return: the hexadecimal key
+    """
+    parameters = dict(parameters, data_fingerprint=data_fingerprint, version=CACHE_FORMAT_VERSION)
+    return hashlib.sha1(json.dumps(parameters, sort_keys=True, default=str).encode()).hexdigest()
+
+
+class CacheEntry:
+    """
+    Used to access a single entry of the PreprocessingCache, whose arrays are loaded memory-mapped
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(os.path.join(path, METADATA_FILENAME)) as f:
+            self.metadata: Dict = json.load(f)
+
+    @property
+    def X(self) -> np.ndarray:
+        return np.load(os.path.join(self.path, FEATURES_FILENAME), mmap_mode='r')
+
+    @property
+    def y(self) -> np.ndarray:
+        return np.load(os.path.join(self.path, TARGETS_FILENAME), mmap_mode='r')
+
+    @property
+    def vocabulary(self) -> Vocabulary:
+        return Vocabulary.load(os.path.join(self.path, VOCABULARY_FILENAME))
+
+    @property
+    def n_rows(self) -> int:
+        return self.metadata['n_rows']
+
+    @property
+    def unique_classes(self) -> int:
+        return self.metadata['unique_classes']
+
+
+class PreprocessingCache:
+    """
+    This class is used to store pre-processed datasets on disk, evicting the least recently used ones over max_bytes
+    """
+
+    def __init__(self, cache_dir: str, max_bytes: int = DEFAULT_CACHE_MAX_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+
+    def get(self, key: str) -> CacheEntry:
+        """
+        Used to get the entry stored under a given key, marking it as the most recently used one
+        :param key: the key of the entry
+        :return: the CacheEntry, or None if there is no entry for the given key
+        """
+        path = self._get_entry_path(key)
+        metadata_path = os.path.join(path, METADATA_FILENAME)
+        if not os.path.exists(metadata_path):
+            return None
+
+        os.utime(metadata_path)
+        return CacheEntry(path)
+
+    def put(self, key: str, X: np.ndarray, y: np.ndarray, vocabulary: Vocabulary, unique_classes: int) -> CacheEntry:
+        """
+        Used to store a pre-processed dataset under a given key
+        :param key: the key of the entry
+        :param X: the encoded features
+        :param y: the processed targets
+        :param vocabulary: the Vocabulary of the encoded features
+        :param unique_classes: the number of distinct values of the target, or None when they were not collected
+        :return: the CacheEntry stored
+        """
+        staging_dir = self.make_staging_dir()
+        try:
+            np.save(os.path.join(staging_dir, FEATURES_FILENAME), X)
+            np.save(os.path.join(staging_dir, TARGETS_FILENAME), y)
+
+            return self.commit(key, staging_dir, vocabulary, len(X), unique_classes)
+        except BaseException:
+            self.discard(staging_dir)
+            raise
+
+    def make_staging_dir(self) -> str:
+        """
+        Used to make a temporary directory inside the cache, where the arrays of a new entry are written
+        :return: the path of the staging directory
+        """
+        os.makedirs(self.cache_dir, exist_ok=True)
+        return tempfile.mkdtemp(prefix=STAGING_PREFIX, dir=self.cache_dir)
+
+    def discard(self, staging_dir: str) -> None:
+        """
+        Used to remove a staging directory whose entry could not be written
+        :param staging_dir: the directory returned by make_staging_dir
+        """
+        shutil.rmtree(staging_dir, ignore_errors=True)
+
+    def commit(self, key: str, staging_dir: str, vocabulary: Vocabulary, n_rows: int, unique_classes: int) \
+            -> CacheEntry:
+        """
+        Used to turn a staging directory, where X.npy and y.npy were already written, into the entry of a given key
+        :param key: the key of the entry
+        :param staging_dir: the directory returned by make_staging_dir
+        :param vocabulary: the Vocabulary of the encoded features
+        :param n_rows: the number of rows of the dataset
+        :param unique_classes: the number of distinct values of the target, or None when they were not collected
+        :return: the CacheEntry stored
+        """
+        vocabulary.save(os.path.join(staging_dir, VOCABULARY_FILENAME))
+        with open(os.path.join(staging_dir, METADATA_FILENAME), 'w') as f:
+            json.dump({'n_rows': int(n_rows),
+                       'unique_classes': int(unique_classes) if unique_classes is not None else None}, f)
+
+        path = self._get_entry_path(key)
+        self.invalidate(key)
+        os.rename(staging_dir, path)
+
+        self._evict(keep=key)
+        return CacheEntry(path)
+
+    def invalidate(self, key: str) -> None:
+        """
+        Used to remove the entry of a given key, if there is one
+        :param key: the key of the entry
+        """
+        shutil.rmtree(self._get_entry_path(key), ignore_errors=True)
+
+    def clear(self) -> None:
+        """
+        Used to remove every entry of the cache
+        """
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def get_size(self) -> int:
+        """
+        Used to get the total size of the entries of the cache
+        :return: the size in bytes
+        """
+        return sum(self._get_entry_size(key) for key in self._get_keys())
+
+    def _evict(self, keep: str) -> None:
+        self._remove_stale_staging_dirs()
+
+        # least recently used first, as touched by get and commit
+        keys = sorted(self._get_keys(), key=self._get_last_used)
+        size = self.get_size()
+
+        for key in keys:
+            if size <= self.max_bytes:
+                break
+
+            if key != keep:
+                size -= self._get_entry_size(key)
+                self.invalidate(key)
+
+    def _remove_stale_staging_dirs(self) -> None:
+        oldest = time.time() - STALE_STAGING_SECONDS
+        for name in os.listdir(self.cache_dir):
+            path = os.path.join(self.cache_dir, name)
+            try:
+                if name.startswith(STAGING_PREFIX) and os.path.getmtime(path) < oldest:
+                    self.discard(path)
+            except OSError:
+                pass
+
+    def _get_keys(self) -> List[str]:
+        if not os.path.exists(self.cache_dir):
+            return []
+
+        return [key for key in os.listdir(self.cache_dir)
+                if os.path.exists(os.path.join(self.cache_dir, key, METADATA_FILENAME))]
+
+    def _get_entry_path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key)
+
+    def _get_entry_size(self, key: str) -> int:
+        path = self._get_entry_path(key)
+        return sum(os.path.getsize(os.path.join(path, filename)) for filename in os.listdir(path))
+
+    def _get_last_used(self, key: str) -> float:
+        try:
+            return os.path.getmtime(os.path.join(self._get_entry_path(key), METADATA_FILENAME))
+        except OSError:
+            return time.time()
@@ -2,44 +2,134 @@
 This file contains both the Category and EmbeddingConfig classes, which are responsible to store data related to the
 categories. This data will be later on used on our EmbeddingNetwork class.
 """
-from typing import List
+from functools import partial
+from typing import Dict, List
 
 import numpy as np
 
+from entity_embeddings.artifacts import get_warm_start_tables, grow_vocabulary, load_artifacts
+from entity_embeddings.artifacts.artifacts import DEFAULT_EMBEDDINGS_DIRNAME
 from entity_embeddings.network.assembler import get_model_assembler
 from entity_embeddings.processor.target_type import TargetType
-from entity_embeddings.util.dataframe_utils import load_guarantee_not_empty
+from entity_embeddings.cache import CacheEntry, PreprocessingCache
+from entity_embeddings.cache.cache import (DEFAULT_CACHE_DIRNAME, DEFAULT_CACHE_MAX_BYTES, fingerprint_dataframe,
+                                           fingerprint_file, make_cache_key)
+from entity_embeddings.encoder import CategoricalEncoder, ColumnVocabulary, HashedColumnVocabulary, Vocabulary
+from entity_embeddings.encoder.encoder import get_kept_values
+from entity_embeddings.encoder.hashing import check_hashing
+from entity_embeddings.encoder.parallel import map_columns
+from entity_embeddings.inference import OutOfVocabulary
+from entity_embeddings.inference.oov import check_oov
+from entity_embeddings.instrumentation import MetricsSink, StageTimer
+from entity_embeddings.options import BatchFeeding, EmbeddingBudget, SamplingOptions, TrainingControl, \
+    VocabularyOptions
+from entity_embeddings.planner import EmbeddingPlan, SizeWeighting, plan_embedding_sizes
+from entity_embeddings.planner.planner import check_budget, get_embedding_size
+from entity_embeddings.util.dataframe_utils import load_guarantee_not_empty, make_dataframe_from_arrays, \
+    get_columns_to_load
 from entity_embeddings.util.processor_utils import get_target_processor
+from entity_embeddings.util.sampling_utils import Sampling, check_sampling, get_default_sampling
+from entity_embeddings.util.streaming_utils import CsvScan, scan_csv
 from entity_embeddings.util.validation_utils import *
 
 
-def get_embedding_size(unique_values: int) -> int:
+def generate_categories_from_df(df: pd.DataFrame, target_name: str, encoder: CategoricalEncoder = None) -> List:
     """
-    Return the embedding size to be used on the Embedding layer
-    :param unique_values: the number of unique values in the given category
-    :return: the size to be used on the embedding layer
+    Returns a list of the categories from a given pandas DataFrame, with the exception of the provided target name
+    :param df: the DataFrame
+    :param target_name: the name of the target column to not be included
+    :param encoder: (optional) the CategoricalEncoder the features will be encoded with
+    :return: a List of Category with the df columns except the provided one
     """
-    size = int(min(np.ceil(unique_values / 2), 50))
-    if size < 2:
-        return 2
-    else:
-        return size
+    encoder = encoder or CategoricalEncoder()
+    names = [category for category in df if category != target_name]
+
+    # the values of each column are counted by the same workers the encoder uses
+    return map_columns(partial(make_category, names=names, encoder=encoder), [df[name] for name in names],
+                       encoder.workers, encoder.use_multiprocessing)
 
 
-def generate_categories_from_df(df: pd.DataFrame, target_name: str) -> List:
+def make_category(column: pd.Series, index: int, names: List[str], encoder: CategoricalEncoder) -> 'Category':
     """
-    Returns a list of the categories from a given pandas DataFrame, with the exception of the provided target name
+    Used to create the Category of a single column of a DataFrame, as described by generate_categories_from_df
+    :param column: the values of the column
+    :param index: the position of the column among the given names
+    :param names: the name of each of the columns
+    :param encoder: the CategoricalEncoder the features will be encoded with
+    :return: a Category object
+    """
+    name = names[index]
+    if name in encoder.hashed_buckets:
+        return Category(name, encoder.hashed_buckets[name], encoder.n_hashes)
+
+    if encoder.pruned:
+        counts = column.value_counts(dropna=False).values
+        kept = get_kept_values(counts, encoder.min_frequency, encoder.max_vocabulary_size)
+        return Category(name, int(kept.sum()) + 1)
+
+    return Category(name, column.nunique(dropna=False))
+
+
+def generate_categories_from_encoded_df(df: pd.DataFrame, target_name: str) -> List:
+    """
+    Returns a list of the categories from a given pandas DataFrame whose features are already label encoded
     :param df: the DataFrame
     :param target_name: the name of the target column to not be included
     :return: a List of Category with the df columns except the provided one
     """
-    category_list = []
+    return [Category(category, int(df[category].max()) + 1) for category in df if not category == target_name]
+
+
+def generate_categories_from_vocabulary(vocabulary: Vocabulary) -> List:
+    """
+    Returns a list of the categories from a given Vocabulary, such as the one learned when reading the data in chunks
+    :param vocabulary: the Vocabulary
+    :return: a List of Category with one item for each column of the vocabulary
+    """
+    return [Category(column.name, len(column), column.n_hashes if isinstance(column, HashedColumnVocabulary) else 1)
+            for column in vocabulary]
+
+
+def make_preprocessing_cache_key(csv_path: str,
+                                 df: pd.DataFrame,
+                                 target_name: str,
+                                 target_processor: TargetProcessor,
+                                 feature_names: List[str],
+                                 encoded: bool,
+                                 encoder: CategoricalEncoder = None,
+                                 sampling_options: SamplingOptions = None) -> str:
+    """
+    Returns the key of the PreprocessingCache entry for the given data and pre-processing parameters
+    :param csv_path: where the data file is located, if any
+    :param df: the DataFrame, used when there is no data file
+    :param target_name: the name of the target/output variable
+    :param target_processor: the TargetProcessor to be used
+    :param feature_names: the feature names to be read, if any
+    :param encoded: if the features are already label encoded
+    :param encoder: (optional) the CategoricalEncoder the features are encoded with
+    :param sampling_options: (optional) the SamplingOptions, when sampling by reservoir
+    :return: the key of the cache entry
+    """
+    data_fingerprint = fingerprint_file(csv_path) if csv_path else fingerprint_dataframe(df)
+
+    # the reservoir is drawn while the rows are encoded
+    reservoir = {'reservoir_size': sampling_options.size, 'reservoir_seed': sampling_options.seed} \
+        if sampling_options is not None and sampling_options.sampling == Sampling.RESERVOIR else {}
+
+    return make_cache_key(data_fingerprint,
+                          target_name=target_name,
+                          target_processor=type(target_processor).__name__,
+                          feature_names=feature_names,
+                          encoded=encoded,
+                          **get_encoder_parameters(encoder or CategoricalEncoder()),
+                          **reservoir)
 
-    for category in df:
-        if not category == target_name:
-            category_list.append(Category(category, df[category].nunique()))
 
-    return category_list
+def get_encoder_parameters(encoder: CategoricalEncoder) -> Dict:
+    return {'hashed_buckets': encoder.hashed_buckets,
+            'n_hashes': encoder.n_hashes,
+            'min_frequency': encoder.min_frequency,
+            'max_vocabulary_size': encoder.max_vocabulary_size}
 
 
 class Category:
@@ -48,10 +138,11 @@ class Category:
     embedding layer
     """
 
-    def __init__(self, alias: str, unique_values: int):
+    def __init__(self, alias: str, unique_values: int, n_hashes: int = 1):
         self.alias = alias
         self.unique_values = unique_values
         self.embedding_size = get_embedding_size(unique_values)
+        self.n_hashes = n_hashes
 
 
 class Config:
@@ -69,13 +160,56 @@ class Config:
                  epochs: int = 10,
                  batch_size: int = 128,
                  verbose: bool = False,
-                 artifacts_path: str = 'artifacts'):
+                 artifacts_path: str = 'artifacts',
+                 *,
+                 chunk_size: int = None,
+                 df: pd.DataFrame = None,
+                 encoded: bool = False,
+                 csv_scan: CsvScan = None,
+                 feature_names: List[str] = None,
+                 cache: bool = False,
+                 cache_max_bytes: int = DEFAULT_CACHE_MAX_BYTES,
+                 cache_entry: CacheEntry = None,
+                 batch_feeding: BatchFeeding = None,
+                 fused_embeddings: bool = False,
+                 oov: str = OutOfVocabulary.ZEROS,
+                 vocabulary_options: VocabularyOptions = None,
+                 embedding_budget: EmbeddingBudget = None,
+                 sampling_options: SamplingOptions = None,
+                 training_control: TrainingControl = None,
+                 metrics_sinks: List[MetricsSink] = None,
+                 stage_timer: StageTimer = None,
+                 warm_start_path: str = None,
+                 validation_rows: np.ndarray = None):
+        # the groups of options not provided keep their defaults
+        vocabulary_options = vocabulary_options or VocabularyOptions()
+        embedding_budget = embedding_budget or EmbeddingBudget()
+        sampling_options = sampling_options or SamplingOptions()
+        training_control = training_control or TrainingControl()
+
         # input validations
-        check_csv_data(csv_path)
+        if cache_entry is None:
+            check_data_source(csv_path, df, chunk_size)
         check_target_name(target_name)
         check_train_ratio(train_ratio)
         check_epochs(epochs)
         check_batch_size(batch_size)
+        check_chunk_size(chunk_size)
+        check_feature_names(feature_names, target_name)
+        if batch_feeding is not None:
+            check_batch_feeding(batch_feeding.shuffle_block_size, batch_feeding.workers, batch_feeding.max_queue_size)
+        check_oov(oov)
+        check_hashing(vocabulary_options.hashed_buckets, vocabulary_options.n_hashes, encoded, fused_embeddings)
+        check_pruning(vocabulary_options.min_frequency, vocabulary_options.max_vocabulary_size, encoded)
+        check_encoding_workers(vocabulary_options.workers)
+        check_budget(embedding_budget.max_parameters, embedding_budget.max_memory_bytes,
+                     embedding_budget.size_weighting, chunk_size)
+        check_sampling(sampling_options.sampling, sampling_options.size, chunk_size)
+        check_training_control(training_control.min_delta, training_control.early_stopping_patience,
+                               training_control.lr_schedule, training_control.reduce_lr_patience,
+                               training_control.reduce_lr_factor)
+        check_warm_start(warm_start_path, cache, embedding_budget.max_parameters, embedding_budget.max_memory_bytes)
+        check_validation_rows(validation_rows)
 
         check_target_processor(target_processor)
         check_model_assembler(model_assembler)
@@ -87,21 +221,116 @@ class Config:
         self.batch_size = batch_size
         self.verbose = verbose
         self.artifacts_path = artifacts_path
+        self.chunk_size = chunk_size
+        self.encoded = encoded
+        self.feature_names = feature_names
 
-        self.target_processor = target_processor
-        self.model_assembler = model_assembler
+        # when fused, all the categories are fed as a single input to a single embedding layer
+        self.fused_embeddings = fused_embeddings
 
-        self.df = load_guarantee_not_empty(self.csv_path)
-        check_target_existent_in_df(self.target_name, self.df)
+        # what Embedder.transform returns for values not seen during training
+        self.oov = oov
 
-        self.unique_classes = self.df[self.target_name].nunique()
+        self.vocabulary_options = vocabulary_options
+        self.embedding_budget = embedding_budget
+        self.training_control = training_control
 
-        self.categories: List[Category] = generate_categories_from_df(self.df, self.target_name)
+        self.batch_feeding = batch_feeding
+
+        self.sampling_options = sampling_options
+        self.sampling = sampling_options.sampling or get_default_sampling(self.is_streaming())
+
+        # the time of each stage and the throughput of each epoch are sent to these sinks
+        self.metrics_sinks = list(metrics_sinks or [])
+        self.timer = stage_timer or StageTimer(self.metrics_sinks)
+
+        # the artifacts path of a previous run, whose vocabulary and embeddings this run begins with
+        self.warm_start_path = warm_start_path
+
+        # the indices of the rows held out for validation, instead of the rows past train_ratio
+        self.validation_rows = validation_rows
 
         # artifacts related fields
-        self.DEFAULT_WEIGHTS_FILENAME = 'weights.pickle'
-        self.DEFAULT_LABELS_FILENAME = 'labels.pickle'
+        self.DEFAULT_PATH_EMBEDDINGS = DEFAULT_EMBEDDINGS_DIRNAME
         self.DEFAULT_PATH_VISUALIZATIONS = 'visualizations'
+        self.DEFAULT_PATH_ENCODED = 'encoded'
+        self.DEFAULT_PATH_CACHE = DEFAULT_CACHE_DIRNAME
+
+        self.target_processor = target_processor
+        self.model_assembler = model_assembler
+
+        self.cache = None
+        self.cache_key = None
+        if cache:
+            self.cache = PreprocessingCache(self.get_cache_dir(), cache_max_bytes)
+            self.cache_key = make_preprocessing_cache_key(csv_path, df, target_name, target_processor, feature_names,
+                                                          encoded, self.get_encoder(), sampling_options)
+            if cache_entry is None:
+                cache_entry = self.cache.get(self.cache_key)
+
+        self.cache_entry = cache_entry
+
+        # read in memory, since this run may save its own artifacts over them
+        self.warm_start = None
+        if warm_start_path is not None:
+            self.warm_start = load_artifacts(os.path.join(warm_start_path, DEFAULT_EMBEDDINGS_DIRNAME), mmap_mode=None)
+
+        if self.cache_entry is not None:
+            # the data was already pre-processed by a previous run
+            self.df = df
+            self.vocabulary = self.cache_entry.vocabulary
+            self.n_rows = self.cache_entry.n_rows
+            self.unique_classes = self.cache_entry.unique_classes
+
+            self.categories: List[Category] = generate_categories_from_vocabulary(self.vocabulary)
+        elif self.is_streaming():
+            # only the vocabulary is kept in memory
+            self.df = None
+
+            if csv_scan is None:
+                with self.timer.stage('load_data'):
+                    csv_scan = scan_csv(self.csv_path, self.target_name, self.chunk_size, self.get_columns_to_load(),
+                                        self.get_encoder(), self.target_processor.uses_classes)
+
+            self.vocabulary = csv_scan.vocabulary
+            self.target_classes = csv_scan.target_classes
+            self.n_rows = csv_scan.n_rows
+            # the classes are not collected for targets without any, such as the regression ones
+            self.unique_classes = len(self.target_classes) if self.target_classes is not None else None
+
+            if self.warm_start is not None:
+                self.vocabulary = grow_vocabulary(self.warm_start.vocabulary, self.vocabulary)
+
+            self.categories: List[Category] = generate_categories_from_vocabulary(self.vocabulary)
+        else:
+            if df is None:
+                with self.timer.stage('load_data'):
+                    df = load_guarantee_not_empty(self.csv_path, self.get_columns_to_load(), self.target_name)
+            elif self.feature_names is not None and list(df.columns) != self.get_columns_to_load():
+                df = df[self.get_columns_to_load()]
+
+            self.df = df
+            check_not_empty_dataframe(self.df)
+            check_target_existent_in_df(self.target_name, self.df)
+
+            self.unique_classes = self.df[self.target_name].nunique()
+
+            with self.timer.stage('generate_categories'):
+                if self.warm_start is not None:
+                    # the codes must be the ones of the previous run, so the vocabulary is learned up front
+                    self.vocabulary = grow_vocabulary(self.warm_start.vocabulary, self.learn_vocabulary())
+                    self.categories: List[Category] = generate_categories_from_vocabulary(self.vocabulary)
+                elif self.encoded:
+                    self.categories: List[Category] = generate_categories_from_encoded_df(self.df, self.target_name)
+                else:
+                    self.categories: List[Category] = generate_categories_from_df(self.df, self.target_name,
+                                                                                  self.get_encoder())
+
+        if self.warm_start is not None:
+            for category, embedding_size in zip(self.categories, self.warm_start.output_dims):
+                category.embedding_size = embedding_size
+
+        self.embedding_plan = self.plan_embeddings()
 
     @classmethod
     def make_default_config(cls,
@@ -112,9 +341,11 @@ class Config:
                             epochs: int = 10,
                             batch_size: int = 128,
                             verbose: bool = False,
-                            artifacts_path: str = 'artifacts'):
+                            artifacts_path: str = 'artifacts',
+                            chunk_size: int = None,
+                            **kwargs):
         """
-        Used to create a default Config object.
+        Used to create a default Config object from a csv, parquet, feather or arrow file.
 
         :param csv_path: where the csv containing both the features and target is located
         :param target_name: the name of the target/output variable
@@ -124,24 +355,57 @@ class Config:
         :param batch_size: the size of the batch size
         :param verbose: if logs should be outputted or not
         :param artifacts_path: where the artifacts (weights, labels, visualizations) should be stored
+        :param chunk_size: (optional) if provided, the csv is read in chunks of this many rows and encoded to disk
+        :param kwargs: any other optional argument accepted by Config
         :return: a Config object
         """
-        df = load_guarantee_not_empty(csv_path)
-        check_target_existent_in_df(target_name, df)
-        n_unique_classes = df[target_name].nunique()
-
+        check_csv_data(csv_path)
+        columns = get_columns_to_load(kwargs.get('feature_names'), target_name)
         target_processor = get_target_processor(target_type)
+
+        timer = StageTimer(kwargs.get('metrics_sinks'))
+        kwargs.update(stage_timer=timer)
+
+        encoder = (kwargs.get('vocabulary_options') or VocabularyOptions()).make_encoder()
+
+        with timer.stage('load_data'):
+            cache_entry = None
+            if kwargs.get('cache'):
+                cache = PreprocessingCache(os.path.join(artifacts_path, DEFAULT_CACHE_DIRNAME),
+                                           kwargs.get('cache_max_bytes', DEFAULT_CACHE_MAX_BYTES))
+                cache_entry = cache.get(make_preprocessing_cache_key(csv_path, None, target_name, target_processor,
+                                                                     kwargs.get('feature_names'),
+                                                                     kwargs.get('encoded', False),
+                                                                     encoder,
+                                                                     kwargs.get('sampling_options')))
+
+            if cache_entry is not None:
+                n_unique_classes = cache_entry.unique_classes
+                kwargs.update(chunk_size=chunk_size, cache_entry=cache_entry)
+            elif chunk_size is not None:
+                check_chunk_size(chunk_size)
+                csv_scan = scan_csv(csv_path, target_name, chunk_size, columns, encoder,
+                                    target_processor.uses_classes)
+                n_unique_classes = len(csv_scan.target_classes) if csv_scan.target_classes is not None else None
+                kwargs.update(chunk_size=chunk_size, csv_scan=csv_scan)
+            else:
+                df = load_guarantee_not_empty(csv_path, columns, target_name)
+                check_target_existent_in_df(target_name, df)
+                n_unique_classes = df[target_name].nunique()
+                kwargs.update(df=df)
+
         model_assembler = get_model_assembler(target_type, n_unique_classes)
 
-        return cls(csv_path,
-                   target_name,
-                   train_ratio,
-                   target_processor,
-                   model_assembler,
-                   epochs,
-                   batch_size,
-                   verbose,
-                   artifacts_path)
+        return cls(csv_path=csv_path,
+                   target_name=target_name,
+                   train_ratio=train_ratio,
+                   target_processor=target_processor,
+                   model_assembler=model_assembler,
+                   epochs=epochs,
+                   batch_size=batch_size,
+                   verbose=verbose,
+                   artifacts_path=artifacts_path,
+                   **kwargs)
 
     @classmethod
     def make_custom_config(cls,
@@ -153,7 +417,9 @@ class Config:
                            epochs: int = 10,
                            batch_size: int = 128,
                            verbose: bool = False,
-                           artifacts_path: str = 'artifacts'):
+                           artifacts_path: str = 'artifacts',
+                           chunk_size: int = None,
+                           **kwargs):
         """
         Used to create a custom Config object. Mostly should be used when you want to have a custom TargetProcessor
         and/or a custom ModelAssembler.
@@ -167,31 +433,246 @@ class Config:
         :param batch_size: the size of the batch size
         :param verbose: if logs should be outputted or not
         :param artifacts_path: where the artifacts (weights, labels, visualizations) should be stored
+        :param chunk_size: (optional) if provided, the csv is read in chunks of this many rows and encoded to disk
+        :param kwargs: any other optional argument accepted by Config
+        :return: a Config object
+        """
+        return cls(csv_path=csv_path,
+                   target_name=target_name,
+                   train_ratio=train_ratio,
+                   target_processor=target_processor,
+                   model_assembler=model_assembler,
+                   epochs=epochs,
+                   batch_size=batch_size,
+                   verbose=verbose,
+                   artifacts_path=artifacts_path,
+                   chunk_size=chunk_size,
+                   **kwargs)
+
+    @classmethod
+    def make_default_config_from_df(cls,
+                                    df: pd.DataFrame,
+                                    target_name: str,
+                                    target_type: TargetType,
+                                    train_ratio: float,
+                                    epochs: int = 10,
+                                    batch_size: int = 128,
+                                    verbose: bool = False,
+                                    artifacts_path: str = 'artifacts',
+                                    **kwargs):
+        """
+        Used to create a default Config object from a DataFrame already loaded in memory, instead of a csv.
+
+        :param df: the DataFrame containing both the features and target
+        :param target_name: the name of the target/output variable
+        :param target_type: the TargetType to be used (BINARY, REGRESSION, MULTICLASS)
+        :param train_ratio: the proportion to be used for the training subset
+        :param epochs: how many epochs should the model be trained
+        :param batch_size: the size of the batch size
+        :param verbose: if logs should be outputted or not
+        :param artifacts_path: where the artifacts (weights, labels, visualizations) should be stored
+        :param kwargs: any other optional argument accepted by Config
+        :return: a Config object
+        """
+        check_not_empty_dataframe(df)
+        check_target_existent_in_df(target_name, df)
+        n_unique_classes = df[target_name].nunique()
+
+        target_processor = get_target_processor(target_type)
+        model_assembler = get_model_assembler(target_type, n_unique_classes)
+
+        return cls(csv_path=None,
+                   target_name=target_name,
+                   train_ratio=train_ratio,
+                   target_processor=target_processor,
+                   model_assembler=model_assembler,
+                   epochs=epochs,
+                   batch_size=batch_size,
+                   verbose=verbose,
+                   artifacts_path=artifacts_path,
+                   df=df,
+                   **kwargs)
+
+    @classmethod
+    def make_custom_config_from_df(cls,
+                                   df: pd.DataFrame,
+                                   target_name: str,
+                                   train_ratio: float,
+                                   target_processor: TargetProcessor,
+                                   model_assembler: ModelAssembler,
+                                   epochs: int = 10,
+                                   batch_size: int = 128,
+                                   verbose: bool = False,
+                                   artifacts_path: str = 'artifacts',
+                                   **kwargs):
+        """
+        Used to create a custom Config object from a DataFrame already loaded in memory, instead of a csv.
+
+        :param df: the DataFrame containing both the features and target
+        :param target_name: the name of the target/output variable
+        :param train_ratio: the proportion to be used for the training subset
+        :param target_processor: the TargetProcessor to be used
+        :param model_assembler: the ModelAssembler to be used
+        :param epochs: how many epochs should the model be trained
+        :param batch_size: the size of the batch size
+        :param verbose: if logs should be outputted or not
+        :param artifacts_path: where the artifacts (weights, labels, visualizations) should be stored
+        :param kwargs: any other optional argument accepted by Config
+        :return: a Config object
+        """
+        return cls(csv_path=None,
+                   target_name=target_name,
+                   train_ratio=train_ratio,
+                   target_processor=target_processor,
+                   model_assembler=model_assembler,
+                   epochs=epochs,
+                   batch_size=batch_size,
+                   verbose=verbose,
+                   artifacts_path=artifacts_path,
+                   df=df,
+                   **kwargs)
+
+    @classmethod
+    def make_default_config_from_arrays(cls,
+                                        X: np.ndarray,
+                                        y: np.ndarray,
+                                        target_type: TargetType,
+                                        train_ratio: float,
+                                        feature_names: List[str] = None,
+                                        target_name: str = 'target',
+                                        epochs: int = 10,
+                                        batch_size: int = 128,
+                                        verbose: bool = False,
+                                        artifacts_path: str = 'artifacts',
+                                        **kwargs):
+        """
+        Used to create a default Config object from features that are already label encoded.
+
+        :param X: the integer matrix of encoded features, with one column per category
+        :param y: the targets
+        :param target_type: the TargetType to be used (BINARY, REGRESSION, MULTICLASS)
+        :param train_ratio: the proportion to be used for the training subset
+        :param feature_names: (optional) the name of each column of X, defaults to feature_0, feature_1...
+        :param target_name: (optional) the name of the target/output variable
+        :param epochs: how many epochs should the model be trained
+        :param batch_size: the size of the batch size
+        :param verbose: if logs should be outputted or not
+        :param artifacts_path: where the artifacts (weights, labels, visualizations) should be stored
+        :param kwargs: any other optional argument accepted by Config
         :return: a Config object
         """
-        return cls(csv_path,
-                   target_name,
-                   train_ratio,
-                   target_processor,
-                   model_assembler,
-                   epochs,
-                   batch_size,
-                   verbose,
-                   artifacts_path)
+        check_encoded_features(X)
+        df = make_dataframe_from_arrays(X, y, feature_names, target_name)
+
+        return cls.make_default_config_from_df(df=df,
+                                               target_name=target_name,
+                                               target_type=target_type,
+                                               train_ratio=train_ratio,
+                                               epochs=epochs,
+                                               batch_size=batch_size,
+                                               verbose=verbose,
+                                               artifacts_path=artifacts_path,
+                                               encoded=True,
+                                               **kwargs)
+
+    def is_streaming(self) -> bool:
+        """
+        Used to check if the data is read in chunks instead of being fully loaded in memory
+        :return: a boolean if a chunk size was provided
+        """
+        return self.chunk_size is not None
+
+    def get_batch_feeding(self) -> BatchFeeding:
+        """
+        Used to get how the batches are fed, which the data read in chunks always is
+        :return: the BatchFeeding of this Config, or the default one when none was provided
+        """
+        return self.batch_feeding or BatchFeeding()
+
+    def get_encoder(self) -> CategoricalEncoder:
+        """
+        Used to create the CategoricalEncoder of the features, with the hashing and pruning options of this Config
+        :return: a new CategoricalEncoder object
+        """
+        return self.vocabulary_options.make_encoder()
+
+    def plan_embeddings(self) -> EmbeddingPlan:
+        """
+        Used to fit the embedding sizes of the categories into the budget of this Config
+        :return: the EmbeddingPlan applied to the categories, or None when there is no budget
+        """
+        budget = self.embedding_budget
+        if budget.max_parameters is None and budget.max_memory_bytes is None:
+            return None
+
+        counts = self.get_value_counts() if budget.size_weighting == SizeWeighting.FREQUENCY else None
+        plan = plan_embedding_sizes(self.categories, budget.max_parameters, budget.max_memory_bytes,
+                                    budget.size_weighting, counts, self.model_assembler.optimizer)
+        plan.apply(self.categories)
+
+        if self.verbose:
+            print(plan.report())
+
+        return plan
+
+    def learn_vocabulary(self) -> Vocabulary:
+        """
+        Used to learn the vocabulary of the features in memory without encoding them
+        :return: the Vocabulary learned
+        """
+        names = [column for column in self.df if column != self.target_name]
+        if self.encoded:
+            return Vocabulary([ColumnVocabulary(name, np.arange(int(self.df[name].max()) + 1)) for name in names])
+
+        encoder = self.get_encoder()
+        encoder.partial_fit([self.df[name].values for name in names], names)
+        return encoder.get_vocabulary()
+
+    def get_warm_start_tables(self) -> List[np.ndarray]:
+        """
+        Used to get the embedding matrices the network should begin with when warm starting
+        :return: the embedding matrix of each category, with the rows learned by the previous run
+        """
+        return get_warm_start_tables(self.warm_start, self.vocabulary)
+
+    def get_value_counts(self) -> List[np.ndarray]:
+        """
+        Used to count how many times each value of each category is seen, from the data in memory or the cached codes
+        :return: a list with the counts of each category
+        """
+        if self.cache_entry is not None:
+            return [pd.Series(self.cache_entry.X[:, index]).value_counts().values
+                    for index in range(len(self.categories))]
+
+        return [self.df[category.alias].value_counts(dropna=False).values for category in self.categories]
+
+    def get_columns_to_load(self) -> List[str]:
+        """
+        Used to return the columns that should be read from the data file
+        :return: the feature names followed by the target name, or None when every column should be read
+        """
+        return get_columns_to_load(self.feature_names, self.target_name)
+
+    def get_encoded_dir(self):
+        """
+        Used to return the path where the encoded data is written when reading it in chunks
+        :return: the path of the encoded data on disk
+        """
+        return os.path.join(self.artifacts_path, self.DEFAULT_PATH_ENCODED)
 
-    def get_weights_path(self):
+    def get_cache_dir(self):
         """
-        Used to return the path of the stored weights
-        :return: the pah of the stored weights on disk
+        Used to return the path where the pre-processed data is cached
+        :return: the path of the cache on disk
         """
-        return os.path.join(self.artifacts_path, self.DEFAULT_WEIGHTS_FILENAME)
+        return os.path.join(self.artifacts_path, self.DEFAULT_PATH_CACHE)
 
-    def get_labels_path(self):
+    def get_embeddings_dir(self):
         """
-        Used to return the path of the stored labels
-        :return: the pah of the stored labels on disk
+        Used to return the path where the embeddings and their vocabularies are stored
+        :return: the path of the stored embeddings on disk
         """
-        return os.path.join(self.artifacts_path, self.DEFAULT_LABELS_FILENAME)
+        return os.path.join(self.artifacts_path, self.DEFAULT_PATH_EMBEDDINGS)
 
     def get_visualizations_dir(self):
         """
@@ -1,11 +1,15 @@
 import os
-from typing import Tuple, List
+from typing import Tuple, List, Union
 
 import numpy as np
+import pandas as pd
 
 from entity_embeddings.config import Config
+from entity_embeddings.encoder import Vocabulary
+from entity_embeddings.inference import EmbeddingStore
 from entity_embeddings.network.network import EmbeddingNetwork
-from entity_embeddings.util import model_utils, preprocessing_utils, visualization_utils
+from entity_embeddings.util import model_utils, sampling_utils
+from entity_embeddings.util.encoding_utils import encode_data
 
 
 class Embedder:
@@ -16,34 +20,52 @@ class Embedder:
 
     def __init__(self, config: Config):
         self.config = config
-        self.network = EmbeddingNetwork(config)
-        self.X_train, self.X_val, self.y_train, self.y_val, self.labels = self.prepare_data()
+        self.timer = config.timer
+
+        with self.timer.stage('build_network'):
+            self.network = EmbeddingNetwork(config)
+
+        with self.timer.stage('prepare_data'):
+            self.X_train, self.X_val, self.y_train, self.y_val, self.labels = self.prepare_data()
+
+        self.store = None
 
     def prepare_data(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, List]:
         """
         This method is used to perform all the required pre-processing steps on the provided set of features and the
         targets, such as label encoding and sampling.
         :return: a tuple containing 5 different elements in the following order: X_train, X_val, y_train, y_val and the
-        encoded labels
+        Vocabulary of the encoded features
         """
-        X, y = preprocessing_utils.get_X_y(self.config.df, self.config.target_name)
-
-        # pre processing of X and Y
-        X, labels = preprocessing_utils.label_encode(X)
-        y = np.array(y)
+        X, y, labels = encode_data(self.config)
 
-        num_records = len(X)
-        train_size = int(self.config.train_ratio * num_records)
+        return self._split_data(X, y, labels)
 
-        X_train = X[:train_size]
-        X_val = X[train_size:]
-        y_train = y[:train_size]
-        y_val = y[train_size:]
-
-        X_train, y_train = preprocessing_utils.sample(X_train, y_train, 1000)  # Simulate data sparsity
-
-        y_train = self.config.target_processor.process_target(y_train.tolist())
-        y_val = self.config.target_processor.process_target(y_val.tolist())
+    def _split_data(self, X: np.ndarray, y: np.ndarray, labels: Vocabulary) \
+            -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray, List]:
+        """
+        This method is used to split the pre-processed data into the training and validation sets, and to sample the
+        training rows as set on the Config
+        :param X: the encoded features
+        :param y: the processed targets
+        :param labels: the Vocabulary of the encoded features
+        :return: the same tuple returned by prepare_data
+        """
+        if self.config.validation_rows is not None:
+            # the rows read by batch are only gathered one batch at a time
+            lazy = self.config.is_streaming() or self.config.batch_feeding is not None
+            X_train, X_val, y_train, y_val = sampling_utils.split_rows(X, y, self.config.validation_rows, lazy)
+        else:
+            train_size = int(self.config.train_ratio * len(X))
+
+            X_train = X[:train_size]
+            X_val = X[train_size:]
+            y_train = y[:train_size]
+            y_val = y[train_size:]
+
+        options = self.config.sampling_options
+        X_train, y_train = sampling_utils.sample_training_data(X_train, y_train, self.config.sampling, options.size,
+                                                               options.seed)
 
         return X_train, X_val, y_train, y_val, labels
 
@@ -53,15 +75,33 @@ class Embedder:
         Entity Embedding Network, as well as to save the weights into the disk.
         """
 
-        history = self.network.fit(self.X_train, self.y_train, self.X_val, self.y_val)
+        with self.timer.stage('fit'):
+            history = self.network.fit(self.X_train, self.y_train, self.X_val, self.y_val)
 
         if not os.path.exists(self.config.artifacts_path):
             os.makedirs(self.config.artifacts_path, exist_ok=True)
 
-        weights = model_utils.get_weights(self.network.model, self.config)
+        with self.timer.stage('get_weights'):
+            weights = model_utils.get_weights(self.network.model, self.config)
 
         # save artifacts
-        model_utils.save_weights(weights, self.config)
-        model_utils.save_labels(self.labels, self.config)
+        with self.timer.stage('save_embeddings'):
+            artifacts = model_utils.save_embeddings(weights, self.labels, self.config)
+
+        self.store = EmbeddingStore(artifacts, self.config.oov)
+
+        with self.timer.stage('plot_history'):
+            # matplotlib and sklearn are only imported once the plots are made
+            from entity_embeddings.util import visualization_utils
+            visualization_utils.make_plot_from_history(history, self.config.artifacts_path)
+
+    def transform(self, data: Union[pd.DataFrame, np.ndarray, List[np.ndarray]]) -> np.ndarray:
+        """
+        This method is used to embed new raw categorical values with the weights learned by perform_embedding
+        :param data: a DataFrame holding the feature columns, a 2-dimensional array or a list of columns
+        :return: the (rows, embedding size) float32 matrix of embeddings
+        """
+        if self.store is None:
+            raise ValueError("You should perform the embedding before transforming new data")
 
-        visualization_utils.make_plot_from_history(history, self.config.artifacts_path)
+        return self.store.transform(data)
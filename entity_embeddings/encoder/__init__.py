@@ -0,0 +1,8 @@
+from entity_embeddings.util.lazy_utils import make_lazy
+
+# the encoder is only needed to train
+make_lazy(__name__, {'CategoricalEncoder': 'entity_embeddings.encoder.encoder',
+                     'get_code_dtype': 'entity_embeddings.encoder.encoder',
+                     'ColumnVocabulary': 'entity_embeddings.encoder.vocabulary',
+                     'HashedColumnVocabulary': 'entity_embeddings.encoder.vocabulary',
+                     'Vocabulary': 'entity_embeddings.encoder.vocabulary'})
@@ -0,0 +1,228 @@
+"""
+This file contains the CategoricalEncoder class, which turns categorical columns into integer codes, one column at a
+time.
+"""
+from collections import Counter
+from functools import partial
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from entity_embeddings.encoder.parallel import map_columns
+from entity_embeddings.encoder.vocabulary import ColumnVocabulary, HashedColumnVocabulary, Vocabulary
+
+
+def get_code_dtype(n_values: int, signed: bool = False) -> np.dtype:
+    """
+    Used to choose the narrowest integer dtype able to hold the codes of a given number of distinct values
+    :param n_values: the greatest number of distinct values among the encoded columns
+    :param signed: if negative codes (such as UNKNOWN_CODE) should also fit
+    :return: the narrowest unsigned (or signed) numpy dtype
+    """
+    dtypes = (np.int8, np.int16, np.int32) if signed else (np.uint8, np.uint16, np.int32)
+    for dtype in dtypes:
+        if n_values - 1 <= np.iinfo(dtype).max:
+            return np.dtype(dtype)
+
+    return np.dtype(np.int64)
+
+
+def factorize_column(column: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Used to factorize a single column into codes and its distinct values, missing values included
+    :param column: the column to be factorized
+    :return: a tuple containing the codes and the distinct values, sorted so the codes match the ones of a LabelEncoder
+    """
+    codes, values = pd.factorize(column, sort=True)
+    values = np.asarray(values)
+
+    missing = codes < 0
+    if missing.any():
+        codes[missing] = len(values)
+        values = np.append(values.astype(object) if values.dtype.kind not in 'fcO' else values, np.nan)
+
+    return codes, values
+
+
+def get_kept_values(counts: np.ndarray, min_frequency: int = None, max_vocabulary_size: int = None) -> np.ndarray:
+    """
+    Used to choose which values of a column keep an embedding of their own, the others sharing a single one
+    :param counts: how many times each value was seen
+    :param min_frequency: (optional) how many times a value must be seen to be kept
+    :param max_vocabulary_size: (optional) how many of the most frequent values should be kept at most
+    :return: the boolean mask of the kept values
+    """
+    counts = np.asarray(counts)
+    keep = np.ones(len(counts), dtype=bool)
+
+    if min_frequency is not None:
+        keep &= counts >= min_frequency
+
+    if max_vocabulary_size is not None and keep.sum() > max_vocabulary_size:
+        top = np.zeros(len(counts), dtype=bool)
+        top[np.argsort(-counts, kind='stable')[:max_vocabulary_size]] = True
+        keep &= top
+
+    return keep
+
+
+def prune_column(codes: np.ndarray,
+                 values: np.ndarray,
+                 counts: np.ndarray,
+                 min_frequency: int = None,
+                 max_vocabulary_size: int = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Used to remove the rare values of a factorized column, whose codes are replaced by the shared one
+    :param codes: the codes returned by factorize_column, or None when only the values should be pruned
+    :param values: the distinct values returned by factorize_column
+    :param counts: how many times each value was seen
+    :param min_frequency: (optional) how many times a value must be seen to be kept
+    :param max_vocabulary_size: (optional) how many of the most frequent values should be kept at most
+    :return: a tuple containing the new codes (or None) and the kept values, in the same order they had
+    """
+    keep = get_kept_values(counts, min_frequency, max_vocabulary_size)
+    new_codes = np.where(keep, np.cumsum(keep) - 1, keep.sum())
+
+    return (new_codes[codes] if codes is not None else None), values[keep]
+
+
+class CategoricalEncoder:
+    """
+    This class is used to encode the categorical features column by column, hashing the columns of hashed_buckets and
+    giving the rare values of the others a single shared code
+    """
+
+    def __init__(self,
+                 hashed_buckets: Dict[str, int] = None,
+                 n_hashes: int = 1,
+                 min_frequency: int = None,
+                 max_vocabulary_size: int = None,
+                 workers: int = 1,
+                 use_multiprocessing: bool = False):
+        """
+        :param hashed_buckets: (optional) the number of buckets of each column to be hashed, by name
+        :param n_hashes: how many buckets each value of a hashed column is hashed into
+        :param min_frequency: (optional) how many times a value must be seen to get a code of its own
+        :param max_vocabulary_size: (optional) how many of the most frequent values of a column get a code of their own
+        :param workers: how many columns should be encoded at once by fit_transform
+        :param use_multiprocessing: if the columns should be encoded by processes instead of threads
+        """
+        self.hashed_buckets = hashed_buckets or {}
+        self.n_hashes = n_hashes
+        self.min_frequency = min_frequency
+        self.max_vocabulary_size = max_vocabulary_size
+        self.workers = workers
+        self.use_multiprocessing = use_multiprocessing
+
+        # how many times each value of each column was seen by partial_fit
+        self._names = None
+        self._seen = None
+        self._missing = None
+
+    @property
+    def pruned(self) -> bool:
+        return self.min_frequency is not None or self.max_vocabulary_size is not None
+
+    def fit_transform(self, columns: List[np.ndarray], names: List[str]) -> Tuple[np.ndarray, Vocabulary]:
+        """
+        Used to learn the vocabulary of the given columns and encode them
+        :param columns: the list of columns to be encoded, such as the one returned by get_X_y_columnar
+        :param names: the name of each of the columns
+        :return: a tuple containing the encoded np.ndarray and the Vocabulary learned
+        """
+        factorized = map_columns(partial(self._fit_transform_column, names=names), columns, self.workers,
+                                 self.use_multiprocessing)
+
+        dtype = get_code_dtype(max(column_vocabulary.n_codes for _, column_vocabulary in factorized))
+        data_encoded = np.empty((len(columns[0]), len(columns)), dtype=dtype)
+
+        for index, (codes, _) in enumerate(factorized):
+            data_encoded[:, index] = codes
+
+        return data_encoded, Vocabulary([column_vocabulary for _, column_vocabulary in factorized])
+
+    def _fit_transform_column(self, column: np.ndarray, index: int, names: List[str]) \
+            -> Tuple[np.ndarray, ColumnVocabulary]:
+        name = names[index]
+        if name in self.hashed_buckets:
+            column_vocabulary = self._make_hashed_vocabulary(name)
+            codes = column_vocabulary.transform(column)
+        else:
+            codes, values = factorize_column(column)
+            if self.pruned:
+                counts = np.bincount(codes, minlength=len(values))
+                codes, values = prune_column(codes, values, counts, self.min_frequency, self.max_vocabulary_size)
+
+            column_vocabulary = ColumnVocabulary(name, values, self.pruned)
+
+        # narrowed right away, so only one column is ever held as int64
+        return codes.astype(get_code_dtype(column_vocabulary.n_codes)), column_vocabulary
+
+    def partial_fit(self, columns: List[np.ndarray], names: List[str]) -> None:
+        """
+        Used to learn the vocabulary of a dataset that does not fit in memory, one chunk at a time
+        :param columns: the list of columns of the current chunk
+        :param names: the name of each of the columns
+        """
+        if self._seen is None:
+            self._names = list(names)
+            self._seen = [Counter() for _ in names]
+            self._missing = [0 for _ in names]
+
+        for index, column in enumerate(columns):
+            if self._names[index] in self.hashed_buckets:
+                continue
+
+            counts = pd.Series(column).value_counts()
+
+            self._missing[index] += int(pd.isnull(column).sum())
+            self._seen[index].update(dict(zip(counts.index.tolist(), counts.values.tolist())))
+
+    def get_vocabulary(self) -> Vocabulary:
+        """
+        Used to gather the vocabulary learned through partial_fit
+        :return: the Vocabulary learned
+        """
+        if self._seen is None:
+            raise ValueError("You should call partial_fit at least once before getting the vocabulary")
+
+        vocabularies = []
+        for name, seen, missing in zip(self._names, self._seen, self._missing):
+            if name in self.hashed_buckets:
+                vocabularies.append(self._make_hashed_vocabulary(name))
+                continue
+
+            values = list(seen) + ([np.nan] if missing else [])
+            _, values = factorize_column(np.asarray(pd.Index(values)))
+
+            if self.pruned:
+                counts = [seen[value] for value in values[:len(seen)].tolist()] + ([missing] if missing else [])
+                _, values = prune_column(None, values, counts, self.min_frequency, self.max_vocabulary_size)
+
+            vocabularies.append(ColumnVocabulary(name, values, self.pruned))
+
+        return Vocabulary(vocabularies)
+
+    def transform(self, columns: List[np.ndarray], vocabulary: Vocabulary) -> np.ndarray:
+        """
+        Used to encode the given columns with a previously learned vocabulary
+        :param columns: the list of columns to be encoded
+        :param vocabulary: the Vocabulary to be used
+        :return: the encoded np.ndarray, with the same dtype fit_transform returns
+        """
+        dtype = get_code_dtype(max(column_vocabulary.n_codes for column_vocabulary in vocabulary))
+        data_encoded = np.empty((len(columns[0]), len(columns)), dtype=dtype)
+
+        for index, (column, column_vocabulary) in enumerate(zip(columns, vocabulary)):
+            codes = column_vocabulary.transform(column)
+            if codes.min(initial=0) < 0:
+                raise ValueError("You should provide values present in the vocabulary of %s, or prune it so that the "
+                                 "unknown ones share its other code" % column_vocabulary.name)
+
+            data_encoded[:, index] = codes
+
+        return data_encoded
+
+    def _make_hashed_vocabulary(self, name: str) -> HashedColumnVocabulary:
+        return HashedColumnVocabulary(name, self.hashed_buckets[name], self.n_hashes)
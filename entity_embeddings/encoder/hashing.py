@@ -0,0 +1,83 @@
+"""
+This file contains the hashing trick used to encode categorical columns of unbounded cardinality, such as user ids,
+without learning their vocabulary.
+"""
+from typing import Dict
+
+import numpy as np
+
+# fingerprints are kept below this prime, so that a fingerprint times a multiplier fits in an int64
+HASH_PRIME = 2 ** 31 - 1
+MAX_N_HASHES = 8
+
+MAX_INTEGRAL_FLOAT = 2 ** 63
+
+# the first hash is the fingerprint itself
+HASH_MULTIPLIERS = np.append(1, np.random.RandomState(0).randint(1, HASH_PRIME, MAX_N_HASHES - 1, dtype=np.int64))
+HASH_INCREMENTS = np.append(0, np.random.RandomState(1).randint(0, HASH_PRIME, MAX_N_HASHES - 1, dtype=np.int64))
+
+
+def hash_values(column: np.ndarray) -> np.ndarray:
+    """
+    Used to compute the fingerprint of each value of a column from its text, so that it does not depend on the dtype
+    of the column
+    :param column: the raw values to be hashed
+    :return: the int64 fingerprints, from 0 up to HASH_PRIME - 1
+    """
+    import pandas as pd
+
+    codes, uniques = pd.factorize(np.asarray(column))
+
+    # the missing values get the code -1, which takes the 'nan' appended last
+    text = np.append(_to_text(np.asarray(uniques)), 'nan').astype(object)
+    fingerprints = (pd.util.hash_array(text, categorize=False) % np.uint64(HASH_PRIME)).astype(np.int64)
+
+    return fingerprints[codes]
+
+
+def _to_text(values: np.ndarray) -> np.ndarray:
+    """
+    Used to turn values into the text they are hashed by, writing the integral floats as integers
+    """
+    if values.dtype.kind == 'f':
+        integral = np.isfinite(values) & (np.mod(values, 1) == 0) & (np.abs(values) < MAX_INTEGRAL_FLOAT)
+        text = values.astype(str).astype(object)
+        text[integral] = values[integral].astype(np.int64).astype(str)
+        return text
+
+    if values.dtype == object:
+        return np.array([str(int(value)) if isinstance(value, (float, np.floating)) and float(value).is_integer()
+                         and abs(value) < MAX_INTEGRAL_FLOAT else str(value) for value in values], dtype=object)
+
+    return values.astype(str)
+
+
+def get_hash_buckets(fingerprints: np.ndarray, n_buckets: int, n_hashes: int) -> np.ndarray:
+    """
+    Used to derive the bucket indices of each fingerprint, one for each hash function
+    :param fingerprints: the fingerprints returned by hash_values
+    :param n_buckets: the number of rows of the embedding matrix
+    :param n_hashes: how many hash functions should be used
+    :return: the (fingerprints, n_hashes) int64 matrix of bucket indices
+    """
+    fingerprints = np.asarray(fingerprints, dtype=np.int64)[:, np.newaxis]
+    hashes = (fingerprints * HASH_MULTIPLIERS[:n_hashes] + HASH_INCREMENTS[:n_hashes]) % HASH_PRIME
+
+    return hashes % n_buckets
+
+
+def check_hashing(hashed_buckets: Dict[str, int], n_hashes: int, encoded: bool, fused_embeddings: bool) -> None:
+    if not hashed_buckets:
+        return
+
+    if any(n_buckets <= 0 for n_buckets in hashed_buckets.values()):
+        raise ValueError("You should provide a number of buckets greater than zero for every hashed column")
+
+    if not 1 <= n_hashes <= MAX_N_HASHES:
+        raise ValueError("You should provide a number of hashes between 1 and %d" % MAX_N_HASHES)
+
+    if encoded:
+        raise ValueError("You should provide raw values, instead of encoded ones, for the hashed columns")
+
+    if fused_embeddings and n_hashes > 1:
+        raise ValueError("You should provide a single hash for the hashed columns when using fused embeddings")
@@ -0,0 +1,66 @@
+"""
+This file contains the map_columns function, used to run a per-column function over many columns at once, by threads
+or by forked processes sharing the memory of the columns.
+"""
+import multiprocessing
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Callable, List
+
+import numpy as np
+
+# the columns being mapped, set only inside the forked worker processes
+_shared_columns = None
+
+# the modules starting threads of their own, which are unsafe to fork
+FORK_UNSAFE_MODULES = ('tensorflow', 'keras')
+
+
+def _share_columns(columns: List[np.ndarray]) -> None:
+    global _shared_columns
+    _shared_columns = columns
+
+
+def _apply_to_shared_column(function: Callable, index: int):
+    return function(_shared_columns[index], index)
+
+
+def can_fork() -> bool:
+    """
+    Used to check if the current process can be forked safely, while it runs a single thread
+    :return: a boolean if fork is available and safe
+    """
+    return 'fork' in multiprocessing.get_all_start_methods() and threading.active_count() == 1 and \
+        not any(name in sys.modules for name in FORK_UNSAFE_MODULES)
+
+
+def map_columns(function: Callable,
+                columns: List[np.ndarray],
+                workers: int = 1,
+                use_multiprocessing: bool = False) -> List:
+    """
+    Used to apply a function to each of the given columns, in parallel when more than one worker is given
+    :param function: called as function(column, index), which should be picklable when using multiprocessing
+    :param columns: the list of columns
+    :param workers: how many threads or processes should be used
+    :param use_multiprocessing: if processes should be used instead of threads
+    :return: the results of the function, in the same order of the columns
+    """
+    workers = min(workers, len(columns))
+    if workers <= 1:
+        return [function(column, index) for index, column in enumerate(columns)]
+
+    if not use_multiprocessing:
+        with ThreadPoolExecutor(workers) as executor:
+            return list(executor.map(function, columns, range(len(columns))))
+
+    if not can_fork():
+        # spawned children receive a pickled copy of the columns
+        with multiprocessing.get_context('spawn').Pool(workers) as pool:
+            return pool.starmap(function, zip(columns, range(len(columns))), chunksize=1)
+
+    # forked children inherit the initializer arguments instead of unpickling them
+    with multiprocessing.get_context('fork').Pool(workers, _share_columns, (columns,)) as pool:
+        return pool.map(partial(_apply_to_shared_column, function), range(len(columns)), chunksize=1)
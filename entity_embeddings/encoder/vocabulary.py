@@ -0,0 +1,207 @@
+"""
+This file contains the ColumnVocabulary, HashedColumnVocabulary and Vocabulary classes, which store the codes given
+to each categorical column by the CategoricalEncoder.
+"""
+from typing import List, Union
+
+import numpy as np
+
+from entity_embeddings.encoder.hashing import HASH_PRIME, get_hash_buckets, hash_values
+
+UNKNOWN_CODE = -1
+OTHER_VALUE = '<other>'
+
+
+class ColumnVocabulary:
+    """
+    Used to store the distinct values of a single categorical column, where the position of each value is its code
+    and a pruned vocabulary has an extra code shared by every other value
+    """
+
+    def __init__(self, name: str, values: np.ndarray, other: bool = False):
+        """
+        :param name: the name of the column
+        :param values: the distinct values kept, in the order of their codes
+        :param other: if the values not kept are encoded with the shared code len(values), instead of UNKNOWN_CODE
+        """
+        self.name = name
+        self.values = values
+        self.other = other
+        self._index = None
+
+    @property
+    def classes_(self) -> np.ndarray:
+        """
+        Alias of values, so that a ColumnVocabulary can be used as a fitted LabelEncoder
+        """
+        return self.values
+
+    def __len__(self) -> int:
+        return len(self.values) + int(self.other)
+
+    @property
+    def n_codes(self) -> int:
+        """
+        The number of distinct codes returned by transform
+        """
+        return len(self)
+
+    @property
+    def other_code(self) -> int:
+        """
+        The code shared by the values not kept in a pruned vocabulary, or UNKNOWN_CODE when it was not pruned
+        """
+        return len(self.values) if self.other else UNKNOWN_CODE
+
+    def transform(self, column: np.ndarray) -> np.ndarray:
+        """
+        Used to encode a given column through a hash lookup on this vocabulary
+        :param column: the raw values to be encoded
+        :return: the codes of the given values, with other_code for the values not present in the vocabulary
+        """
+        if self._index is None:
+            # pandas is only imported here, so that single rows are looked up with numpy alone
+            import pandas as pd
+            self._index = pd.Index(self.values)
+
+        codes = self._index.get_indexer(column)
+        if self.other:
+            codes[codes == UNKNOWN_CODE] = self.other_code
+
+        return codes
+
+    def inverse_transform(self, codes: np.ndarray) -> np.ndarray:
+        """
+        Used to decode a given array of codes back into its raw values
+        :param codes: the codes to be decoded
+        :return: the raw values of the given codes, with OTHER_VALUE for the shared code of a pruned vocabulary
+        """
+        if self.other:
+            return np.append(self.values.astype(object), OTHER_VALUE)[codes]
+
+        return self.values[codes]
+
+
+class HashedColumnVocabulary:
+    """
+    Used in place of a ColumnVocabulary for a column encoded through the hashing trick, whose values are hashed into
+    n_hashes of n_buckets rows
+    """
+
+    # the values are unknown, so there is nothing to decode the codes into
+    values = None
+    classes_ = None
+
+    def __init__(self, name: str, n_buckets: int, n_hashes: int = 1):
+        """
+        :param name: the name of the column
+        :param n_buckets: the number of rows of the embedding matrix
+        :param n_hashes: how many buckets each value is hashed into
+        """
+        self.name = name
+        self.n_buckets = int(n_buckets)
+        self.n_hashes = int(n_hashes)
+
+    def __len__(self) -> int:
+        return self.n_buckets
+
+    @property
+    def n_codes(self) -> int:
+        """
+        The number of distinct codes returned by transform, buckets for a single hash and fingerprints otherwise
+        """
+        return self.n_buckets if self.n_hashes == 1 else HASH_PRIME
+
+    def transform(self, column: np.ndarray) -> np.ndarray:
+        """
+        Used to encode a given column by hashing its values, so that no value is ever unknown
+        :param column: the raw values to be encoded
+        :return: the bucket of each value for a single hash, or its fingerprint otherwise (see get_buckets)
+        """
+        fingerprints = hash_values(column)
+        if self.n_hashes == 1:
+            return fingerprints % self.n_buckets
+
+        return fingerprints
+
+    def get_buckets(self, codes: np.ndarray) -> np.ndarray:
+        """
+        Used to retrieve the rows of the embedding matrix of the given codes
+        :param codes: the codes returned by transform
+        :return: the (codes, n_hashes) matrix of rows
+        """
+        if self.n_hashes == 1:
+            return np.asarray(codes)[:, np.newaxis]
+
+        return get_hash_buckets(codes, self.n_buckets, self.n_hashes)
+
+    def inverse_transform(self, codes: np.ndarray) -> np.ndarray:
+        raise ValueError("You should provide codes of a column that is not hashed, since hashing cannot be reverted")
+
+
+class Vocabulary:
+    """
+    Used to store the ColumnVocabulary of every categorical column, in the same order of the encoded features
+    """
+
+    def __init__(self, columns: List[Union[ColumnVocabulary, HashedColumnVocabulary]]):
+        self.columns = columns
+
+    @property
+    def names(self) -> List[str]:
+        return [column.name for column in self.columns]
+
+    def __len__(self) -> int:
+        return len(self.columns)
+
+    def __iter__(self):
+        return iter(self.columns)
+
+    def __getitem__(self, item: Union[int, str]) -> ColumnVocabulary:
+        if isinstance(item, str):
+            return self.columns[self.names.index(item)]
+
+        return self.columns[item]
+
+    def save(self, path: str) -> None:
+        """
+        Used to save this vocabulary as a single .npz file, with one array per column
+        :param path: where the vocabulary should be saved
+        """
+        arrays = {'names': np.array(self.names, dtype=str)}
+        for index, column in enumerate(self.columns):
+            if isinstance(column, HashedColumnVocabulary):
+                arrays['hashed_%d' % index] = np.array([column.n_buckets, column.n_hashes])
+            else:
+                arrays['values_%d' % index] = _to_storable(column.values)
+                arrays['other_%d' % index] = np.array(column.other)
+
+        np.savez(path, **arrays)
+
+    @classmethod
+    def load(cls, path: str) -> 'Vocabulary':
+        """
+        Used to load a vocabulary previously stored with the save method
+        :param path: where the vocabulary is located
+        :return: the loaded Vocabulary
+        """
+        with np.load(path, allow_pickle=True) as arrays:
+            names = arrays['names'].tolist()
+            columns = [HashedColumnVocabulary(name, *arrays['hashed_%d' % index]) if 'hashed_%d' % index in arrays else
+                       ColumnVocabulary(name, arrays['values_%d' % index],
+                                        'other_%d' % index in arrays and bool(arrays['other_%d' % index]))
+                       for index, name in enumerate(names)]
+
+        return cls(columns)
+
+
+def _to_storable(values: np.ndarray) -> np.ndarray:
+    """
+    Used to convert object arrays made only of strings into fixed-width string arrays
+    :param values: the values of a ColumnVocabulary
+    :return: the values in a dtype suitable to be saved
+    """
+    if values.dtype == object and all(isinstance(value, str) for value in values):
+        return values.astype(str)
+
+    return values
@@ -0,0 +1,2 @@
+from entity_embeddings.inference.oov import OutOfVocabulary
+from entity_embeddings.inference.store import EmbeddingStore
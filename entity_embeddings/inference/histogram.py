@@ -0,0 +1,70 @@
+"""
+This file contains the Histogram class, used to keep track of the distribution of values such as request latencies or
+batch sizes, in constant memory.
+"""
+from typing import Dict, List
+
+import numpy as np
+
+
+def make_exponential_bounds(start: float, stop: float, factor: float = 2) -> List[float]:
+    """
+    Used to make bucket bounds growing by a constant factor
+    :param start: the upper bound of the first bucket
+    :param stop: the greatest bound
+    :param factor: how much each bound grows compared to the previous one
+    :return: the list of bounds
+    """
+    bounds = [start]
+    while bounds[-1] < stop:
+        bounds.append(bounds[-1] * factor)
+
+    return bounds
+
+
+class Histogram:
+    """
+    Used to count values into buckets of given upper bounds, plus a last one for the values past them
+    """
+
+    def __init__(self, bounds: List[float]):
+        self.bounds = np.asarray(bounds, dtype=float)
+        self.counts = np.zeros(len(bounds) + 1, dtype=np.int64)
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, value: float, count: int = 1) -> None:
+        self.counts[np.searchsorted(self.bounds, value)] += count
+        self.total += value * count
+        self.max = max(self.max, value)
+
+    @property
+    def count(self) -> int:
+        return int(self.counts.sum())
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, q: float) -> float:
+        """
+        Used to estimate a percentile of the recorded values, as the upper bound of the bucket it falls into
+        :param q: the percentile, from 0 to 100
+        :return: the estimated percentile, or 0 when nothing was recorded
+        """
+        if not self.count:
+            return 0.0
+
+        bucket = int(np.searchsorted(np.cumsum(self.counts), np.ceil(q / 100 * self.count)))
+        return float(self.bounds[bucket]) if bucket < len(self.bounds) else self.max
+
+    def to_dict(self) -> Dict:
+        return {'count': self.count,
+                'total': self.total,
+                'mean': self.mean,
+                'max': self.max,
+                'p50': self.percentile(50),
+                'p90': self.percentile(90),
+                'p99': self.percentile(99),
+                'bounds': self.bounds.tolist(),
+                'counts': self.counts.tolist()}
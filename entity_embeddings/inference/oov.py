@@ -0,0 +1,14 @@
+class OutOfVocabulary:
+    """
+    This class is used to define what the EmbeddingStore returns for a value that was not seen during training
+    """
+    ZEROS = 'zeros'
+    MEAN = 'mean'
+    ERROR = 'error'
+
+    OPTIONS = (ZEROS, MEAN, ERROR)
+
+
+def check_oov(oov: str) -> None:
+    if oov not in OutOfVocabulary.OPTIONS:
+        raise ValueError("You should provide an out of vocabulary option among zeros, mean and error")
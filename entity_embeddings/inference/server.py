@@ -0,0 +1,259 @@
+"""
+This file contains the LookupServer class, an asyncio server that serves an EmbeddingStore over a Unix socket (or TCP)
+with newline-delimited JSON messages, coalescing concurrent lookups into micro-batches:
+
+    {"rows": [["x", 10], {"A": "y", "B": 20}]}  ->  {"embeddings": [[...], [...]]}
+    {"stats": true}  ->  the latency and batch size histograms
+
+Usage: python -m entity_embeddings.inference.server --artifacts artifacts --unix-socket /tmp/embeddings.sock
+"""
+import argparse
+import asyncio
+import json
+import logging
+import time
+from typing import Dict, List, Union
+
+import numpy as np
+
+from entity_embeddings.inference.histogram import Histogram, make_exponential_bounds
+from entity_embeddings.inference.oov import OutOfVocabulary
+from entity_embeddings.inference.store import EmbeddingStore
+
+DEFAULT_MAX_BATCH_SIZE = 1024
+DEFAULT_MAX_DELAY = 0.001
+MESSAGE_LIMIT = 2 ** 24
+
+logger = logging.getLogger(__name__)
+
+
+class LookupServer:
+    """
+    Used to serve an EmbeddingStore, embedding together the lookups arriving within max_delay seconds of each other
+    """
+
+    def __init__(self,
+                 store: EmbeddingStore,
+                 max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+                 max_delay: float = DEFAULT_MAX_DELAY):
+        """
+        :param store: the EmbeddingStore to be served
+        :param max_batch_size: how many rows a micro-batch should have at most
+        :param max_delay: how many seconds a lookup may wait for others to be batched with it
+        """
+        if max_batch_size <= 0:
+            raise ValueError("You should provide a max batch size greater than zero")
+
+        if max_delay < 0:
+            raise ValueError("You should provide a non-negative max delay")
+
+        self.store = store
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+
+        # latencies in seconds, from 10us up to about 10s
+        self.latencies = Histogram(make_exponential_bounds(1e-5, 10))
+        self.batch_sizes = Histogram(make_exponential_bounds(1, max_batch_size))
+
+        self._queue = None
+        self._batcher = None
+        self._server = None
+
+    async def start(self, path: str = None, host: str = None, port: int = None) -> None:
+        """
+        Used to start listening, on a Unix socket when a path is given, or on TCP otherwise
+        :param path: (optional) the path of the Unix socket
+        :param host: (optional) the host to listen on, when not using a Unix socket
+        :param port: (optional) the port to listen on, when not using a Unix socket
+        """
+        self._queue = asyncio.Queue()
+        self._batcher = asyncio.ensure_future(self._run_batches())
+
+        if path is not None:
+            self._server = await asyncio.start_unix_server(self._handle_connection, path=path, limit=MESSAGE_LIMIT)
+        else:
+            self._server = await asyncio.start_server(self._handle_connection, host=host, port=port,
+                                                      limit=MESSAGE_LIMIT)
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+        if self._batcher is not None:
+            self._batcher.cancel()
+            try:
+                await self._batcher
+            except asyncio.CancelledError:
+                pass
+
+    async def lookup(self, rows: List[Union[List, Dict]]) -> np.ndarray:
+        """
+        Used to embed the given rows, along with any other lookup arriving at the same time
+        :param rows: the rows to be embedded, as lists in the order of the vocabulary or as dicts keyed by name
+        :return: the (rows, embedding size) matrix of embeddings
+        """
+        start = time.perf_counter()
+        future = asyncio.get_event_loop().create_future()
+        await self._queue.put((rows, future))
+
+        embeddings = await future
+        self.latencies.record(time.perf_counter() - start)
+
+        return embeddings
+
+    def get_stats(self) -> Dict:
+        return {'latency_seconds': self.latencies.to_dict(), 'batch_size': self.batch_sizes.to_dict()}
+
+    async def _run_batches(self) -> None:
+        while True:
+            batch = [await self._queue.get()]
+            n_rows = len(batch[0][0])
+
+            # lets the other connections queue their lookups
+            if n_rows < self.max_batch_size:
+                await asyncio.sleep(self.max_delay)
+
+            while n_rows < self.max_batch_size and not self._queue.empty():
+                item = self._queue.get_nowait()
+                batch.append(item)
+                n_rows += len(item[0])
+
+            try:
+                self._process_batch(batch)
+            except Exception as e:
+                # any other failure is reported to the lookups of this batch only
+                logger.exception('Failed to embed a batch of %d lookups', len(batch))
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+
+    def _process_batch(self, batch: List) -> None:
+        rows = [row for item_rows, _ in batch for row in item_rows]
+        self.batch_sizes.record(len(rows))
+
+        try:
+            embeddings = self.store.transform(self._to_columns(rows)) if rows else None
+        except Exception:
+            # a single bad lookup should not fail the whole batch
+            for item in batch:
+                self._process_lookup(*item)
+            return
+
+        start = 0
+        for item_rows, future in batch:
+            if not future.done():
+                future.set_result(embeddings[start:start + len(item_rows)] if item_rows else
+                                  np.empty((0, self.store.embedding_size), dtype=np.float32))
+            start += len(item_rows)
+
+    def _process_lookup(self, rows: List, future: asyncio.Future) -> None:
+        if future.done():
+            return
+
+        try:
+            future.set_result(self.store.transform(self._to_columns(rows)))
+        except Exception as e:
+            future.set_exception(e)
+
+    def _to_columns(self, rows: List[Union[List, Dict]]) -> List[np.ndarray]:
+        names = self.store.names
+        rows = [[row[name] for name in names] if isinstance(row, dict) else row for row in rows]
+
+        if any(len(row) != len(names) for row in rows):
+            raise ValueError("You should provide rows with one value for each column of the vocabulary")
+
+        columns = []
+        for values in zip(*rows):
+            column = np.empty(len(values), dtype=object)
+            column[:] = values
+            columns.append(column)
+
+        return columns
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+
+                response = await self._handle_message(line)
+                writer.write(json.dumps(response).encode() + b'\n')
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _handle_message(self, line: bytes) -> Dict:
+        try:
+            message = json.loads(line.decode())
+        except ValueError:
+            return {'error': 'You should provide a valid json message'}
+
+        if not isinstance(message, dict):
+            return {'error': 'You should provide a json object as message'}
+
+        if message.get('stats'):
+            return self.get_stats()
+
+        if not isinstance(message.get('rows'), list):
+            return {'error': 'You should provide the rows to be embedded'}
+
+        try:
+            return {'embeddings': (await self.lookup(message['rows'])).tolist()}
+        except Exception as e:
+            return {'error': str(e)}
+
+
+def serve(store: EmbeddingStore,
+          path: str = None,
+          host: str = None,
+          port: int = None,
+          max_batch_size: int = DEFAULT_MAX_BATCH_SIZE,
+          max_delay: float = DEFAULT_MAX_DELAY) -> None:
+    """
+    Used to run a LookupServer until interrupted, logging its statistics when stopped
+    :param store: the EmbeddingStore to be served
+    :param path: (optional) the path of the Unix socket
+    :param host: (optional) the host to listen on, when not using a Unix socket
+    :param port: (optional) the port to listen on, when not using a Unix socket
+    :param max_batch_size: how many rows a micro-batch should have at most
+    :param max_delay: how many seconds a lookup may wait for others to be batched with it
+    """
+    server = LookupServer(store, max_batch_size, max_delay)
+    loop = asyncio.get_event_loop()
+    loop.run_until_complete(server.start(path, host, port))
+
+    try:
+        loop.run_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        loop.run_until_complete(server.close())
+        logger.info('Lookup server statistics: %s', json.dumps(server.get_stats()))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--artifacts', default='artifacts', help='the artifacts path given to the Config')
+    parser.add_argument('--unix-socket', help='the path of the Unix socket to listen on')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--oov', default=OutOfVocabulary.ZEROS, choices=OutOfVocabulary.OPTIONS)
+    parser.add_argument('--max-batch-size', type=int, default=DEFAULT_MAX_BATCH_SIZE)
+    parser.add_argument('--max-delay', type=float, default=DEFAULT_MAX_DELAY)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    serve(EmbeddingStore.from_artifacts(args.artifacts, args.oov),
+          args.unix_socket,
+          args.host,
+          args.port,
+          args.max_batch_size,
+          args.max_delay)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,245 @@
+"""
+This file contains the EmbeddingStore class, which maps raw categorical values to their trained embeddings, kept in a
+single buffer that may be memory-mapped from the saved artifacts.
+"""
+import os
+import sys
+from typing import TYPE_CHECKING, Dict, List, Sequence, Union
+
+import numpy as np
+
+from entity_embeddings.artifacts.artifacts import DEFAULT_EMBEDDINGS_DIRNAME, EmbeddingArtifacts, load_artifacts
+from entity_embeddings.encoder.vocabulary import UNKNOWN_CODE, HashedColumnVocabulary, Vocabulary
+from entity_embeddings.inference.oov import OutOfVocabulary
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+class EmbeddingStore:
+    """
+    Used to embed new raw categorical values with the weights learned by the Embedder, a row being embedded as the
+    concatenation of the embeddings of its categories
+    """
+
+    def __init__(self, artifacts: EmbeddingArtifacts, oov: str = OutOfVocabulary.ZEROS):
+        """
+        :param artifacts: the EmbeddingArtifacts holding the buffer and the Vocabulary used to encode the features
+        :param oov: what should be returned for unknown values, one of the OutOfVocabulary options
+        """
+        if oov not in OutOfVocabulary.OPTIONS:
+            raise ValueError("You should provide an out of vocabulary option among zeros, mean and error")
+
+        self.artifacts = artifacts
+        self.vocabulary = artifacts.vocabulary
+        self.buffer = artifacts.buffer
+        self.oov = oov
+
+        # the code c of a category starts at starts + c * dims on the buffer
+        self._starts = np.array(artifacts.offsets, dtype=np.intp)
+        self._dims = np.array(artifacts.output_dims, dtype=np.intp)
+        self._units = np.concatenate([np.arange(output_dim) for output_dim in artifacts.output_dims]).astype(np.intp)
+
+        # the embeddings of the unknown values are kept apart, since the buffer may be read-only
+        self._oov_embedding = np.concatenate([table.mean(axis=0) if oov == OutOfVocabulary.MEAN
+                                              else np.zeros(table.shape[1])
+                                              for table in artifacts.tables]).astype(np.float32)
+
+        # plain dicts are faster than pandas to look up single rows
+        self._lookups = [_make_lookup(column.values) for column in self.vocabulary]
+        self._nan_codes = [_get_nan_code(column.values) for column in self.vocabulary]
+
+        # the columns hashed into more than one bucket are embedded apart
+        units = np.concatenate([[0], np.cumsum(self._dims)])
+        self._multi_hashed = [(index, column, slice(units[index], units[index + 1]), table)
+                              for index, (column, table) in enumerate(zip(self.vocabulary, artifacts.tables))
+                              if isinstance(column, HashedColumnVocabulary) and column.n_hashes > 1]
+
+    @property
+    def names(self) -> List[str]:
+        return self.vocabulary.names
+
+    @property
+    def embedding_size(self) -> int:
+        """
+        The size of the embedding of a whole row
+        """
+        return len(self._units)
+
+    def get_table(self, name: str) -> np.ndarray:
+        """
+        Used to retrieve the embedding matrix of a given category
+        :param name: the name of the category
+        :return: a view over the buffer, with one row for each value of the category
+        """
+        return self.artifacts.get_table(name)
+
+    def encode(self, data: Union['pd.DataFrame', np.ndarray, List[np.ndarray]]) -> np.ndarray:
+        """
+        Used to encode a batch of raw values, one column at a time
+        :param data: a DataFrame, a 2-dimensional array or a list of columns, in the same order of the vocabulary
+        :return: the (rows, categories) matrix of codes, where unknown values are set to UNKNOWN_CODE
+        """
+        columns = self._get_columns(data)
+
+        codes = np.empty((len(columns[0]), len(columns)), dtype=np.intp)
+        for index, (column, column_vocabulary) in enumerate(zip(columns, self.vocabulary)):
+            codes[:, index] = column_vocabulary.transform(column)
+
+        unknown = codes == UNKNOWN_CODE
+        if unknown.any():
+            self._check_unknown(np.flatnonzero(unknown.any(axis=0)))
+
+        return codes
+
+    def transform(self, data: Union['pd.DataFrame', np.ndarray, List[np.ndarray]]) -> np.ndarray:
+        """
+        Used to embed a batch of raw values
+        :param data: a DataFrame, a 2-dimensional array or a list of columns, in the same order of the vocabulary
+        :return: the (rows, embedding_size) float32 matrix of embeddings
+        """
+        return self.transform_codes(self.encode(data))
+
+    def transform_codes(self, codes: np.ndarray) -> np.ndarray:
+        """
+        Used to embed a batch of already encoded values with a single gather over the buffer
+        :param codes: the (rows, categories) matrix of codes, as returned by encode
+        :return: the (rows, embedding_size) float32 matrix of embeddings
+        """
+        return self._gather(codes)
+
+    def transform_row(self, row: Union[Sequence, Dict]) -> np.ndarray:
+        """
+        Used to embed a single row of raw values
+        :param row: the raw value of each category, in the same order of the vocabulary, or a dict keyed by name
+        :return: the (embedding_size,) float32 embedding of the row
+        """
+        if isinstance(row, dict):
+            row = [row[name] for name in self.names]
+
+        codes = [lookup.get(value) if lookup is not None else self._hash_value(index, value)
+                 for index, (lookup, value) in enumerate(zip(self._lookups, row))]
+        if None in codes:
+            codes = [self._get_missing_code(index, value) if code is None else code
+                     for index, (code, value) in enumerate(zip(codes, row))]
+
+        return self._gather(np.array(codes, dtype=np.intp))
+
+    def _gather(self, codes: np.ndarray) -> np.ndarray:
+        if self._multi_hashed:
+            # the fingerprints are set aside, and replaced by a valid code for the gather below
+            fingerprints = [codes[..., index] for index, _, _, _ in self._multi_hashed]
+            codes = codes.copy()
+            codes[..., [index for index, _, _, _ in self._multi_hashed]] = 0
+
+        positions = codes * self._dims
+        positions += self._starts
+
+        indices = positions.repeat(self._dims, axis=-1)
+        indices += self._units
+
+        embeddings = self.buffer[indices]
+
+        # the unknown codes are overwritten by the out-of-vocabulary embedding
+        unknown = codes == UNKNOWN_CODE
+        if unknown.any():
+            unknown = unknown.repeat(self._dims, axis=-1)
+            embeddings[unknown] = np.broadcast_to(self._oov_embedding, embeddings.shape)[unknown]
+
+        if self._multi_hashed:
+            for (_, column, units, table), column_fingerprints in zip(self._multi_hashed, fingerprints):
+                buckets = column.get_buckets(np.atleast_1d(column_fingerprints))
+                embeddings[..., units] = table[buckets].sum(axis=1).reshape(embeddings[..., units].shape)
+
+        return embeddings
+
+    def _hash_value(self, index: int, value) -> int:
+        return int(self.vocabulary[index].transform(np.array([value], dtype=object))[0])
+
+    def _get_missing_code(self, index: int, value) -> int:
+        if value != value and self._nan_codes[index] is not None:
+            return self._nan_codes[index]
+
+        # the unknown values of a pruned column share the embedding of its rare values
+        if self.vocabulary[index].other:
+            return self.vocabulary[index].other_code
+
+        self._check_unknown([index])
+        return UNKNOWN_CODE
+
+    def _check_unknown(self, indices) -> None:
+        if self.oov == OutOfVocabulary.ERROR:
+            names = [self.names[index] for index in indices]
+            raise ValueError("You should provide values present in the vocabulary of the columns %s" % names)
+
+    def _get_columns(self, data: Union['pd.DataFrame', np.ndarray, List[np.ndarray]]) -> List[np.ndarray]:
+        # a DataFrame can only be given once pandas was imported, so it is not imported here
+        pandas = sys.modules.get('pandas')
+        if pandas is not None and isinstance(data, pandas.DataFrame):
+            return [data[name].values for name in self.names]
+
+        if isinstance(data, np.ndarray):
+            data = [data[:, index] for index in range(data.shape[1])]
+
+        if len(data) != len(self.vocabulary):
+            raise ValueError("You should provide one column for each column of the vocabulary")
+
+        return data
+
+    @classmethod
+    def from_weights(cls,
+                     weights: List[np.ndarray],
+                     vocabulary: Vocabulary,
+                     oov: str = OutOfVocabulary.ZEROS) -> 'EmbeddingStore':
+        """
+        Used to create an EmbeddingStore from a list of embedding matrices, such as the one of model_utils.get_weights
+        :param weights: the embedding matrix of each category, in the same order of the vocabulary
+        :param vocabulary: the Vocabulary used to encode the features during training
+        :param oov: what should be returned for unknown values, one of the OutOfVocabulary options
+        :return: an EmbeddingStore object
+        """
+        return cls(EmbeddingArtifacts.from_weights(weights, vocabulary), oov)
+
+    @classmethod
+    def load(cls, path: str, oov: str = OutOfVocabulary.ZEROS, mmap_mode: str = 'r') -> 'EmbeddingStore':
+        """
+        Used to create an EmbeddingStore from the embeddings saved with save_artifacts
+        :param path: the directory where the embeddings were saved
+        :param oov: what should be returned for unknown values, one of the OutOfVocabulary options
+        :param mmap_mode: how the files should be memory-mapped, or None to read them into memory
+        :return: an EmbeddingStore object
+        """
+        return cls(load_artifacts(path, mmap_mode), oov)
+
+    @classmethod
+    def from_artifacts(cls, artifacts_path: str, oov: str = OutOfVocabulary.ZEROS) -> 'EmbeddingStore':
+        """
+        Used to create an EmbeddingStore from the artifacts directory of a Config
+        :param artifacts_path: where the artifacts were stored, the artifacts_path of the Config
+        :param oov: what should be returned for unknown values, one of the OutOfVocabulary options
+        :return: an EmbeddingStore object
+        """
+        return cls.load(os.path.join(artifacts_path, DEFAULT_EMBEDDINGS_DIRNAME), oov)
+
+
+def _make_lookup(values: np.ndarray) -> Dict:
+    """
+    Used to map each value of a column, converted to a python scalar, to its code
+    :param values: the values of a ColumnVocabulary, or None for a hashed column
+    :return: the dict from value to code, or None for a hashed column
+    """
+    if values is None:
+        return None
+
+    return {value: code for code, value in enumerate(values.tolist()) if value == value}
+
+
+def _get_nan_code(values: np.ndarray):
+    if values is None:
+        return None
+
+    for code, value in enumerate(values.tolist()):
+        if value is None or value != value:
+            return code
+
+    return None
@@ -0,0 +1,2 @@
+from entity_embeddings.instrumentation.sinks import CallbackSink, JsonSink, LogSink, MetricsSink
+from entity_embeddings.instrumentation.timer import StageTimer
@@ -0,0 +1,66 @@
+"""
+This file contains the sinks the metrics of a run are sent to, each metric being a dict holding its kind under the
+'event' key.
+"""
+import json
+import logging
+from typing import Callable, Dict
+
+logger = logging.getLogger(__name__)
+
+
+class MetricsSink:
+    """
+    Used as the base class of the sinks: a sink receives every metric through its emit method
+    """
+
+    def emit(self, metric: Dict) -> None:
+        raise NotImplementedError("You should implement the emit method on your MetricsSink")
+
+
+class LogSink(MetricsSink):
+    """
+    Used to log each metric as a JSON line
+    """
+
+    def __init__(self, level: int = logging.INFO, log: logging.Logger = None):
+        """
+        :param level: the level the metrics are logged with
+        :param log: (optional) the Logger to be used, defaulting to the one of this module
+        """
+        self.level = level
+        self.log = log or logger
+
+    def emit(self, metric: Dict) -> None:
+        self.log.log(self.level, 'Embedding %s: %s', metric['event'], json.dumps(metric, sort_keys=True))
+
+
+class JsonSink(MetricsSink):
+    """
+    Used to append each metric to a file, as one JSON object per line
+    """
+
+    def __init__(self, path: str):
+        """
+        :param path: where the metrics should be written
+        """
+        self.path = path
+
+    def emit(self, metric: Dict) -> None:
+        with open(self.path, 'a') as f:
+            f.write(json.dumps(metric, sort_keys=True) + '\n')
+
+
+class CallbackSink(MetricsSink):
+    """
+    Used to hand each metric to a user function, such as the client of a dashboard
+    """
+
+    def __init__(self, callback: Callable[[Dict], None]):
+        """
+        :param callback: called with each metric
+        """
+        self.callback = callback
+
+    def emit(self, metric: Dict) -> None:
+        self.callback(metric)
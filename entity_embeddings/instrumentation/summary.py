@@ -0,0 +1,39 @@
+"""
+This file contains the summary of a training, reporting which epoch was the best and how many epochs were run.
+"""
+from typing import Dict
+
+import numpy as np
+
+TRAINING_EVENT = 'training'
+
+
+def is_increasing_metric(monitor: str) -> bool:
+    """
+    Used to tell if a greater value of a metric is better, the same way keras does when its mode is auto
+    :param monitor: the name of the metric, such as val_loss or val_acc
+    :return: a boolean if the metric should be maximized
+    """
+    return 'acc' in monitor or monitor.startswith('fmeasure')
+
+
+def get_training_summary(history, max_epochs: int, monitor: str) -> Dict:
+    """
+    Used to summarize a training: how many epochs were run and which one was the best
+    :param history: the History returned by the fit
+    :param max_epochs: how many epochs the training could run
+    :param monitor: the metric the best epoch is chosen by
+    :return: the summary, as a metric of the training event
+    """
+    epochs = len(history.epoch)
+    summary = {'event': TRAINING_EVENT,
+               'epochs': epochs,
+               'max_epochs': max_epochs,
+               'epochs_saved': max_epochs - epochs}
+
+    values = history.history.get(monitor)
+    if values:
+        best_epoch = int(np.argmax(values) if is_increasing_metric(monitor) else np.argmin(values))
+        summary.update(monitor=monitor, best_epoch=best_epoch, best_value=float(values[best_epoch]))
+
+    return summary
@@ -0,0 +1,42 @@
+"""
+This file contains the StageTimer class, used to measure how long each stage of a run takes.
+"""
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Dict, List
+
+from entity_embeddings.instrumentation.sinks import MetricsSink
+
+STAGE_EVENT = 'stage'
+
+
+class StageTimer:
+    """
+    Used to time the stages of a run, sending the seconds taken by each one to the given sinks
+    """
+
+    def __init__(self, sinks: List[MetricsSink] = None):
+        """
+        :param sinks: (optional) where the metrics should be sent
+        """
+        self.sinks = list(sinks or [])
+        self.timings = OrderedDict()
+
+    @contextmanager
+    def stage(self, name: str):
+        """
+        Used to time the block run within this context, even when it raises
+        :param name: the name of the stage
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - start
+            self.timings[name] = self.timings.get(name, 0.0) + seconds
+            self.emit({'event': STAGE_EVENT, 'stage': name, 'seconds': seconds})
+
+    def emit(self, metric: Dict) -> None:
+        for sink in self.sinks:
+            sink.emit(metric)
@@ -1,12 +1,16 @@
+"""
+This file contains the ModelAssembler classes, which make the layers following the embeddings. Keras is only imported
+when the layers are made, so that a Config can be created without loading the backend.
+"""
 from abc import ABC, abstractmethod
-from typing import List
-
-from keras.engine import Layer
-from keras.layers import Dense, Activation, Concatenate
-from keras.models import Model as KerasModel
+from typing import TYPE_CHECKING, List
 
 from entity_embeddings.processor.target_type import TargetType
 
+if TYPE_CHECKING:
+    from keras.engine import Layer
+    from keras.models import Model as KerasModel
+
 
 def get_model_assembler(target_type: TargetType, n_unique_classes: int):
     if target_type == TargetType.BINARY_CLASSIFICATION:
@@ -17,17 +21,36 @@ def get_model_assembler(target_type: TargetType, n_unique_classes: int):
         return RegressionClassificationAssembler()
 
 
+def concatenate(outputs: List['Layer']) -> 'Layer':
+    """
+    Used to join the outputs of the embedding layers, unless there is a single one
+    :param outputs: the list of output layers
+    :return: the concatenated layer
+    """
+    from keras.layers import Concatenate
+
+    if len(outputs) == 1:
+        return outputs[0]
+
+    return Concatenate()(outputs)
+
+
 class ModelAssembler(ABC):
+    # the optimizer compile_model uses, read by the planner
+    optimizer = 'adam'
+
     @abstractmethod
-    def make_final_layer(self, previous_layer: Layer) -> Layer:
+    def make_final_layer(self, previous_layer: 'Layer') -> 'Layer':
         raise NotImplementedError("Your model assembler should override the method make_final_layer")
 
     @abstractmethod
-    def compile_model(self, model: KerasModel) -> KerasModel:
+    def compile_model(self, model: 'KerasModel') -> 'KerasModel':
         raise NotImplementedError("Your model assembler should override the method compile_model")
 
-    def make_hidden_layers(self, outputs: List[Layer]) -> Layer:
-        output_model = Concatenate()(outputs)
+    def make_hidden_layers(self, outputs: List['Layer']) -> 'Layer':
+        from keras.layers import Activation, Dense
+
+        output_model = concatenate(outputs)
         output_model = Dense(1000, kernel_initializer="uniform")(output_model)
         output_model = Activation('relu')(output_model)
         output_model = Dense(500, kernel_initializer="uniform")(output_model)
@@ -36,13 +59,15 @@ class ModelAssembler(ABC):
 
 
 class BinaryClassificationAssembler(ModelAssembler):
-    def make_final_layer(self, previous_layer: Layer) -> Layer:
+    def make_final_layer(self, previous_layer: 'Layer') -> 'Layer':
+        from keras.layers import Activation, Dense
+
         output_model = Dense(1)(previous_layer)
         output_model = Activation('sigmoid')(output_model)
         return output_model
 
     def compile_model(self, model):
-        model.compile(loss='binary_crossentropy', optimizer='adam', metrics=['accuracy'])
+        model.compile(loss='binary_crossentropy', optimizer=self.optimizer, metrics=['accuracy'])
         return model
 
 
@@ -50,22 +75,26 @@ class MulticlassClassificationAssembler(ModelAssembler):
     def __init__(self, n_unique_classes: int):
         self.n_unique_classes = n_unique_classes
 
-    def make_final_layer(self, previous_layer: Layer) -> Layer:
+    def make_final_layer(self, previous_layer: 'Layer') -> 'Layer':
+        from keras.layers import Activation, Dense
+
         output_model = Dense(self.n_unique_classes)(previous_layer)
         output_model = Activation('softmax')(output_model)
         return output_model
 
     def compile_model(self, model):
-        model.compile(loss='categorical_crossentropy', optimizer='adam')
+        model.compile(loss='categorical_crossentropy', optimizer=self.optimizer)
         return model
 
 
 class RegressionClassificationAssembler(ModelAssembler):
-    def make_final_layer(self, previous_layer: Layer) -> Layer:
+    def make_final_layer(self, previous_layer: 'Layer') -> 'Layer':
+        from keras.layers import Activation, Dense
+
         output_model = Dense(1)(previous_layer)
         output_model = Activation('sigmoid')(output_model)
         return output_model
 
     def compile_model(self, model):
-        model.compile(loss='mean_absolute_error', optimizer='adam')
+        model.compile(loss='mean_absolute_error', optimizer=self.optimizer)
         return model
@@ -0,0 +1,64 @@
+"""
+This file contains the ThroughputCallback, a keras callback measuring how many samples are trained per second.
+"""
+import time
+from typing import List
+
+import numpy as np
+from keras.callbacks import Callback
+
+from entity_embeddings.instrumentation.sinks import MetricsSink
+
+EPOCH_EVENT = 'epoch'
+STEP_PERCENTILES = (50, 90, 99)
+
+
+class ThroughputCallback(Callback):
+    """
+    Used to measure the throughput of the training and the time of each step, epoch by epoch
+    """
+
+    def __init__(self, sinks: List[MetricsSink]):
+        """
+        :param sinks: where the metric of each epoch should be sent
+        """
+        super().__init__()
+        self.sinks = sinks
+
+        self.epoch_start = None
+        self.step_start = None
+        self.step_times = []
+        self.samples = 0
+
+    def on_epoch_begin(self, epoch, logs=None):
+        self.epoch_start = time.perf_counter()
+        self.step_times = []
+        self.samples = 0
+
+    def on_batch_begin(self, batch, logs=None):
+        self.step_start = time.perf_counter()
+
+    def on_batch_end(self, batch, logs=None):
+        self.step_times.append(time.perf_counter() - self.step_start)
+        self.samples += int((logs or {}).get('size', 0))
+
+    def on_epoch_end(self, epoch, logs=None):
+        seconds = time.perf_counter() - self.epoch_start
+        metric = {'event': EPOCH_EVENT,
+                  'epoch': epoch,
+                  'samples': self.samples,
+                  'steps': len(self.step_times),
+                  'seconds': seconds,
+                  'samples_per_second': self.samples / seconds if seconds else 0.0}
+
+        if self.step_times:
+            percentiles = np.percentile(self.step_times, STEP_PERCENTILES) * 1000
+            for percentile, value in zip(STEP_PERCENTILES, percentiles):
+                metric['step_ms_p%d' % percentile] = float(value)
+
+        for name, value in (logs or {}).items():
+            metric[name] = float(value)
+
+        for sink in self.sinks:
+            sink.emit(metric)
+
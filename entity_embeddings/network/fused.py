@@ -0,0 +1,84 @@
+"""
+This file contains the implementation of the FusedEmbedding layer, which embeds all the encoded categories at once
+"""
+from typing import List
+
+import numpy as np
+from keras import backend as K
+from keras import initializers
+from keras.engine import Layer
+
+from entity_embeddings.util.table_utils import make_fused_indices, get_column_slices
+
+DEFAULT_FUSED_LAYER_NAME = 'fused_embedding'
+
+
+class FusedEmbedding(Layer):
+    """
+    Used to embed every category with a single gather over one flat weight, outputting the concatenation of the
+    embeddings of each category
+    """
+
+    def __init__(self,
+                 names: List[str],
+                 input_dims: List[int],
+                 output_dims: List[int],
+                 embeddings_initializer='uniform',
+                 **kwargs):
+        """
+        :param names: the name of each category
+        :param input_dims: the number of unique values of each category
+        :param output_dims: the embedding size of each category
+        :param embeddings_initializer: the initializer of the table
+        """
+        if not len(names) == len(input_dims) == len(output_dims):
+            raise ValueError("You should provide the same number of names, input and output dimensions")
+
+        kwargs.setdefault('name', DEFAULT_FUSED_LAYER_NAME)
+        super().__init__(**kwargs)
+
+        self.names = list(names)
+        self.input_dims = [int(input_dim) for input_dim in input_dims]
+        self.output_dims = [int(output_dim) for output_dim in output_dims]
+        self.embeddings_initializer = initializers.get(embeddings_initializer)
+
+        self.columns, self.offsets, self.strides = make_fused_indices(self.input_dims, self.output_dims)
+
+    def build(self, input_shape):
+        table_size = int(np.dot(self.input_dims, self.output_dims))
+        self.embeddings = self.add_weight(shape=(table_size,),
+                                          initializer=self.embeddings_initializer,
+                                          name='embeddings')
+        super().build(input_shape)
+
+    def call(self, inputs):
+        if K.dtype(inputs) != 'int32':
+            inputs = K.cast(inputs, 'int32')
+
+        # every code is repeated once for each unit of its embedding
+        codes = K.transpose(K.gather(K.transpose(inputs), K.constant(self.columns, dtype='int32')))
+        indices = codes * K.constant(self.strides, dtype='int32') + K.constant(self.offsets, dtype='int32')
+
+        return K.gather(self.embeddings, indices)
+
+    def compute_output_shape(self, input_shape):
+        return input_shape[0], int(np.sum(self.output_dims))
+
+    def get_column_weights(self, name: str) -> np.ndarray:
+        """
+        Used to retrieve the embedding matrix of a given category, with the same shape a keras Embedding layer has
+        :param name: the name of the category
+        :return: the (unique values, embedding size) matrix
+        """
+        index = self.names.index(name)
+        start, end = get_column_slices(self.input_dims, self.output_dims)[index]
+
+        return self.get_weights()[0][start:end].reshape(self.input_dims[index], self.output_dims[index])
+
+    def get_config(self):
+        config = {'names': self.names,
+                  'input_dims': self.input_dims,
+                  'output_dims': self.output_dims,
+                  'embeddings_initializer': initializers.serialize(self.embeddings_initializer)}
+        base_config = super().get_config()
+        return dict(list(base_config.items()) + list(config.items()))
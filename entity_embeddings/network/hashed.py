@@ -0,0 +1,61 @@
+"""
+This file contains the implementation of the HashedEmbedding layer, used in place of an Embedding layer for the
+categories hashed into more than one bucket
+"""
+from keras import backend as K
+from keras import initializers
+from keras.engine import Layer
+
+from entity_embeddings.encoder.hashing import HASH_INCREMENTS, HASH_MULTIPLIERS, HASH_PRIME
+
+
+class HashedEmbedding(Layer):
+    """
+    Used to embed the fingerprints returned by HashedColumnVocabulary.transform, as the sum of the embeddings of their
+    buckets
+    """
+
+    def __init__(self,
+                 input_dim: int,
+                 output_dim: int,
+                 n_hashes: int,
+                 embeddings_initializer='uniform',
+                 **kwargs):
+        """
+        :param input_dim: the number of buckets
+        :param output_dim: the embedding size
+        :param n_hashes: how many buckets each value is hashed into
+        :param embeddings_initializer: the initializer of the table
+        """
+        super().__init__(**kwargs)
+
+        self.input_dim = int(input_dim)
+        self.output_dim = int(output_dim)
+        self.n_hashes = int(n_hashes)
+        self.embeddings_initializer = initializers.get(embeddings_initializer)
+
+    def build(self, input_shape):
+        self.embeddings = self.add_weight(shape=(self.input_dim, self.output_dim),
+                                          initializer=self.embeddings_initializer,
+                                          name='embeddings')
+        super().build(input_shape)
+
+    def call(self, inputs):
+        # a fingerprint times a multiplier only fits in an int64
+        fingerprints = K.cast(inputs, 'int64')
+        hashes = (fingerprints * K.constant(HASH_MULTIPLIERS[:self.n_hashes], dtype='int64') +
+                  K.constant(HASH_INCREMENTS[:self.n_hashes], dtype='int64')) % HASH_PRIME
+        buckets = K.cast(hashes % self.input_dim, 'int32')
+
+        return K.sum(K.gather(self.embeddings, buckets), axis=1)
+
+    def compute_output_shape(self, input_shape):
+        return input_shape[0], self.output_dim
+
+    def get_config(self):
+        config = {'input_dim': self.input_dim,
+                  'output_dim': self.output_dim,
+                  'n_hashes': self.n_hashes,
+                  'embeddings_initializer': initializers.serialize(self.embeddings_initializer)}
+        base_config = super().get_config()
+        return dict(list(base_config.items()) + list(config.items()))
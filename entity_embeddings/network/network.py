@@ -6,12 +6,17 @@ from typing import Tuple, List
 
 import numpy as np
 from keras import Input
-from keras.callbacks import History
+from keras.callbacks import Callback, EarlyStopping, History, LearningRateScheduler, ReduceLROnPlateau
 from keras.engine import Layer
 from keras.layers import Embedding, Reshape
 from keras.models import Model as KerasModel
 
 from entity_embeddings.config import Config
+from entity_embeddings.instrumentation.summary import get_training_summary
+from entity_embeddings.network.callbacks import ThroughputCallback
+from entity_embeddings.network.fused import DEFAULT_FUSED_LAYER_NAME, FusedEmbedding
+from entity_embeddings.network.hashed import HashedEmbedding
+from entity_embeddings.network.sequence import EncodedSequence
 from entity_embeddings.util.preprocessing_utils import transpose_to_list
 
 np.random.seed(42)
@@ -27,13 +32,23 @@ class EmbeddingNetwork:
         self.config = config
         self.model = self.__make_model()
 
+        if config.warm_start is not None:
+            self.set_embedding_tables(config.get_warm_start_tables())
+
+        # filled by fit
+        self.early_stopping = None
+        self.training_summary = None
+
     def __make_model(self) -> KerasModel:
         """
         This method is used to generate our KerasModel containing the Embedding layers alongside with the output layers
         :return: a compiled KerasModel object
         """
 
-        inputs, outputs = self._make_embedding_layers()
+        if self.config.fused_embeddings:
+            inputs, outputs = self._make_fused_embedding_layers()
+        else:
+            inputs, outputs = self._make_embedding_layers()
         output_model = self.config.model_assembler.make_hidden_layers(outputs)
         output_model = self.config.model_assembler.make_final_layer(output_model)
 
@@ -50,17 +65,53 @@ class EmbeddingNetwork:
         embedding_outputs = []
 
         for category in self.config.categories:
-            input_category = Input(shape=(1,))
-            output_category = Embedding(input_dim=category.unique_values,
-                                        output_dim=category.embedding_size,
-                                        name=category.alias)(input_category)
-            output_category = Reshape(target_shape=(category.embedding_size,))(output_category)
+            if category.n_hashes > 1:
+                # the fingerprints go past the integers a float32 input holds exactly
+                input_category = Input(shape=(1,), dtype='int32')
+                output_category = HashedEmbedding(input_dim=category.unique_values,
+                                                  output_dim=category.embedding_size,
+                                                  n_hashes=category.n_hashes,
+                                                  name=category.alias)(input_category)
+            else:
+                input_category = Input(shape=(1,))
+                output_category = Embedding(input_dim=category.unique_values,
+                                            output_dim=category.embedding_size,
+                                            name=category.alias)(input_category)
+                output_category = Reshape(target_shape=(category.embedding_size,))(output_category)
 
             embedding_inputs.append(input_category)
             embedding_outputs.append(output_category)
 
         return embedding_inputs, embedding_outputs
 
+    def _make_fused_embedding_layers(self) -> Tuple[List[Layer], List[Layer]]:
+        """
+        This method is used instead of _make_embedding_layers when the embeddings are fused into a single layer
+        :return: a tuple containing two lists with a single layer: the first, the input; the second, the output
+        """
+        categories = self.config.categories
+
+        input_categories = Input(shape=(len(categories),), dtype='int32')
+        output_categories = FusedEmbedding(names=[category.alias for category in categories],
+                                           input_dims=[category.unique_values for category in categories],
+                                           output_dims=[category.embedding_size for category in categories])(
+            input_categories)
+
+        return [input_categories], [output_categories]
+
+    def set_embedding_tables(self, tables: List[np.ndarray]) -> None:
+        """
+        This method is used to set the weights of the embedding layers, such as the ones learned by a previous run
+        :param tables: the embedding matrix of each category, in the same order of the categories
+        """
+        if self.config.fused_embeddings:
+            self.model.get_layer(DEFAULT_FUSED_LAYER_NAME).set_weights([np.concatenate([np.ravel(table)
+                                                                                          for table in tables])])
+            return
+
+        for category, table in zip(self.config.categories, tables):
+            self.model.get_layer(category.alias).set_weights([table])
+
     def fit(self, X_train: np.ndarray, y_train: np.ndarray, X_val: np.ndarray, y_val: np.ndarray) -> History:
         """
         This method is used to fit a given training and validation data into our entity embeddings model
@@ -71,15 +122,122 @@ class EmbeddingNetwork:
         :return a History object
         """
 
-        self.max_log_y = max(np.max(np.log(y_train)), np.max(np.log(y_val)))
+        callbacks = self.get_callbacks()
+
+        if self.config.is_streaming() or self.config.batch_feeding is not None:
+            history = self._fit_batches(X_train, y_train, X_val, y_val, callbacks)
+        else:
+            self.max_log_y = max(np.max(np.log(y_train)), np.max(np.log(y_val)))
+
+            history = self.model.fit(x=self._inputs_for_fit(X_train),
+                                     y=self._val_for_fit(y_train),
+                                     validation_data=(self._inputs_for_fit(X_val), self._val_for_fit(y_val)),
+                                     epochs=self.config.epochs,
+                                     batch_size=self.config.batch_size,
+                                     callbacks=callbacks)
 
-        history = self.model.fit(x=transpose_to_list(X_train),
-                                 y=self._val_for_fit(y_train),
-                                 validation_data=(transpose_to_list(X_val), self._val_for_fit(y_val)),
-                                 epochs=self.config.epochs,
-                                 batch_size=self.config.batch_size, )
+        self._end_training(history)
         return history
 
+    def _fit_batches(self,
+                     X_train: np.ndarray,
+                     y_train: np.ndarray,
+                     X_val: np.ndarray,
+                     y_val: np.ndarray,
+                     callbacks: List[Callback]) -> History:
+        """
+        This method is used to fit the data one batch at a time through an EncodedSequence
+        :param X_train: training features
+        :param y_train: training targets
+        :param X_val: validation features
+        :param y_val: validation targets
+        :param callbacks: the keras callbacks returned by get_callbacks
+        :return a History object
+        """
+        self.max_log_y = max(self._max_log_in_blocks(y_train), self._max_log_in_blocks(y_val))
+        feeding = self.config.get_batch_feeding()
+
+        train_sequence = EncodedSequence(X_train, y_train,
+                                         batch_size=self.config.batch_size,
+                                         shuffle=feeding.shuffle,
+                                         block_size=feeding.shuffle_block_size,
+                                         target_transform=self._val_for_fit,
+                                         split_columns=not self.config.fused_embeddings)
+        val_sequence = EncodedSequence(X_val, y_val,
+                                       batch_size=self.config.batch_size,
+                                       target_transform=self._val_for_fit,
+                                       split_columns=not self.config.fused_embeddings)
+
+        # the sequence shuffles by block itself
+        history = self.model.fit_generator(train_sequence,
+                                           steps_per_epoch=len(train_sequence),
+                                           validation_data=val_sequence,
+                                           validation_steps=len(val_sequence),
+                                           epochs=self.config.epochs,
+                                           workers=feeding.workers,
+                                           use_multiprocessing=feeding.use_multiprocessing,
+                                           max_queue_size=feeding.max_queue_size,
+                                           shuffle=False,
+                                           callbacks=callbacks)
+        return history
+
+    def get_callbacks(self) -> List[Callback]:
+        """
+        This method is used to gather the keras callbacks set by the Config
+        :return: the list of callbacks
+        """
+        callbacks = []
+        self.early_stopping = None
+        control = self.config.training_control
+
+        if control.early_stopping_patience is not None:
+            self.early_stopping = EarlyStopping(monitor=control.monitor,
+                                               min_delta=control.min_delta,
+                                               patience=control.early_stopping_patience,
+                                               restore_best_weights=control.restore_best_weights)
+            callbacks.append(self.early_stopping)
+
+        if control.lr_schedule is not None:
+            callbacks.append(LearningRateScheduler(control.lr_schedule))
+        elif control.reduce_lr_patience is not None:
+            callbacks.append(ReduceLROnPlateau(monitor=control.monitor,
+                                               factor=control.reduce_lr_factor,
+                                               patience=control.reduce_lr_patience,
+                                               min_delta=control.min_delta))
+
+        if self.config.metrics_sinks:
+            callbacks.append(ThroughputCallback(self.config.metrics_sinks))
+
+        return callbacks
+
+    def _end_training(self, history: History) -> None:
+        """
+        This method is used once the training is over, to restore the best weights when keras did not
+        :param history: the History returned by the fit
+        """
+        early_stopping = self.early_stopping
+        if early_stopping is not None and early_stopping.restore_best_weights and not early_stopping.stopped_epoch \
+                and early_stopping.best_weights is not None:
+            self.model.set_weights(early_stopping.best_weights)
+
+        self.training_summary = get_training_summary(history, self.config.epochs, self.config.training_control.monitor)
+        self.config.timer.emit(self.training_summary)
+
+    def _max_log_in_blocks(self, y: np.ndarray) -> float:
+        block_size = self.config.chunk_size or self.config.batch_size
+        return max(np.max(np.log(y[start:start + block_size])) for start in range(0, len(y), block_size))
+
+    def _inputs_for_fit(self, X: np.ndarray):
+        """
+        This method is used to shape the encoded features the way the model inputs expect them
+        :param X: the encoded features
+        :return: the matrix, or the list of arrays
+        """
+        if self.config.fused_embeddings:
+            return X
+
+        return transpose_to_list(X)
+
     def _val_for_fit(self, val):
         val = np.log(val) / self.max_log_y
         return val
@@ -0,0 +1,113 @@
+"""
+This file contains the implementation of the class EncodedSequence, which is used to feed the encoded features to our
+entity embedding network one batch at a time
+"""
+from typing import Callable, List, Tuple
+
+import numpy as np
+from keras.utils import Sequence
+
+from entity_embeddings.util.preprocessing_utils import transpose_to_list
+
+
+class EncodedSequence(Sequence):
+    """
+    Used to slice batches out of an encoded feature matrix, which may be memory-mapped, shuffling the order of blocks
+    of contiguous rows on every epoch
+    """
+
+    def __init__(self,
+                 X: np.ndarray,
+                 y: np.ndarray,
+                 batch_size: int,
+                 shuffle: bool = False,
+                 block_size: int = None,
+                 target_transform: Callable[[np.ndarray], np.ndarray] = None,
+                 seed: int = None,
+                 split_columns: bool = True):
+        """
+        :param X: the encoded features, with one column for each category
+        :param y: the processed targets
+        :param batch_size: how many rows each batch should have
+        :param shuffle: if the order of the blocks should be shuffled on every epoch
+        :param block_size: (optional) how many rows each shuffled block should have, defaulting to the batch size
+        :param target_transform: (optional) a function applied to the targets of every batch
+        :param seed: (optional) the seed of the shuffling
+        :param split_columns: if the features of every batch should be split into one array for each category
+        """
+        if len(X) != len(y):
+            raise ValueError("You should provide the same number of features and targets")
+
+        self.X = X
+        self.y = y
+        self.batch_size = batch_size
+        self.shuffle = shuffle
+        self.block_size = get_block_size(batch_size, block_size)
+        self.target_transform = target_transform
+        self.random_state = np.random.RandomState(seed)
+        self.split_columns = split_columns
+
+        self.batches = make_batches(len(X), batch_size, self.block_size)
+        self.order = np.arange(len(self.batches))
+        if self.shuffle:
+            self.on_epoch_end()
+
+    def __len__(self) -> int:
+        return len(self.batches)
+
+    def __getitem__(self, index: int) -> Tuple[List[np.ndarray], np.ndarray]:
+        start, end = self.batches[self.order[index]]
+
+        # the copy out of the memory-mapped matrix only happens here, one batch at a time
+        X_batch = np.asarray(self.X[start:end])
+        y_batch = np.asarray(self.y[start:end])
+
+        if self.target_transform is not None:
+            y_batch = self.target_transform(y_batch)
+
+        if self.split_columns:
+            return transpose_to_list(X_batch), y_batch
+
+        return X_batch, y_batch
+
+    def on_epoch_end(self) -> None:
+        if not self.shuffle:
+            return
+
+        batches_per_block = self.block_size // self.batch_size
+        n_blocks = int(np.ceil(len(self.batches) / batches_per_block))
+
+        blocks = self.random_state.permutation(n_blocks)
+        self.order = np.concatenate([np.arange(block * batches_per_block,
+                                               min((block + 1) * batches_per_block, len(self.batches)))
+                                     for block in blocks]).astype(int)
+
+
+def get_block_size(batch_size: int, block_size: int = None) -> int:
+    """
+    Used to round a given block size up to a multiple of the batch size, so that no batch spans two blocks
+    :param batch_size: how many rows each batch has
+    :param block_size: how many rows each block should have, defaulting to the batch size
+    :return: the rounded block size
+    """
+    if block_size is None:
+        return batch_size
+
+    return int(np.ceil(block_size / batch_size)) * batch_size
+
+
+def make_batches(n_rows: int, batch_size: int, block_size: int) -> List[Tuple[int, int]]:
+    """
+    Used to compute the start and end rows of every batch, grouped by block
+    :param n_rows: the number of rows
+    :param batch_size: how many rows each batch should have
+    :param block_size: how many rows each block has, being a multiple of the batch size
+    :return: the list of the (start, end) rows of each batch
+    """
+    batches = []
+    for block_start in range(0, n_rows, block_size):
+        block_end = min(block_start + block_size, n_rows)
+        for start in range(block_start, block_end, batch_size):
+            batches.append((start, min(start + batch_size, block_end)))
+
+    return batches
@@ -0,0 +1,98 @@
+"""
+This file contains the groups of related optional arguments of Config, each one given to it as a single argument.
+"""
+from typing import Callable, Dict
+
+from entity_embeddings.encoder import CategoricalEncoder
+from entity_embeddings.planner import SizeWeighting
+from entity_embeddings.util.sampling_utils import DEFAULT_SAMPLE_SIZE
+
+
+class VocabularyOptions:
+    """
+    Used to define how the vocabulary of the features is learned: which columns are hashed, how the rare values are
+    pruned and by how many workers
+    """
+
+    def __init__(self,
+                 hashed_buckets: Dict[str, int] = None,
+                 n_hashes: int = 1,
+                 min_frequency: int = None,
+                 max_vocabulary_size: int = None,
+                 workers: int = 1,
+                 use_multiprocessing: bool = False):
+        self.hashed_buckets = hashed_buckets or {}
+        self.n_hashes = n_hashes
+        self.min_frequency = min_frequency
+        self.max_vocabulary_size = max_vocabulary_size
+        self.workers = workers
+        self.use_multiprocessing = use_multiprocessing
+
+    def make_encoder(self) -> CategoricalEncoder:
+        return CategoricalEncoder(self.hashed_buckets, self.n_hashes, self.min_frequency, self.max_vocabulary_size,
+                                  self.workers, self.use_multiprocessing)
+
+
+class SamplingOptions:
+    """
+    Used to define how the training rows are sampled, with one of the Sampling options
+    """
+
+    def __init__(self, sampling: str = None, size: int = DEFAULT_SAMPLE_SIZE, seed: int = None):
+        self.sampling = sampling
+        self.size = size
+        self.seed = seed
+
+
+class BatchFeeding:
+    """
+    Used to feed the data in memory to the network one batch at a time, as it is done for the data read in chunks
+    """
+
+    def __init__(self,
+                 shuffle: bool = True,
+                 shuffle_block_size: int = None,
+                 workers: int = 1,
+                 use_multiprocessing: bool = False,
+                 max_queue_size: int = 10):
+        self.shuffle = shuffle
+        self.shuffle_block_size = shuffle_block_size
+        self.workers = workers
+        self.use_multiprocessing = use_multiprocessing
+        self.max_queue_size = max_queue_size
+
+
+class EmbeddingBudget:
+    """
+    Used to shrink the embedding sizes so that the model fits in max_parameters parameters or max_memory_bytes bytes
+    """
+
+    def __init__(self,
+                 max_parameters: int = None,
+                 max_memory_bytes: int = None,
+                 size_weighting: str = SizeWeighting.CARDINALITY):
+        self.max_parameters = max_parameters
+        self.max_memory_bytes = max_memory_bytes
+        self.size_weighting = size_weighting
+
+
+class TrainingControl:
+    """
+    Used to control the training through early stopping and a learning rate schedule or reduction on plateau
+    """
+
+    def __init__(self,
+                 monitor: str = 'val_loss',
+                 min_delta: float = 0.0,
+                 early_stopping_patience: int = None,
+                 restore_best_weights: bool = True,
+                 lr_schedule: Callable[[int, float], float] = None,
+                 reduce_lr_patience: int = None,
+                 reduce_lr_factor: float = 0.1):
+        self.monitor = monitor
+        self.min_delta = min_delta
+        self.early_stopping_patience = early_stopping_patience
+        self.restore_best_weights = restore_best_weights
+        self.lr_schedule = lr_schedule
+        self.reduce_lr_patience = reduce_lr_patience
+        self.reduce_lr_factor = reduce_lr_factor
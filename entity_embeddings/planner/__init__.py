@@ -0,0 +1 @@
+from entity_embeddings.planner.planner import EmbeddingPlan, SizeWeighting, plan_embedding_sizes
@@ -0,0 +1,250 @@
+"""
+This file contains the planner of the embedding sizes, which shrinks them by a common factor until the model fits a
+budget of parameters or bytes.
+"""
+from typing import Dict, List
+
+import numpy as np
+
+BYTES_PER_PARAMETER = 4
+MIN_EMBEDDING_SIZE = 2
+MAX_EMBEDDING_SIZE = 50
+
+# the units of the first Dense layer of ModelAssembler.make_hidden_layers
+FIRST_HIDDEN_UNITS = 1000
+
+# how many values each optimizer keeps for every trained parameter, besides the parameter itself
+OPTIMIZER_SLOTS = {'sgd': 0,
+                   'rmsprop': 1,
+                   'adagrad': 1,
+                   'adadelta': 2,
+                   'adam': 2,
+                   'adamax': 2,
+                   'nadam': 2}
+
+
+def get_optimizer_name(optimizer) -> str:
+    """
+    Used to retrieve the name of an optimizer in OPTIMIZER_SLOTS
+    :param optimizer: the name of the optimizer, or the optimizer itself
+    :return: the lowercase name of the optimizer
+    """
+    name = optimizer if isinstance(optimizer, str) else type(optimizer).__name__
+    return name.lower()
+
+
+def get_embedding_size(unique_values: int) -> int:
+    """
+    Return the embedding size to be used on the Embedding layer
+    :param unique_values: the number of unique values in the given category
+    :return: the size to be used on the embedding layer
+    """
+    size = int(min(np.ceil(unique_values / 2), MAX_EMBEDDING_SIZE))
+    if size < MIN_EMBEDDING_SIZE:
+        return MIN_EMBEDDING_SIZE
+    else:
+        return size
+
+
+def get_effective_size(counts: np.ndarray) -> int:
+    """
+    Used to measure how many values a column actually uses, as the perplexity of its distribution
+    :param counts: how many times each value of the column was seen
+    :return: the effective number of values
+    """
+    counts = np.asarray(counts, dtype=float)
+    probabilities = counts[counts > 0] / counts.sum()
+
+    return max(1, int(round(np.exp(-np.sum(probabilities * np.log(probabilities))))))
+
+
+class SizeWeighting:
+    """
+    This class is used to define if the embedding size of each category grows with its number of values or with its
+    effective number of values
+    """
+    CARDINALITY = 'cardinality'
+    FREQUENCY = 'frequency'
+
+    OPTIONS = (CARDINALITY, FREQUENCY)
+
+
+def check_budget(max_parameters: int, max_memory_bytes: int, size_weighting: str, chunk_size: int) -> None:
+    if max_parameters is not None and max_parameters <= 0:
+        raise ValueError("You should provide a max number of parameters greater than zero")
+
+    if max_memory_bytes is not None and max_memory_bytes <= 0:
+        raise ValueError("You should provide a max memory greater than zero")
+
+    if size_weighting not in SizeWeighting.OPTIONS:
+        raise ValueError("You should provide a size weighting among cardinality and frequency")
+
+    if size_weighting == SizeWeighting.FREQUENCY and chunk_size is not None:
+        raise ValueError("You should provide the data in memory, instead of in chunks, to weight the embedding sizes "
+                         "by frequency")
+
+
+class EmbeddingPlan:
+    """
+    Used to store the embedding size chosen for each category, along with the memory it takes
+    """
+
+    def __init__(self,
+                 names: List[str],
+                 rows: List[int],
+                 sizes: List[int],
+                 optimizer: str = 'adam',
+                 hidden_units: int = FIRST_HIDDEN_UNITS):
+        """
+        :param names: the name of each category
+        :param rows: the number of rows of each embedding table
+        :param sizes: the embedding size of each category
+        :param optimizer: the name of the optimizer (or the optimizer itself), used to count its state
+        :param hidden_units: the units of the layer fed by the concatenated embeddings
+        """
+        self.names = list(names)
+        self.rows = [int(row) for row in rows]
+        self.sizes = [int(size) for size in sizes]
+        self.optimizer = get_optimizer_name(optimizer)
+        self.hidden_units = hidden_units
+
+    @property
+    def table_parameters(self) -> List[int]:
+        return [row * size for row, size in zip(self.rows, self.sizes)]
+
+    @property
+    def concatenated_size(self) -> int:
+        return int(np.sum(self.sizes))
+
+    @property
+    def hidden_parameters(self) -> int:
+        """
+        The weights of the first hidden layer, whose input grows with the sum of the embedding sizes
+        """
+        return self.concatenated_size * self.hidden_units
+
+    @property
+    def parameters(self) -> int:
+        return int(np.sum(self.table_parameters)) + self.hidden_parameters
+
+    @property
+    def bytes_per_parameter(self) -> int:
+        """
+        The bytes taken by each trained parameter: its own value and the state of the optimizer
+        """
+        return BYTES_PER_PARAMETER * (1 + OPTIMIZER_SLOTS[self.optimizer])
+
+    @property
+    def memory_bytes(self) -> int:
+        return self.parameters * self.bytes_per_parameter
+
+    def fits(self, max_parameters: int = None, max_memory_bytes: int = None) -> bool:
+        return ((max_parameters is None or self.parameters <= max_parameters) and
+                (max_memory_bytes is None or self.memory_bytes <= max_memory_bytes))
+
+    def apply(self, categories: List) -> None:
+        """
+        Used to set the planned embedding sizes on the given categories
+        :param categories: the list of Category, in the same order of this plan
+        """
+        for category, size in zip(categories, self.sizes):
+            category.embedding_size = size
+
+    def to_dict(self) -> Dict:
+        return {'columns': [{'name': name, 'rows': rows, 'size': size, 'parameters': parameters,
+                             'bytes': parameters * self.bytes_per_parameter}
+                            for name, rows, size, parameters in zip(self.names, self.rows, self.sizes,
+                                                                    self.table_parameters)],
+                'concatenated_size': self.concatenated_size,
+                'hidden_parameters': self.hidden_parameters,
+                'parameters': self.parameters,
+                'memory_bytes': self.memory_bytes}
+
+    def report(self) -> str:
+        """
+        Used to describe the memory taken by each embedding table and by the whole plan
+        :return: the report, as a table of one line per category followed by the totals
+        """
+        width = max([len(name) for name in self.names] + [len('column')])
+        line_format = '%-' + str(width) + 's %12s %6s %14s %12s'
+
+        lines = [line_format % ('column', 'rows', 'size', 'parameters', 'memory')]
+        for name, rows, size, parameters in zip(self.names, self.rows, self.sizes, self.table_parameters):
+            lines.append(line_format % (name, rows, size, parameters, format_bytes(parameters *
+                                                                                    self.bytes_per_parameter)))
+
+        lines.append(line_format % ('hidden layer', self.concatenated_size, self.hidden_units, self.hidden_parameters,
+                                    format_bytes(self.hidden_parameters * self.bytes_per_parameter)))
+        lines.append(line_format % ('total', '', '', self.parameters, format_bytes(self.memory_bytes)))
+        lines.append('memory counts the %s optimizer state, %d bytes per parameter' % (self.optimizer,
+                                                                                       self.bytes_per_parameter))
+
+        return '\n'.join(lines)
+
+
+def format_bytes(n_bytes: int) -> str:
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if n_bytes < 1024:
+            return '%.1f %s' % (n_bytes, unit)
+        n_bytes /= 1024
+
+    return '%.1f TB' % n_bytes
+
+
+def plan_embedding_sizes(categories: List,
+                         max_parameters: int = None,
+                         max_memory_bytes: int = None,
+                         weighting: str = SizeWeighting.CARDINALITY,
+                         counts: List[np.ndarray] = None,
+                         optimizer: str = 'adam',
+                         hidden_units: int = FIRST_HIDDEN_UNITS) -> EmbeddingPlan:
+    """
+    Used to choose the embedding size of each category so that the model fits the given budget
+    :param categories: the list of Category, such as the one returned by generate_categories_from_df
+    :param max_parameters: (optional) how many parameters the embeddings and the first hidden layer may have
+    :param max_memory_bytes: (optional) how many bytes those parameters and their optimizer state may take
+    :param weighting: one of the SizeWeighting options
+    :param counts: how many times each value of each category was seen, required by the frequency weighting
+    :param optimizer: the name of the optimizer (or the optimizer itself), used to count its state
+    :param hidden_units: the units of the layer fed by the concatenated embeddings
+    :return: the EmbeddingPlan, which can be applied to the categories
+    """
+    if weighting not in SizeWeighting.OPTIONS:
+        raise ValueError("You should provide a size weighting among cardinality and frequency")
+
+    if get_optimizer_name(optimizer) not in OPTIMIZER_SLOTS:
+        raise ValueError("You should provide an optimizer among %s" % ', '.join(sorted(OPTIMIZER_SLOTS)))
+
+    rows = [category.unique_values for category in categories]
+    if weighting == SizeWeighting.FREQUENCY:
+        if counts is None or len(counts) != len(categories):
+            raise ValueError("You should provide the counts of the values of each category to weight by frequency")
+        effective_sizes = [min(row, get_effective_size(column_counts)) for row, column_counts in zip(rows, counts)]
+    else:
+        effective_sizes = rows
+
+    desired = np.array([get_embedding_size(size) for size in effective_sizes])
+
+    def make_plan(factor: float) -> EmbeddingPlan:
+        sizes = np.clip(np.ceil(desired * factor), MIN_EMBEDDING_SIZE, desired).astype(int)
+        return EmbeddingPlan([category.alias for category in categories], rows, sizes, optimizer, hidden_units)
+
+    plan = make_plan(1)
+    if plan.fits(max_parameters, max_memory_bytes):
+        return plan
+
+    smallest = make_plan(0)
+    if not smallest.fits(max_parameters, max_memory_bytes):
+        raise ValueError("You should provide a larger budget, since even the smallest embeddings take %d parameters "
+                         "(%s):\n%s" % (smallest.parameters, format_bytes(smallest.memory_bytes), smallest.report()))
+
+    # the greatest factor that fits is found by bisection
+    low, high = 0.0, 1.0
+    for _ in range(30):
+        middle = (low + high) / 2
+        if make_plan(middle).fits(max_parameters, max_memory_bytes):
+            low = middle
+        else:
+            high = middle
+
+    return make_plan(low)
@@ -3,26 +3,49 @@ from typing import List
 
 import numpy as np
 import pandas as pd
-from sklearn.preprocessing import LabelEncoder, OneHotEncoder, MinMaxScaler
 
 
 class TargetProcessor(ABC):
+    # if process_target_chunk needs the distinct values of the target
+    uses_classes = True
+
     @abstractmethod
     def process_target(self, y: List) -> np.ndarray:
         pass
 
+    def process_target_chunk(self, y: np.ndarray, classes: np.ndarray) -> np.ndarray:
+        """
+        Used when the data is read in chunks, to process the target one chunk at a time the same way
+        :param y: the targets of the current chunk
+        :param classes: the sorted distinct values of the target on the whole dataset
+        :return: the processed targets of the current chunk
+        """
+        return np.asarray(self.process_target(y.tolist()))
+
 
 class BinaryClassificationProcessor(TargetProcessor):
     def process_target(self, y: List) -> np.ndarray:
+        from sklearn.preprocessing import LabelEncoder
+
         return LabelEncoder().fit_transform(y)
 
+    def process_target_chunk(self, y: np.ndarray, classes: np.ndarray) -> np.ndarray:
+        return np.searchsorted(classes, y)
+
 
 class MulticlassClassificationProcessor(TargetProcessor):
     def process_target(self, y: List) -> np.ndarray:
+        from sklearn.preprocessing import OneHotEncoder
+
         return OneHotEncoder().fit_transform(pd.DataFrame(y))
 
+    def process_target_chunk(self, y: np.ndarray, classes: np.ndarray) -> np.ndarray:
+        return np.eye(len(classes))[np.searchsorted(classes, y)]
+
 
 class RegressionProcessor(TargetProcessor):
+    uses_classes = False
+
     def process_target(self, y: List) -> np.ndarray:
         return np.array(y)
         # return MinMaxScaler().fit_transform(pd.DataFrame(y))
@@ -0,0 +1,2 @@
+from entity_embeddings.search.cross_validation import CrossValidation
+from entity_embeddings.search.search import HyperparameterSearch, make_grid, make_random_candidates
@@ -0,0 +1,148 @@
+"""
+This file contains the CrossValidation class, which trains one network per fold over a dataset pre-processed only
+once, the folds being trained at once by worker processes.
+"""
+import os
+from typing import Callable, Dict, List
+
+import numpy as np
+import pandas as pd
+
+from entity_embeddings.artifacts import EmbeddingArtifacts, save_artifacts
+from entity_embeddings.cache import CacheEntry
+from entity_embeddings.config import Config
+from entity_embeddings.search.search import get_trial_parameters, is_picklable, preprocess, run_trials
+
+
+def get_folds(n_rows: int, n_folds: int, shuffle: bool = False, seed: int = None) -> List[np.ndarray]:
+    """
+    Used to split the rows into folds of about the same size
+    :param n_rows: how many rows the data has
+    :param n_folds: how many folds there should be
+    :param shuffle: if the rows should be shuffled before being split
+    :param seed: (optional) the seed of the shuffling
+    :return: the sorted indices of the validation rows of each fold
+    """
+    rows = np.random.RandomState(seed).permutation(n_rows) if shuffle else np.arange(n_rows)
+    return [np.sort(fold) for fold in np.array_split(rows, n_folds)]
+
+
+def align_table(table: np.ndarray, reference: np.ndarray) -> np.ndarray:
+    """
+    Used to rotate (or reflect) an embedding matrix onto another one of the same category by orthogonal Procrustes
+    :param table: the embedding matrix to be aligned
+    :param reference: the embedding matrix it is aligned to
+    :return: the rotated embedding matrix closest to the reference
+    """
+    u, _, vt = np.linalg.svd(table.T.dot(reference))
+    return table.dot(u.dot(vt))
+
+
+def average_tables(fold_tables: List[List[np.ndarray]]) -> List[np.ndarray]:
+    """
+    Used to average the embedding matrices learned by each fold, once aligned to the ones of the first fold
+    :param fold_tables: the embedding matrix of each category, for each fold
+    :return: the averaged embedding matrix of each category
+    """
+    return [np.mean([tables[0]] + [align_table(table, tables[0]) for table in tables[1:]], axis=0)
+            for tables in zip(*fold_tables)]
+
+
+def check_cross_validation(cache, n_folds: int, workers: int, threads_per_worker: int,
+                           lr_schedule: Callable = None) -> None:
+    if cache is None:
+        raise ValueError("You should provide a Config created with cache=True, so that its data is pre-processed once")
+
+    if n_folds < 2:
+        raise ValueError("You should provide at least 2 folds")
+
+    if workers > 1 and not is_picklable(lr_schedule):
+        raise ValueError("You should provide a learning rate schedule defined at module level (not a lambda) when "
+                         "training on more than one worker")
+
+    if workers < 1:
+        raise ValueError("You should provide a positive number of workers")
+
+    if threads_per_worker is not None and threads_per_worker < 1:
+        raise ValueError("You should provide a positive number of threads per worker")
+
+
+class CrossValidation:
+    """
+    This class is used to estimate how well the network of a given Config performs, by training it once per fold over
+    its cached data
+    """
+
+    def __init__(self,
+                 config: Config,
+                 n_folds: int = 5,
+                 workers: int = 1,
+                 threads_per_worker: int = None,
+                 shuffle: bool = False,
+                 seed: int = None,
+                 average_embeddings: bool = False):
+        """
+        :param config: the Config whose network is cross-validated, created with cache=True
+        :param n_folds: how many folds the rows are split into
+        :param workers: how many folds should be trained at once, each by a process of its own
+        :param threads_per_worker: (optional) how many threads each worker process should train with
+        :param shuffle: if the rows should be shuffled before being split into folds
+        :param seed: (optional) the seed of the shuffling
+        :param average_embeddings: if the embedding matrices of the folds should be averaged and saved
+        """
+        check_cross_validation(config.cache, n_folds, workers, threads_per_worker, config.training_control.lr_schedule)
+
+        self.config = config
+        self.n_folds = n_folds
+        self.workers = workers
+        self.threads_per_worker = threads_per_worker
+        self.shuffle = shuffle
+        self.seed = seed
+        self.average_embeddings = average_embeddings
+
+        # filled by run
+        self.results: pd.DataFrame = None
+        self.artifacts: EmbeddingArtifacts = None
+
+    def run(self) -> pd.DataFrame:
+        """
+        Used to pre-process the data once and to train a network for each fold
+        :return: the results table, with one row for each fold
+        """
+        cache_path = preprocess(self.config)
+        entry = CacheEntry(cache_path)
+        parameters = get_trial_parameters(self.config)
+
+        folds = get_folds(entry.n_rows, self.n_folds, self.shuffle, self.seed)
+        summaries = run_trials([(parameters, cache_path, {'validation_rows': fold}, self.config.epochs,
+                                 self.average_embeddings) for fold in folds],
+                               self.workers, self.threads_per_worker)
+
+        self.results = pd.DataFrame([{'fold': index,
+                                      'validation_rows': len(fold),
+                                      'epochs_run': summary['epochs'],
+                                      'best_epoch': summary.get('best_epoch'),
+                                      'best_value': summary.get('best_value', np.nan),
+                                      'seconds': summary['seconds']}
+                                     for index, (fold, summary) in enumerate(zip(folds, summaries))])
+
+        if self.average_embeddings:
+            tables = average_tables([summary['tables'] for summary in summaries])
+            self.artifacts = EmbeddingArtifacts.from_weights(tables, entry.vocabulary)
+            save_artifacts(self.artifacts, self.config.get_embeddings_dir())
+
+        return self.results
+
+    def get_summary(self) -> Dict:
+        """
+        :return: the mean and the standard deviation of the best value of the monitored metric over the folds
+        """
+        if self.results is None:
+            raise ValueError("You should run the cross-validation before getting its summary")
+
+        values = self.results['best_value']
+        return {'monitor': self.config.training_control.monitor,
+                'folds': len(values),
+                'mean': float(values.mean()),
+                'std': float(values.std(ddof=1)),
+                'seconds': float(self.results['seconds'].sum())}
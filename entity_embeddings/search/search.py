@@ -0,0 +1,303 @@
+"""
+This file contains the HyperparameterSearch class, which trains many candidate configurations over a single dataset
+pre-processed once into the PreprocessingCache, optionally pruning them by successive halving.
+"""
+import inspect
+import itertools
+import math
+import multiprocessing
+import os
+import pickle
+import time
+from typing import Callable, Dict, List, Union
+
+import numpy as np
+import pandas as pd
+
+from entity_embeddings.cache import CacheEntry
+from entity_embeddings.config import Config
+from entity_embeddings.instrumentation.summary import is_increasing_metric
+from entity_embeddings.util.encoding_utils import encode_data
+from entity_embeddings.util.sampling_utils import Sampling
+
+# the variables read by the numerical libraries to decide how many threads they start
+THREAD_VARIABLES = ('OMP_NUM_THREADS', 'MKL_NUM_THREADS', 'OPENBLAS_NUM_THREADS')
+
+# the arguments of Config holding the data or bound to a single run, which the trials do not inherit
+UNSHARED_PARAMETERS = ('df', 'csv_scan', 'cache', 'cache_max_bytes', 'cache_entry', 'verbose', 'metrics_sinks',
+                       'stage_timer', 'warm_start_path', 'validation_rows')
+
+# the arguments of Config that change how the data is pre-processed
+PREPROCESSING_PARAMETERS = ('target_name', 'target_processor', 'chunk_size', 'encoded', 'feature_names', 'oov',
+                            'vocabulary_options')
+
+
+def make_grid(space: Dict[str, List]) -> List[Dict]:
+    """
+    Used to make every combination of the given values
+    :param space: the values to be tried for each optional argument of Config, by name
+    :return: the list of candidates, each one with a value for every argument
+    """
+    names = list(space)
+    return [dict(zip(names, values)) for values in itertools.product(*[space[name] for name in names])]
+
+
+def make_random_candidates(space: Dict[str, Union[List, Callable]], n_candidates: int, seed: int = None) \
+        -> List[Dict]:
+    """
+    Used to draw candidates at random from the given values
+    :param space: the values (or a function drawing one from a RandomState) of each optional argument of Config
+    :param n_candidates: how many candidates should be drawn
+    :param seed: (optional) the seed used to draw the values
+    :return: the list of candidates
+    """
+    random_state = np.random.RandomState(seed)
+
+    candidates = []
+    for _ in range(n_candidates):
+        candidate = {}
+        for name, values in space.items():
+            candidate[name] = values(random_state) if callable(values) else values[random_state.randint(len(values))]
+        candidates.append(candidate)
+
+    return candidates
+
+
+def limit_threads(threads: int) -> None:
+    """
+    Used to limit how many threads a worker process trains with, before any model is built
+    :param threads: how many threads each worker should use
+    """
+    for variable in THREAD_VARIABLES:
+        os.environ[variable] = str(threads)
+
+    from keras import backend as K
+    if K.backend() == 'tensorflow':
+        import tensorflow as tf
+        K.set_session(tf.Session(config=tf.ConfigProto(intra_op_parallelism_threads=threads,
+                                                       inter_op_parallelism_threads=threads)))
+
+
+def preprocess(config: Config) -> str:
+    """
+    Used to encode the data of a Config into its cache, unless a previous run already did
+    :param config: the Config, created with cache=True
+    :return: where the CacheEntry is located
+    """
+    if config.cache_entry is None:
+        encode_data(config)
+        config.cache_entry = config.cache.get(config.cache_key)
+
+    return config.cache_entry.path
+
+
+def get_trial_parameters(config: Config) -> Dict:
+    """
+    :param config: the Config the trials are made from
+    :return: the arguments of Config shared by every trial, without the data itself
+    """
+    return {name: getattr(config, name) for name in inspect.signature(Config).parameters
+            if name not in UNSHARED_PARAMETERS}
+
+
+def run_trial(parameters: Dict, cache_path: str, candidate: Dict, epochs: int, return_tables: bool = False) -> Dict:
+    """
+    Used to train a single candidate over the cached data and to measure it
+    :param parameters: the arguments of Config shared by every trial
+    :param cache_path: where the CacheEntry of the pre-processed data is located
+    :param candidate: the arguments of Config of this trial, overriding the shared ones
+    :param epochs: how many epochs this trial should be trained at most
+    :param return_tables: if the embedding matrices learned should be returned as well, under tables
+    :return: the summary of the training, along with the seconds it took
+    """
+    from keras import backend as K
+    from entity_embeddings.embedder import Embedder
+    from entity_embeddings.util import model_utils
+
+    config = Config(**dict(parameters, cache_entry=CacheEntry(cache_path), **dict(candidate, epochs=epochs)))
+
+    start = time.perf_counter()
+    embedder = Embedder(config)
+    embedder.network.fit(embedder.X_train, embedder.y_train, embedder.X_val, embedder.y_val)
+    seconds = time.perf_counter() - start
+
+    summary = dict(embedder.network.training_summary, seconds=seconds)
+    if return_tables:
+        summary['tables'] = model_utils.get_weights(embedder.network.model, config)
+
+    # the graphs of the previous trials would otherwise keep growing in the same worker
+    K.clear_session()
+
+    return summary
+
+
+def run_trials(arguments: List[tuple], workers: int = 1, threads_per_worker: int = None) -> List[Dict]:
+    """
+    Used to run many trials, in parallel when more than one worker is given
+    :param arguments: the arguments of run_trial of each trial
+    :param workers: how many trials should be trained at once, each by a process of its own
+    :param threads_per_worker: (optional) how many threads each worker process should train with
+    :return: the summary of each trial, in the same order of the arguments
+    """
+    workers = min(workers, len(arguments))
+    if workers <= 1:
+        return [run_trial(*trial_arguments) for trial_arguments in arguments]
+
+    # a backend already started in the parent cannot be forked safely
+    initializer = limit_threads if threads_per_worker is not None else None
+    with multiprocessing.get_context('spawn').Pool(workers, initializer, (threads_per_worker,)) as pool:
+        return pool.starmap(run_trial, arguments, chunksize=1)
+
+
+def get_ranking(values: np.ndarray, increasing: bool) -> np.ndarray:
+    """
+    Used to rank the trials by the best value of their monitored metric, the trials without it ranking last
+    :param values: the best value of each trial
+    :param increasing: if greater values are better
+    :return: the indices of the trials, from the best to the worst
+    """
+    keys = np.where(np.isnan(values), math.inf, -values if increasing else values)
+    return np.argsort(keys, kind='stable')
+
+
+def is_picklable(value) -> bool:
+    try:
+        pickle.dumps(value)
+    except (pickle.PicklingError, AttributeError, TypeError):
+        return False
+
+    return True
+
+
+def check_search(cache, candidates: List[Dict], workers: int, threads_per_worker: int, halving_factor: int,
+                 min_epochs: int, lr_schedule: Callable = None, sampling: str = None) -> None:
+    if cache is None:
+        raise ValueError("You should provide a Config created with cache=True, so that its data is pre-processed once")
+
+    if not candidates:
+        raise ValueError("You should provide at least one candidate to be searched")
+
+    # every trial trains over the same cached data
+    preprocessing = PREPROCESSING_PARAMETERS + (('sampling_options',) if sampling == Sampling.RESERVOIR else ())
+    for candidate in candidates:
+        names = sorted(name for name in candidate if name in preprocessing)
+        if names:
+            raise ValueError("You should provide candidates that do not change the pre-processing, such as %s"
+                             % ', '.join(names))
+
+        options = candidate.get('sampling_options')
+        if options is not None and options.sampling == Sampling.RESERVOIR:
+            raise ValueError("You should provide candidates that do not sample by reservoir, since it is done once")
+
+    schedules = [lr_schedule] + [candidate['training_control'].lr_schedule for candidate in candidates
+                                 if candidate.get('training_control') is not None]
+    if workers > 1 and not all(is_picklable(schedule) for schedule in schedules):
+        raise ValueError("You should provide a learning rate schedule defined at module level (not a lambda) when "
+                         "training on more than one worker")
+
+    if workers < 1:
+        raise ValueError("You should provide a positive number of workers")
+
+    if threads_per_worker is not None and threads_per_worker < 1:
+        raise ValueError("You should provide a positive number of threads per worker")
+
+    if halving_factor is not None and halving_factor < 2:
+        raise ValueError("You should provide a halving factor of at least 2")
+
+    if min_epochs < 1:
+        raise ValueError("You should provide a positive number of epochs for the first round")
+
+
+class HyperparameterSearch:
+    """
+    This class is used to search for the best candidate configuration over the cached data of a given Config, each
+    candidate being a dict of optional arguments of Config
+    """
+
+    def __init__(self,
+                 config: Config,
+                 candidates: List[Dict],
+                 workers: int = 1,
+                 threads_per_worker: int = None,
+                 halving_factor: int = None,
+                 min_epochs: int = 1):
+        """
+        :param config: the Config whose data is searched over, created with cache=True
+        :param candidates: the candidates to be tried, such as the ones returned by make_grid or make_random_candidates
+        :param workers: how many trials should be trained at once, each by a process of its own
+        :param threads_per_worker: (optional) how many threads each worker process should train with
+        :param halving_factor: (optional) how many times fewer candidates each round of successive halving keeps
+        :param min_epochs: how many epochs the first round of the successive halving trains for
+        """
+        check_search(config.cache, candidates, workers, threads_per_worker, halving_factor, min_epochs,
+                     config.training_control.lr_schedule, config.sampling)
+
+        self.config = config
+        self.candidates = candidates
+        self.workers = workers
+        self.threads_per_worker = threads_per_worker
+        self.halving_factor = halving_factor
+        self.min_epochs = min_epochs
+
+        # filled by run
+        self.results: pd.DataFrame = None
+
+    def run(self) -> pd.DataFrame:
+        """
+        Used to pre-process the data once and to train every candidate, pruning the bad ones when halving
+        :return: the results table, the best trials of the last round first
+        """
+        cache_path = preprocess(self.config)
+        parameters = get_trial_parameters(self.config)
+
+        rows = []
+        remaining = list(range(len(self.candidates)))
+        for round_index in itertools.count():
+            epochs = [self.get_epochs(self.candidates[trial], round_index) for trial in remaining]
+            summaries = run_trials([(parameters, cache_path, self.candidates[trial], trial_epochs)
+                                    for trial, trial_epochs in zip(remaining, epochs)],
+                                   self.workers, self.threads_per_worker)
+
+            for trial, trial_epochs, summary in zip(remaining, epochs, summaries):
+                rows.append(dict(self.candidates[trial], trial=trial, round=round_index, round_epochs=trial_epochs,
+                                 epochs_run=summary['epochs'], best_epoch=summary.get('best_epoch'),
+                                 best_value=summary.get('best_value', np.nan), seconds=summary['seconds']))
+
+            if self.halving_factor is None or len(remaining) == 1 or \
+                    all(trial_epochs >= self.candidates[trial].get('epochs', self.config.epochs)
+                        for trial, trial_epochs in zip(remaining, epochs)):
+                break
+
+            values = np.array([summary.get('best_value', np.nan) for summary in summaries], dtype=float)
+            ranking = get_ranking(values, is_increasing_metric(self.config.training_control.monitor))
+            remaining = [remaining[index] for index in ranking[:max(1, len(remaining) // self.halving_factor)]]
+
+        results = pd.DataFrame(rows)
+        results = results.sort_values(['round', 'best_value'],
+                                      ascending=[False, not is_increasing_metric(self.config.training_control.monitor)],
+                                      na_position='last', kind='mergesort')
+        self.results = results.reset_index(drop=True)
+
+        return self.results
+
+    def get_best_candidate(self) -> Dict:
+        """
+        :return: the candidate of the best trial of the last round
+        """
+        if self.results is None:
+            raise ValueError("You should run the search before getting its best candidate")
+
+        return self.candidates[int(self.results['trial'].iloc[0])]
+
+    def get_epochs(self, candidate: Dict, round_index: int) -> int:
+        """
+        Used to get how many epochs a candidate is trained for at a given round
+        :param candidate: the candidate
+        :param round_index: the round of the successive halving, starting at 0
+        :return: the epochs of the candidate, or fewer when halving
+        """
+        epochs = candidate.get('epochs', self.config.epochs)
+        if self.halving_factor is None:
+            return epochs
+
+        return min(epochs, self.min_epochs * self.halving_factor ** round_index)
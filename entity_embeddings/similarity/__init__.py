@@ -0,0 +1,3 @@
+from entity_embeddings.similarity.ivf import IVFIndex
+from entity_embeddings.similarity.search import Metric, exact_search
+from entity_embeddings.similarity.similarity import CategorySimilarity
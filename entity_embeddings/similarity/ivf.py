@@ -0,0 +1,191 @@
+"""
+This file contains the IVFIndex class, an approximate nearest-neighbour index scoring each query only against the
+embeddings of the k-means clusters nearest to it.
+"""
+import json
+import os
+from typing import Tuple
+
+import numpy as np
+
+from entity_embeddings.similarity.search import Metric, assign_nearest, check_metric, exact_search, normalize_rows, \
+    prepare_queries, score_block, select_top_k, to_metric
+
+IVF_FORMAT_VERSION = 1
+IVF_MANIFEST_FILENAME = 'manifest.json'
+CENTROIDS_FILENAME = 'centroids.npy'
+VECTORS_FILENAME = 'vectors.npy'
+IDS_FILENAME = 'ids.npy'
+LIST_OFFSETS_FILENAME = 'list_offsets.npy'
+
+DEFAULT_N_PROBE = 8
+DEFAULT_N_ITERATIONS = 20
+TRAINING_ROWS_PER_LIST = 256
+
+
+def get_default_n_lists(n_rows: int) -> int:
+    """
+    Used to choose the number of clusters of an index, growing with the square root of the number of rows
+    :param n_rows: how many embeddings will be indexed
+    :return: the number of clusters
+    """
+    return max(1, min(n_rows, int(4 * np.sqrt(n_rows))))
+
+
+def train_kmeans(vectors: np.ndarray, n_clusters: int, n_iterations: int, seed: int = None) -> np.ndarray:
+    """
+    Used to cluster the given vectors through the Lloyd algorithm
+    :param vectors: the (rows, size) array to be clustered
+    :param n_clusters: how many clusters should be found
+    :param n_iterations: how many times the centroids should be updated
+    :param seed: (optional) the seed used to pick the initial centroids
+    :return: the (n_clusters, size) array of centroids
+    """
+    random_state = np.random.RandomState(seed)
+    centroids = vectors[random_state.choice(len(vectors), n_clusters, replace=False)].copy()
+
+    for _ in range(n_iterations):
+        assignments = assign_nearest(centroids, vectors)
+
+        counts = np.bincount(assignments, minlength=n_clusters)
+        sums = np.stack([np.bincount(assignments, weights=vectors[:, dim], minlength=n_clusters)
+                         for dim in range(vectors.shape[1])], axis=1)
+
+        filled = counts > 0
+        centroids[filled] = sums[filled] / counts[filled, np.newaxis]
+
+    return centroids
+
+
+class IVFIndex:
+    """
+    Used to search the nearest neighbours of an embedding matrix approximately, its rows being grouped by cluster
+    """
+
+    def __init__(self,
+                 centroids: np.ndarray,
+                 vectors: np.ndarray,
+                 ids: np.ndarray,
+                 list_offsets: np.ndarray,
+                 metric: str = Metric.COSINE):
+        """
+        :param centroids: the (n_lists, size) array of centroids
+        :param vectors: the (rows, size) array of embeddings, sorted by cluster (and normalized for the cosine metric)
+        :param ids: the row of the original embedding matrix of each of the vectors
+        :param list_offsets: where the vectors of each cluster start, with one extra item holding the number of rows
+        :param metric: one of the Metric options
+        """
+        check_metric(metric)
+
+        self.centroids = centroids
+        self.vectors = vectors
+        self.ids = ids
+        self.list_offsets = list_offsets
+        self.metric = metric
+
+    @property
+    def n_lists(self) -> int:
+        return len(self.centroids)
+
+    @classmethod
+    def build(cls,
+              table: np.ndarray,
+              metric: str = Metric.COSINE,
+              n_lists: int = None,
+              n_iterations: int = DEFAULT_N_ITERATIONS,
+              seed: int = None) -> 'IVFIndex':
+        """
+        Used to build an index over a given embedding matrix
+        :param table: the (rows, size) embedding matrix
+        :param metric: one of the Metric options
+        :param n_lists: (optional) how many clusters the index should have, defaulting to get_default_n_lists
+        :param n_iterations: how many iterations of k-means should be run
+        :param seed: (optional) the seed of the sampling and of the k-means initialization
+        :return: an IVFIndex object
+        """
+        check_metric(metric)
+
+        vectors = normalize_rows(table) if metric == Metric.COSINE else np.asarray(table, dtype=np.float32)
+        n_lists = min(n_lists or get_default_n_lists(len(vectors)), len(vectors))
+
+        random_state = np.random.RandomState(seed)
+        n_training = min(len(vectors), n_lists * TRAINING_ROWS_PER_LIST)
+        training = vectors[np.sort(random_state.choice(len(vectors), n_training, replace=False))]
+
+        centroids = train_kmeans(training, n_lists, n_iterations, seed)
+        assignments = assign_nearest(centroids, vectors)
+
+        ids = np.argsort(assignments, kind='stable')
+        list_offsets = np.concatenate([[0], np.cumsum(np.bincount(assignments, minlength=n_lists))])
+
+        return cls(centroids, vectors[ids], ids, list_offsets, metric)
+
+    def search(self, queries: np.ndarray, k: int, n_probe: int = DEFAULT_N_PROBE) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Used to find approximately the k rows most similar to each query, among the ones of its n_probe nearest clusters
+        :param queries: the (queries, size) array, or a single (size,) query
+        :param k: how many neighbours should be returned
+        :param n_probe: how many clusters should be scored for each query
+        :return: the same tuple returned by exact_search, with an id of -1 for the missing neighbours
+        """
+        prepared = prepare_queries(queries, self.metric)
+        probes = exact_search(self.centroids, prepared, min(n_probe, self.n_lists), Metric.L2)[0]
+
+        ids = np.full((len(prepared), k), -1, dtype=np.int64)
+        scores = np.full((len(prepared), k), -np.inf, dtype=np.float32)
+
+        for query, lists in enumerate(probes):
+            rows = np.concatenate([np.arange(self.list_offsets[index], self.list_offsets[index + 1])
+                                   for index in lists])
+            if not len(rows):
+                continue
+
+            candidate_scores = score_block(prepared[query:query + 1], self.vectors[rows], self.metric)
+            candidate_ids, candidate_scores = select_top_k(rows[np.newaxis], candidate_scores, k)
+
+            ids[query, :candidate_ids.shape[1]] = self.ids[candidate_ids[0]]
+            scores[query, :candidate_scores.shape[1]] = candidate_scores[0]
+
+        return ids, to_metric(prepared, scores, self.metric)
+
+    def save(self, path: str) -> None:
+        """
+        Used to save this index as .npy files into a given directory
+        :param path: where the index should be saved
+        """
+        os.makedirs(path, exist_ok=True)
+
+        np.save(os.path.join(path, CENTROIDS_FILENAME), self.centroids)
+        np.save(os.path.join(path, VECTORS_FILENAME), self.vectors)
+        np.save(os.path.join(path, IDS_FILENAME), self.ids)
+        np.save(os.path.join(path, LIST_OFFSETS_FILENAME), self.list_offsets)
+
+        with open(os.path.join(path, IVF_MANIFEST_FILENAME), 'w') as f:
+            json.dump({'format_version': IVF_FORMAT_VERSION,
+                       'metric': self.metric,
+                       'n_lists': self.n_lists,
+                       'n_rows': len(self.ids)}, f, indent=2)
+
+    @classmethod
+    def load(cls, path: str, mmap_mode: str = 'r') -> 'IVFIndex':
+        """
+        Used to load an index previously saved with the save method
+        :param path: where the index was saved
+        :param mmap_mode: how the files should be memory-mapped, or None to read them into memory
+        :return: an IVFIndex object
+        """
+        manifest_path = os.path.join(path, IVF_MANIFEST_FILENAME)
+        if not os.path.exists(manifest_path):
+            raise ValueError("You should provide a directory containing a saved index")
+
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+
+        if manifest.get('format_version') != IVF_FORMAT_VERSION:
+            raise ValueError("You should provide an index saved with the format version %d" % IVF_FORMAT_VERSION)
+
+        return cls(np.load(os.path.join(path, CENTROIDS_FILENAME)),
+                   np.load(os.path.join(path, VECTORS_FILENAME), mmap_mode=mmap_mode),
+                   np.load(os.path.join(path, IDS_FILENAME), mmap_mode=mmap_mode),
+                   np.load(os.path.join(path, LIST_OFFSETS_FILENAME)),
+                   manifest['metric'])
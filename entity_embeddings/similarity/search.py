@@ -0,0 +1,152 @@
+"""
+This file contains the exact nearest-neighbour search over an embedding matrix, read one block of rows at a time.
+"""
+from typing import Tuple
+
+import numpy as np
+
+DEFAULT_BLOCK_SIZE = 65536
+DEFAULT_QUERY_BLOCK_SIZE = 1024
+
+
+class Metric:
+    """
+    This class is used to define how two embeddings are compared: by their cosine similarity or euclidean distance
+    """
+    COSINE = 'cosine'
+    L2 = 'l2'
+
+    OPTIONS = (COSINE, L2)
+
+
+def check_metric(metric: str) -> None:
+    if metric not in Metric.OPTIONS:
+        raise ValueError("You should provide a metric among cosine and l2")
+
+
+def normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    """
+    Used to scale every row to a unit norm, leaving the rows made only of zeros untouched
+    :param vectors: the 2-dimensional array to be normalized
+    :return: the normalized float32 array
+    """
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.where(norms > 0, norms, 1)
+
+
+def score_block(queries: np.ndarray, block: np.ndarray, metric: str) -> np.ndarray:
+    """
+    Used to score the given (normalized, for the cosine metric) queries against a block of embeddings
+    :param queries: the (queries, size) array
+    :param block: the (rows, size) array of embeddings
+    :param metric: one of the Metric options
+    :return: the (queries, rows) array of scores, the greater the more similar
+    """
+    block = np.asarray(block, dtype=np.float32)
+
+    if metric == Metric.COSINE:
+        norms = np.linalg.norm(block, axis=1)
+        return np.dot(queries, block.T) / np.where(norms > 0, norms, 1)
+
+    return 2 * np.dot(queries, block.T) - np.einsum('ij,ij->i', block, block)
+
+
+def to_metric(queries: np.ndarray, scores: np.ndarray, metric: str) -> np.ndarray:
+    """
+    Used to convert the scores returned by score_block into the values of the metric
+    :param queries: the (queries, size) array
+    :param scores: the (queries, k) array of scores
+    :param metric: one of the Metric options
+    :return: the cosine similarities, or the euclidean distances
+    """
+    if metric == Metric.COSINE:
+        return scores
+
+    return np.sqrt(np.maximum(np.einsum('ij,ij->i', queries, queries)[:, np.newaxis] - scores, 0))
+
+
+def select_top_k(ids: np.ndarray, scores: np.ndarray, k: int) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Used to keep, for every query, the k greatest scores, sorted from the greatest one
+    :param ids: the (queries, candidates) array of ids
+    :param scores: the (queries, candidates) array of scores
+    :param k: how many candidates should be kept
+    :return: a tuple containing the (queries, k) arrays of ids and scores
+    """
+    if scores.shape[1] > k:
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        ids = np.take_along_axis(ids, top, axis=1)
+        scores = np.take_along_axis(scores, top, axis=1)
+
+    order = np.argsort(-scores, axis=1, kind='stable')
+    return np.take_along_axis(ids, order, axis=1), np.take_along_axis(scores, order, axis=1)
+
+
+def prepare_queries(queries: np.ndarray, metric: str) -> np.ndarray:
+    queries = np.atleast_2d(np.asarray(queries, dtype=np.float32))
+    return normalize_rows(queries) if metric == Metric.COSINE else queries
+
+
+def exact_search(table: np.ndarray,
+                 queries: np.ndarray,
+                 k: int,
+                 metric: str = Metric.COSINE,
+                 block_size: int = DEFAULT_BLOCK_SIZE) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Used to find the k rows of the table most similar to each query, scoring one block of rows at a time
+    :param table: the (rows, size) embedding matrix, which may be memory-mapped
+    :param queries: the (queries, size) array, or a single (size,) query
+    :param k: how many neighbours should be returned
+    :param metric: one of the Metric options
+    :param block_size: how many rows of the table should be scored at once
+    :return: a tuple containing the (queries, k) arrays of the row ids and of their values of the metric
+    """
+    check_metric(metric)
+    prepared = prepare_queries(queries, metric)
+    k = min(k, len(table))
+
+    ids = np.empty((len(prepared), k), dtype=np.int64)
+    scores = np.empty((len(prepared), k), dtype=np.float32)
+
+    for query_start in range(0, len(prepared), DEFAULT_QUERY_BLOCK_SIZE):
+        query_block = slice(query_start, query_start + DEFAULT_QUERY_BLOCK_SIZE)
+        ids[query_block], scores[query_block] = _search_block(table, prepared[query_block], k, metric, block_size)
+
+    return ids, to_metric(prepared, scores, metric)
+
+
+def assign_nearest(table: np.ndarray, vectors: np.ndarray) -> np.ndarray:
+    """
+    Used to find the row of a (small) table nearest to each of the given vectors by the euclidean distance
+    :param table: the (rows, size) array, scored at once
+    :param vectors: the (vectors, size) array
+    :return: the row of the table nearest to each vector
+    """
+    vectors = np.asarray(vectors, dtype=np.float32)
+
+    assignments = np.empty(len(vectors), dtype=np.int64)
+    for start in range(0, len(vectors), DEFAULT_QUERY_BLOCK_SIZE):
+        block = slice(start, start + DEFAULT_QUERY_BLOCK_SIZE)
+        assignments[block] = score_block(vectors[block], table, Metric.L2).argmax(axis=1)
+
+    return assignments
+
+
+def _search_block(table: np.ndarray,
+                  queries: np.ndarray,
+                  k: int,
+                  metric: str,
+                  block_size: int) -> Tuple[np.ndarray, np.ndarray]:
+    ids = np.empty((len(queries), 0), dtype=np.int64)
+    scores = np.empty((len(queries), 0), dtype=np.float32)
+
+    for start in range(0, len(table), block_size):
+        block = table[start:start + block_size]
+        block_ids = np.broadcast_to(np.arange(start, start + len(block)), (len(queries), len(block)))
+
+        ids, scores = select_top_k(np.concatenate([ids, block_ids], axis=1),
+                                   np.concatenate([scores, score_block(queries, block, metric)], axis=1),
+                                   k)
+
+    return ids, scores
@@ -0,0 +1,150 @@
+"""
+This file contains the CategorySimilarity class, used to find the values of a categorical column whose embeddings are
+the most similar to the one of a given value.
+"""
+import os
+from typing import Any, List, Tuple
+
+import numpy as np
+
+from entity_embeddings.artifacts import EmbeddingArtifacts, load_artifacts
+from entity_embeddings.artifacts.artifacts import DEFAULT_EMBEDDINGS_DIRNAME, INDEXES_DIRNAME
+from entity_embeddings.encoder import ColumnVocabulary, HashedColumnVocabulary
+from entity_embeddings.similarity.ivf import DEFAULT_N_PROBE, IVFIndex
+from entity_embeddings.similarity.search import DEFAULT_BLOCK_SIZE, Metric, check_metric, exact_search
+
+
+def get_index_dir(path: str, name: str, artifacts: EmbeddingArtifacts) -> str:
+    """
+    Used to retrieve where the IVFIndex of a given category is saved, inside an embeddings directory
+    :param path: the directory where the embeddings were saved
+    :param name: the name of the category
+    :param artifacts: the EmbeddingArtifacts loaded from that directory
+    :return: the directory of the index
+    """
+    return os.path.join(path, INDEXES_DIRNAME, str(artifacts.vocabulary.names.index(name)))
+
+
+def is_index_of(index: IVFIndex, table: np.ndarray) -> bool:
+    return len(index.ids) == len(table) and index.vectors.shape[1] == table.shape[1]
+
+
+class CategorySimilarity:
+    """
+    Used to query the values of a single category by the similarity of their embeddings
+    """
+
+    def __init__(self,
+                 table: np.ndarray,
+                 column: ColumnVocabulary,
+                 metric: str = Metric.COSINE,
+                 index: IVFIndex = None):
+        """
+        :param table: the (values, size) embedding matrix of the category, which may be memory-mapped
+        :param column: the ColumnVocabulary of the category, in the same order of the table rows
+        :param metric: one of the Metric options
+        :param index: (optional) an IVFIndex over the table, used to search approximately instead of exactly
+        """
+        check_metric(metric)
+
+        if isinstance(column, HashedColumnVocabulary):
+            raise ValueError("You should provide a column that is not hashed, since its values cannot be recovered")
+
+        if len(table) != len(column):
+            raise ValueError("You should provide one embedding for each value of the column %s" % column.name)
+
+        if index is not None and index.metric != metric:
+            raise ValueError("You should provide an index built with the %s metric" % metric)
+
+        if index is not None and not is_index_of(index, table):
+            raise ValueError("You should provide an index built over the table of the column %s" % column.name)
+
+        self.table = table
+        self.column = column
+        self.metric = metric
+        self.index = index
+
+    def build_index(self, n_lists: int = None, seed: int = None) -> IVFIndex:
+        """
+        Used to build an IVFIndex over the table, which is then used by every search
+        :param n_lists: (optional) how many clusters the index should have
+        :param seed: (optional) the seed used to build the index
+        :return: the built IVFIndex
+        """
+        self.index = IVFIndex.build(self.table, self.metric, n_lists, seed=seed)
+        return self.index
+
+    def search(self,
+               queries: np.ndarray,
+               k: int,
+               n_probe: int = DEFAULT_N_PROBE,
+               block_size: int = DEFAULT_BLOCK_SIZE) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Used to find the codes of the values most similar to the given embeddings
+        :param queries: the (queries, size) array of embeddings, or a single (size,) one
+        :param k: how many neighbours should be returned
+        :param n_probe: how many clusters should be scored, when an index is used
+        :param block_size: how many rows should be scored at once, when no index is used
+        :return: the same tuple returned by exact_search
+        """
+        if self.index is not None:
+            return self.index.search(queries, k, n_probe)
+
+        return exact_search(self.table, queries, k, self.metric, block_size)
+
+    def most_similar(self, value: Any, k: int = 10, n_probe: int = DEFAULT_N_PROBE) -> List[Tuple[Any, float]]:
+        """
+        Used to find the k values most similar to a given one, excluding the value itself
+        :param value: a raw value of the category
+        :param k: how many values should be returned
+        :param n_probe: how many clusters should be scored, when an index is used
+        :return: a list of (value, score) tuples, from the most similar
+        """
+        # the values left out of a pruned column are unknown here as well
+        code = int(self.column.transform(np.array([value], dtype=object))[0])
+        if code < 0 or code >= len(self.column.values):
+            raise KeyError("You should provide a value present in the vocabulary of %s" % self.column.name)
+
+        excluded = [code, self.column.other_code] if self.column.other else [code]
+        ids, scores = self.search(self.table[code], k + len(excluded), n_probe)
+        found = ids[0] >= 0
+        ids, scores = ids[0][found], scores[0][found]
+
+        kept = ~np.isin(ids, excluded)
+        return list(zip(self.column.inverse_transform(ids[kept][:k]).tolist(), scores[kept][:k].tolist()))
+
+    def save_index(self, path: str) -> None:
+        if self.index is None:
+            raise ValueError("You should build an index before saving it")
+
+        self.index.save(path)
+
+    @classmethod
+    def from_artifacts(cls,
+                       artifacts_path: str,
+                       name: str,
+                       metric: str = Metric.COSINE,
+                       mmap_mode: str = 'r') -> 'CategorySimilarity':
+        """
+        Used to load the similarity of a category from the embeddings saved by the Embedder, along with its index
+        :param artifacts_path: the artifacts path given to the Config
+        :param name: the name of the category
+        :param metric: one of the Metric options
+        :param mmap_mode: how the files should be memory-mapped, or None to read them into memory
+        :return: a CategorySimilarity object
+        """
+        path = os.path.join(artifacts_path, DEFAULT_EMBEDDINGS_DIRNAME)
+        artifacts = load_artifacts(path, mmap_mode)
+
+        if name not in artifacts.vocabulary.names:
+            raise ValueError("You should provide the name of a category present in the artifacts")
+
+        index_dir = get_index_dir(path, name, artifacts)
+        table = artifacts.get_table(name)
+        index = IVFIndex.load(index_dir, mmap_mode) if os.path.isdir(index_dir) else None
+
+        # an index of another metric, or built over other embeddings, is not used
+        if index is not None and (index.metric != metric or not is_index_of(index, table)):
+            index = None
+
+        return cls(table, artifacts.vocabulary[name], metric, index)
@@ -1,5 +1,7 @@
+import importlib
 import os
 import shutil
+from typing import Iterator, List
 
 import numpy as np
 import pandas as pd
@@ -7,13 +9,141 @@ import pandas as pd
 from entity_embeddings.util.validation_utils import check_not_empty_dataframe
 
 
-def load_guarantee_not_empty(csv_path) -> pd.DataFrame:
-    df = pd.read_csv(csv_path)
+PARQUET_EXTENSIONS = ('.parquet', '.pq')
+FEATHER_EXTENSIONS = ('.feather',)
+ARROW_EXTENSIONS = ('.arrow', '.ipc')
+
+
+def load_guarantee_not_empty(csv_path, columns: List[str] = None, target_name: str = None) -> pd.DataFrame:
+    df = read_dataframe(csv_path, columns, target_name)
     check_not_empty_dataframe(df)
 
     return df
 
 
+def read_dataframe(path: str, columns: List[str] = None, target_name: str = None) -> pd.DataFrame:
+    """
+    Used to read a DataFrame from a csv, parquet, feather or arrow (IPC) file, according to its extension
+    :param path: where the file is located
+    :param columns: (optional) the only columns to be read
+    :param target_name: (optional) the name of the target column, which is never loaded as categorical
+    :return: the DataFrame read
+    """
+    extension = os.path.splitext(path)[1].lower()
+
+    if extension in PARQUET_EXTENSIONS:
+        parquet = _import_pyarrow_module('pyarrow.parquet')
+        schema = parquet.read_schema(path)
+        table = parquet.read_table(path,
+                                   columns=columns,
+                                   read_dictionary=_get_string_columns(schema, columns, target_name))
+        return _table_to_pandas(table, target_name)
+
+    if extension in FEATHER_EXTENSIONS:
+        feather = _import_pyarrow_module('pyarrow.feather')
+        return _table_to_pandas(feather.read_table(path, columns=columns), target_name)
+
+    if extension in ARROW_EXTENSIONS:
+        table = _import_pyarrow_module('pyarrow').Table.from_batches(list(_read_arrow_batches(path, columns)))
+        return _table_to_pandas(table, target_name)
+
+    return pd.read_csv(path, usecols=columns)
+
+
+def read_chunks(path: str, chunk_size: int, columns: List[str] = None, target_name: str = None) \
+        -> Iterator[pd.DataFrame]:
+    """
+    Used to read a csv, parquet, feather or arrow (IPC) file one chunk of rows at a time
+    :param path: where the file is located
+    :param chunk_size: how many rows should be read at once
+    :param columns: (optional) the only columns to be read
+    :param target_name: (optional) the name of the target column, which is never loaded as categorical
+    :return: an iterator over the DataFrame of each chunk
+    """
+    extension = os.path.splitext(path)[1].lower()
+
+    if extension in PARQUET_EXTENSIONS:
+        parquet_file = _import_pyarrow_module('pyarrow.parquet').ParquetFile(path)
+        for batch in parquet_file.iter_batches(batch_size=chunk_size, columns=columns):
+            yield _table_to_pandas(batch, target_name)
+
+    elif extension in FEATHER_EXTENSIONS + ARROW_EXTENSIONS:
+        for batch in _read_arrow_batches(path, columns):
+            for start in range(0, batch.num_rows, chunk_size):
+                yield _table_to_pandas(batch.slice(start, chunk_size), target_name)
+
+    else:
+        for chunk in pd.read_csv(path, chunksize=chunk_size, usecols=columns):
+            yield chunk
+
+
+def get_columns_to_load(feature_names: List[str], target_name: str) -> List[str]:
+    if feature_names is None:
+        return None
+
+    return list(feature_names) + [target_name]
+
+
+def _import_pyarrow_module(name: str):
+    try:
+        return importlib.import_module(name)
+    except ImportError:
+        raise ImportError("You should install pyarrow in order to read parquet, feather or arrow files")
+
+
+def _read_arrow_batches(path: str, columns: List[str] = None) -> Iterator:
+    """
+    Used to read the record batches of a memory-mapped arrow (IPC) file, in the random access or in the stream format
+    """
+    pyarrow = _import_pyarrow_module('pyarrow')
+    with pyarrow.memory_map(path) as source:
+        try:
+            reader = pyarrow.ipc.open_file(source)
+            batches = (reader.get_batch(index) for index in range(reader.num_record_batches))
+        except pyarrow.ArrowInvalid:
+            # not in the random access format, so it should be an arrow stream
+            source.seek(0)
+            batches = pyarrow.ipc.open_stream(source)
+
+        for batch in batches:
+            yield batch.select(columns) if columns is not None else batch
+
+
+def _get_string_columns(schema, columns: List[str], target_name: str) -> List[str]:
+    pyarrow = _import_pyarrow_module('pyarrow')
+    return [field.name for field in schema
+            if (columns is None or field.name in columns) and field.name != target_name
+            and (pyarrow.types.is_string(field.type) or pyarrow.types.is_large_string(field.type))]
+
+
+def _table_to_pandas(table, target_name: str) -> pd.DataFrame:
+    """
+    Used to convert an arrow Table (or RecordBatch) into a DataFrame, with its string columns as categoricals
+    """
+    pyarrow = _import_pyarrow_module('pyarrow')
+    if not isinstance(table, pyarrow.Table):
+        table = pyarrow.Table.from_batches([table])
+
+    for name in _get_string_columns(table.schema, None, target_name):
+        index = table.schema.get_field_index(name)
+        table = table.set_column(index, name, table.column(index).dictionary_encode())
+
+    return table.to_pandas()
+
+
+def make_dataframe_from_arrays(X: np.ndarray,
+                               y: np.ndarray,
+                               feature_names: List[str] = None,
+                               target_name: str = 'target') -> pd.DataFrame:
+    if feature_names is None:
+        feature_names = ['feature_%d' % index for index in range(X.shape[1])]
+
+    df = pd.DataFrame(X, columns=feature_names)
+    df[target_name] = y
+
+    return df
+
+
 def get_all_columns_except(df: pd.DataFrame, column_to_skip: str) -> pd.DataFrame:
     return df.loc[:, df.columns != column_to_skip]
 
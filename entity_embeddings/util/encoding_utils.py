@@ -0,0 +1,89 @@
+"""
+Contain methods used to encode the features and process the targets of a Config, either in memory or one chunk at a
+time from the csv.
+"""
+from typing import Tuple
+
+import numpy as np
+
+from entity_embeddings.config import Config
+from entity_embeddings.encoder import ColumnVocabulary, Vocabulary, get_code_dtype
+from entity_embeddings.util import preprocessing_utils, streaming_utils
+from entity_embeddings.util.sampling_utils import Sampling
+
+
+def encode_data(config: Config) -> Tuple[np.ndarray, np.ndarray, Vocabulary]:
+    """
+    Used to encode the features and process the targets of a Config, without splitting nor sampling them
+    :param config: the Config holding the data
+    :return: a tuple containing the encoded features, the processed targets and the Vocabulary of the features
+    """
+    if config.cache_entry is not None:
+        entry = config.cache_entry
+        return entry.X, entry.y, config.vocabulary
+
+    if config.is_streaming():
+        return encode_streaming_data(config)
+
+    X, y = preprocessing_utils.get_X_y_columnar(config.df, config.target_name)
+
+    # pre processing of X and Y
+    if config.warm_start is not None:
+        # the vocabulary grown from the previous run keeps its codes
+        labels = config.vocabulary
+        if config.encoded:
+            X = np.column_stack(X).astype(get_code_dtype(max(len(column) for column in labels)), copy=False)
+        else:
+            X = config.get_encoder().transform(X, labels)
+    elif config.encoded:
+        dtype = get_code_dtype(max(category.unique_values for category in config.categories))
+        X = np.column_stack(X).astype(dtype, copy=False)
+        labels = Vocabulary([ColumnVocabulary(category.alias, np.arange(category.unique_values))
+                             for category in config.categories])
+    else:
+        names = [category.alias for category in config.categories]
+        X, labels = config.get_encoder().fit_transform(X, names)
+
+    y = preprocessing_utils.to_dense(config.target_processor.process_target(y.tolist()))
+
+    if config.cache is not None:
+        config.cache.put(config.cache_key, X, y, labels, config.unique_classes)
+
+    return X, y, labels
+
+
+def encode_streaming_data(config: Config) -> Tuple[np.ndarray, np.ndarray, Vocabulary]:
+    """
+    Used instead of encode_data when the csv is read in chunks, encoding the data into memory-mapped files
+    :param config: the Config holding the csv
+    :return: the same tuple returned by encode_data, with the targets already processed
+    """
+    cache = config.cache
+    if cache is None:
+        X, y = write_encoded_csv(config, config.get_encoded_dir())
+        return X, y, config.vocabulary
+
+    staging_dir = cache.make_staging_dir()
+    try:
+        X, y = write_encoded_csv(config, staging_dir)
+        entry = cache.commit(config.cache_key, staging_dir, config.vocabulary, len(X), config.unique_classes)
+    except BaseException:
+        cache.discard(staging_dir)
+        raise
+
+    return entry.X, entry.y, config.vocabulary
+
+
+def write_encoded_csv(config: Config, output_dir: str) -> Tuple[np.ndarray, np.ndarray]:
+    sample_size = config.sampling_options.size if config.sampling == Sampling.RESERVOIR else None
+    return streaming_utils.encode_csv(config.csv_path,
+                                      config.target_name,
+                                      config.vocabulary,
+                                      config.target_classes,
+                                      config.target_processor,
+                                      config.n_rows,
+                                      config.chunk_size,
+                                      output_dir,
+                                      config.get_columns_to_load(),
+                                      sample_size,
+                                      config.sampling_options.seed)
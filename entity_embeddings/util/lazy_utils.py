@@ -0,0 +1,39 @@
+"""
+This file contains what is needed to import the public names of a package on first use, so that keras is only loaded
+by the processes that train.
+"""
+import importlib
+import sys
+from types import ModuleType
+from typing import Dict, List
+
+
+class LazyModule(ModuleType):
+    """
+    Used as the class of a package module, so that each of its lazy names is imported the first time it is accessed
+    """
+
+    def __getattr__(self, name: str):
+        lazy_names = self.__dict__.get('_lazy_names', {})
+        if name not in lazy_names:
+            raise AttributeError("module %r has no attribute %r" % (self.__name__, name))
+
+        value = getattr(importlib.import_module(lazy_names[name]), name)
+        setattr(self, name, value)
+
+        return value
+
+    def __dir__(self) -> List[str]:
+        return sorted(set(super().__dir__()) | set(self.__dict__.get('_lazy_names', {})))
+
+
+def make_lazy(package_name: str, lazy_names: Dict[str, str]) -> None:
+    """
+    Used by the __init__ of a package to import the given names only on first use
+    :param package_name: the __name__ of the package
+    :param lazy_names: the module defining each name, by name
+    """
+    package = sys.modules[package_name]
+    package._lazy_names = lazy_names
+    package.__all__ = sorted(set(getattr(package, '__all__', [])) | set(lazy_names))
+    package.__class__ = LazyModule
@@ -1,30 +1,35 @@
-import pickle
-from typing import List
-
-from keras import Model
+from typing import TYPE_CHECKING, List
 
 from entity_embeddings import Config
-from entity_embeddings.util import dataframe_utils
+from entity_embeddings.artifacts import EmbeddingArtifacts, save_artifacts
+from entity_embeddings.encoder import Vocabulary
+from entity_embeddings.network.fused import DEFAULT_FUSED_LAYER_NAME
+
+if TYPE_CHECKING:
+    from keras import Model
 
 
-def get_weights(model: Model, config: Config) -> List:
+def get_weights(model: 'Model', config: Config) -> List:
     weights_embeddings = []
-    for column in dataframe_utils.get_all_columns_except(config.df, config.target_name):
-        weights = get_weights_from_layer(model, column)
+    for category in config.categories:
+        if config.fused_embeddings:
+            weights = get_weights_from_fused_layer(model, category.alias)
+        else:
+            weights = get_weights_from_layer(model, category.alias)
         weights_embeddings.append(weights)
 
     return weights_embeddings
 
 
-def save_weights(weights: List, config: Config) -> None:
-    with open(config.get_weights_path(), 'wb') as f:
-        pickle.dump(weights, f, -1)
-
-
-def save_labels(labels: List, config: Config) -> None:
-    with open(config.get_labels_path(), 'wb') as f:
-        pickle.dump(labels, f, -1)
+def save_embeddings(weights: List, vocabulary: Vocabulary, config: Config) -> EmbeddingArtifacts:
+    artifacts = EmbeddingArtifacts.from_weights(weights, vocabulary)
+    save_artifacts(artifacts, config.get_embeddings_dir())
+    return artifacts
 
 
 def get_weights_from_layer(model, layer_name):
     return model.get_layer(layer_name).get_weights()[0]
+
+
+def get_weights_from_fused_layer(model, category_name, layer_name=DEFAULT_FUSED_LAYER_NAME):
+    return model.get_layer(layer_name).get_column_weights(category_name)
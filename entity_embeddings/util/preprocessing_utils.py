@@ -1,9 +1,12 @@
-from typing import List, Tuple
+from typing import TYPE_CHECKING, List, Tuple
 
 import numpy as np
 import pandas as pd
-from sklearn import preprocessing
-from sklearn.preprocessing import LabelEncoder
+
+from entity_embeddings.encoder import get_code_dtype
+
+if TYPE_CHECKING:
+    from sklearn.preprocessing import LabelEncoder
 
 
 def series_to_list(series: pd.Series) -> List:
@@ -19,9 +22,9 @@ def series_to_list(series: pd.Series) -> List:
     return list_cols
 
 def sample(X: np.ndarray, y: np.ndarray, n: int) -> Tuple[np.ndarray, np.ndarray]:
-    num_row = X.shape[0]
+    num_row = len(X)
     indices = np.random.randint(num_row, size=n)
-    return X[indices, :], y[indices]
+    return X[indices], y[indices]
 
 
 def get_X_y(df: pd.DataFrame, name_target: str) -> Tuple[List, List]:
@@ -43,12 +46,28 @@ def get_X_y(df: pd.DataFrame, name_target: str) -> Tuple[List, List]:
     return X_list, y_list
 
 
-def label_encode(data: List) -> [np.ndarray, List[LabelEncoder]]:
+def get_X_y_columnar(df: pd.DataFrame, name_target: str) -> Tuple[List[np.ndarray], np.ndarray]:
+    """
+    This method is used to gather the X (features) and y (targets) from a given dataframe based on a given
+    target name, without iterating over its rows and keeping the dtype of every column
+    :param df: the dataframe to be used as source
+    :param name_target: the name of the target variable
+    :return: the list of feature columns and the array of targets
+    """
+    X_columns = [df[column].values for column in df.columns if column != name_target]
+    y = df[name_target].values.astype(int, copy=False)
+
+    return X_columns, y
+
+
+def label_encode(data: List) -> [np.ndarray, List['LabelEncoder']]:
     """
     This method is used to perform Label Encoding on a given list
     :param data: the list containing the items to be encoded
     :return: the encoded np.ndarray
     """
+    from sklearn import preprocessing
+
     labels_encoded = []
     data_encoded = np.array(data)
     for i in range(data_encoded.shape[1]):
@@ -57,10 +76,40 @@ def label_encode(data: List) -> [np.ndarray, List[LabelEncoder]]:
         labels_encoded.append(le)
         data_encoded[:, i] = le.transform(data_encoded[:, i])
 
-    data_encoded = data_encoded.astype(int)
+    data_encoded = data_encoded.astype(get_code_dtype(max(len(le.classes_) for le in labels_encoded)))
+    return data_encoded, labels_encoded
+
+
+def label_encode_columns(columns: List[np.ndarray]) -> [np.ndarray, List['LabelEncoder']]:
+    """
+    This method is used to perform Label Encoding on a given list of columns, such as the one of get_X_y_columnar
+    :param columns: the list containing the columns to be encoded
+    :return: the encoded np.ndarray, with one column for each of the given ones
+    """
+    from sklearn import preprocessing
+
+    labels_encoded = [preprocessing.LabelEncoder().fit(column) for column in columns]
+
+    dtype = get_code_dtype(max(len(le.classes_) for le in labels_encoded))
+    data_encoded = np.empty((len(columns[0]), len(columns)), dtype=dtype)
+    for i, (column, le) in enumerate(zip(columns, labels_encoded)):
+        data_encoded[:, i] = le.transform(column)
+
     return data_encoded, labels_encoded
 
 
+def to_dense(y) -> np.ndarray:
+    """
+    This method is used to convert processed targets, such as a sparse matrix, into a np.ndarray
+    :param y: the processed targets
+    :return: the targets as a np.ndarray
+    """
+    if hasattr(y, 'toarray'):
+        return y.toarray()
+
+    return np.asarray(y)
+
+
 def transpose_to_list(X: np.ndarray) -> List[np.ndarray]:
     """
     :param X: the ndarray to be used as source
@@ -69,6 +118,7 @@ def transpose_to_list(X: np.ndarray) -> List[np.ndarray]:
 
     features_list = []
     for index in range(X.shape[1]):
-        features_list.append(X[..., [index]])
+        # each item is a view keeping the dtype of X
+        features_list.append(X[..., index:index + 1])
 
     return features_list
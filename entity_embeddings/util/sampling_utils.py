@@ -0,0 +1,230 @@
+"""
+This file contains the strategies used to sample the training rows, gathering only the rows kept.
+"""
+from typing import Tuple
+
+import numpy as np
+
+from entity_embeddings.util.preprocessing_utils import sample
+
+DEFAULT_SAMPLE_SIZE = 1000
+
+# the number of quantiles a continuous target is split into
+N_CONTINUOUS_STRATA = 10
+
+
+class Sampling:
+    """
+    This class is used to define how the training rows are sampled
+    """
+    NONE = 'none'
+    BOOTSTRAP = 'bootstrap'
+    UNIFORM = 'uniform'
+    STRATIFIED = 'stratified'
+    RESERVOIR = 'reservoir'
+
+    OPTIONS = (NONE, BOOTSTRAP, UNIFORM, STRATIFIED, RESERVOIR)
+
+
+class ReservoirSampler:
+    """
+    Used to draw a fixed number of rows without replacement in a single pass over chunks of rows (algorithm R)
+    """
+
+    def __init__(self, size: int, random_state: np.random.RandomState = None):
+        """
+        :param size: how many rows should be sampled
+        :param random_state: (optional) the RandomState used to draw the rows
+        """
+        self.size = size
+        self.random_state = random_state or np.random.RandomState()
+        self.n_seen = 0
+        self.sources = np.empty(size, dtype=np.int64)
+
+    def update(self, n_rows: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Used to feed the next chunk of rows to the reservoir
+        :param n_rows: the number of rows of the chunk
+        :return: a tuple containing the rows of the chunk entering the reservoir and the slots they are written to
+        """
+        positions = np.arange(self.n_seen, self.n_seen + n_rows, dtype=np.int64)
+        slots = positions.copy()
+        remaining = positions >= self.size
+        if remaining.any():
+            slots[remaining] = self.random_state.randint(0, positions[remaining] + 1)
+
+        rows = np.flatnonzero(slots < self.size)
+        slots = slots[rows]
+
+        # when several rows of the chunk take the same slot, only the last one is kept
+        _, last = np.unique(slots[::-1], return_index=True)
+        kept = len(slots) - 1 - last
+        rows, slots = rows[kept], slots[kept]
+
+        self.sources[slots] = positions[rows]
+        self.n_seen += n_rows
+
+        return rows, slots
+
+    def get_indices(self) -> np.ndarray:
+        """
+        :return: the sorted indices of the sampled rows
+        """
+        return np.sort(self.sources[:min(self.size, self.n_seen)])
+
+    def get_order(self) -> np.ndarray:
+        """
+        :return: the slots of the reservoir, ordered as their rows appear in the data
+        """
+        return np.argsort(self.sources[:min(self.size, self.n_seen)], kind='stable')
+
+
+class RowSubset:
+    """
+    Used to read a subset of the rows of an array, such as the training rows of a fold, one slice at a time
+    """
+
+    def __init__(self, data: np.ndarray, rows: np.ndarray):
+        """
+        :param data: the array, possibly memory-mapped
+        :param rows: the sorted indices of the rows of the subset
+        """
+        self.data = data
+        self.rows = rows
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __getitem__(self, index) -> np.ndarray:
+        return self.data[self.rows[index]]
+
+
+def split_rows(X: np.ndarray, y: np.ndarray, validation_rows: np.ndarray, lazy: bool = False) \
+        -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Used to split the data into the given validation rows and the remaining training rows
+    :param X: the encoded features, possibly memory-mapped
+    :param y: the processed targets
+    :param validation_rows: the indices of the validation rows
+    :param lazy: if the features should be read by slice through a RowSubset, instead of being gathered at once
+    :return: a tuple containing X_train, X_val, y_train and y_val
+    """
+    validation = np.zeros(len(X), dtype=bool)
+    validation[validation_rows] = True
+    subsets = np.flatnonzero(~validation), np.flatnonzero(validation)
+
+    if lazy:
+        (X_train, y_train), (X_val, y_val) = [(RowSubset(X, rows), y[rows]) for rows in subsets]
+    else:
+        (X_train, y_train), (X_val, y_val) = [(X[rows], y[rows]) for rows in subsets]
+
+    return X_train, X_val, y_train, y_val
+
+
+def get_strata(y: np.ndarray) -> np.ndarray:
+    """
+    Used to group the rows by target class, value or quantile
+    :param y: the processed targets
+    :return: the stratum of each row
+    """
+    y = np.asarray(y)
+    if y.ndim > 1:
+        return np.argmax(y, axis=1)
+
+    if y.dtype.kind == 'f' and not np.all(np.mod(y, 1) == 0):
+        edges = np.quantile(y, np.linspace(0, 1, N_CONTINUOUS_STRATA + 1)[1:-1])
+        return np.searchsorted(edges, y, side='right')
+
+    return y
+
+
+def get_stratified_indices(y: np.ndarray, size: int, random_state: np.random.RandomState) -> np.ndarray:
+    """
+    Used to draw rows without replacement, so that each target keeps its proportion in the sample
+    :param y: the processed targets
+    :param size: how many rows should be sampled
+    :param random_state: the RandomState used to draw the rows
+    :return: the sorted indices of the sampled rows
+    """
+    _, strata, counts = np.unique(get_strata(y), return_inverse=True, return_counts=True)
+    strata = strata.ravel()
+
+    quotas = counts * size / len(strata)
+    allocated = np.floor(quotas).astype(int)
+    allocated[np.argsort(allocated - quotas, kind='stable')[:size - allocated.sum()]] += 1
+
+    indices = [random_state.choice(np.flatnonzero(strata == stratum), quota, replace=False)
+               for stratum, quota in enumerate(allocated) if quota]
+
+    return np.sort(np.concatenate(indices))
+
+
+def get_sample_indices(y: np.ndarray,
+                       sampling: str,
+                       size: int,
+                       random_state: np.random.RandomState) -> np.ndarray:
+    """
+    Used to choose the training rows to be kept by a given strategy
+    :param y: the processed targets of the training rows
+    :param sampling: one of the Sampling options, other than none
+    :param size: how many rows should be sampled
+    :param random_state: the RandomState used to draw the rows
+    :return: the indices of the sampled rows
+    """
+    n_rows = len(y)
+
+    if sampling == Sampling.BOOTSTRAP:
+        return random_state.randint(n_rows, size=size)
+
+    if sampling == Sampling.UNIFORM:
+        return np.sort(random_state.choice(n_rows, size, replace=False))
+
+    return get_stratified_indices(y, size, random_state)
+
+
+def sample_training_data(X: np.ndarray,
+                         y: np.ndarray,
+                         sampling: str,
+                         size: int = DEFAULT_SAMPLE_SIZE,
+                         seed: int = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Used to sample the training rows by a given strategy
+    :param X: the encoded training features, possibly memory-mapped
+    :param y: the processed training targets
+    :param sampling: one of the Sampling options
+    :param size: how many rows should be sampled
+    :param seed: (optional) the seed used to draw the rows
+    :return: a tuple containing the sampled features and targets
+    """
+    random_state = np.random.RandomState(seed)
+
+    # the reservoir is drawn while the csv is encoded, so the given rows are already sampled
+    if sampling in (Sampling.NONE, Sampling.RESERVOIR) or (sampling != Sampling.BOOTSTRAP and size >= len(X)):
+        return X, y
+
+    if sampling == Sampling.BOOTSTRAP and seed is None:
+        return sample(X, y, size)
+
+    indices = get_sample_indices(y, sampling, size, random_state)
+
+    return X[indices], y[indices]
+
+
+def get_default_sampling(streaming: bool) -> str:
+    """
+    Used to keep the former behaviour when no strategy is given
+    :param streaming: if the data is read in chunks
+    :return: one of the Sampling options
+    """
+    return Sampling.NONE if streaming else Sampling.BOOTSTRAP
+
+
+def check_sampling(sampling: str, sample_size: int, chunk_size: int = None) -> None:
+    if sampling is not None and sampling not in Sampling.OPTIONS:
+        raise ValueError("You should provide a sampling among none, bootstrap, uniform, stratified and reservoir")
+
+    if sampling == Sampling.RESERVOIR and chunk_size is None:
+        raise ValueError("You should provide a chunk size to sample by reservoir")
+
+    if sample_size <= 0:
+        raise ValueError("You should provide a sample size greater than zero")
@@ -0,0 +1,149 @@
+"""
+Contain methods used to read a csv (or a parquet, feather or arrow file) that does not fit in memory, in two passes of
+one chunk at a time.
+"""
+import os
+from typing import List, Tuple
+
+import numpy as np
+
+from entity_embeddings.encoder import CategoricalEncoder, Vocabulary
+from entity_embeddings.processor.processor import TargetProcessor
+from entity_embeddings.util.dataframe_utils import read_chunks
+from entity_embeddings.util.preprocessing_utils import get_X_y_columnar
+from entity_embeddings.util.sampling_utils import ReservoirSampler
+from entity_embeddings.util.validation_utils import check_target_existent_in_df
+
+ENCODED_FEATURES_FILENAME = 'X.npy'
+ENCODED_TARGETS_FILENAME = 'y.npy'
+
+# a target with more distinct values is not read as classes
+MAX_TARGET_CLASSES = 10000
+
+
+class CsvScan:
+    """
+    Used to store what is learned on the first pass over a csv read in chunks
+    """
+
+    def __init__(self, vocabulary: Vocabulary, target_classes: np.ndarray, n_rows: int):
+        self.vocabulary = vocabulary
+        self.target_classes = target_classes
+        self.n_rows = n_rows
+
+
+def scan_csv(csv_path: str,
+             target_name: str,
+             chunk_size: int,
+             columns: List[str] = None,
+             encoder: CategoricalEncoder = None,
+             collect_classes: bool = True) -> CsvScan:
+    """
+    Used to perform the first pass over the csv, learning the vocabulary of the features and the target classes
+    :param csv_path: where the csv containing both the features and target is located
+    :param target_name: the name of the target/output variable
+    :param chunk_size: how many rows should be read at once
+    :param columns: (optional) the only columns to be read
+    :param encoder: (optional) the CategoricalEncoder learning the vocabulary
+    :param collect_classes: if the target classes should be collected
+    :return: a CsvScan object
+    """
+    encoder = encoder or CategoricalEncoder()
+    target_classes = set() if collect_classes else None
+    n_rows = 0
+
+    for chunk in read_chunks(csv_path, chunk_size, columns, target_name):
+        if n_rows == 0:
+            check_target_existent_in_df(target_name, chunk)
+
+        X, y = get_X_y_columnar(chunk, target_name)
+        encoder.partial_fit(X, [column for column in chunk.columns if column != target_name])
+
+        if target_classes is not None:
+            target_classes.update(np.unique(y).tolist())
+            if len(target_classes) > MAX_TARGET_CLASSES:
+                raise ValueError("You should provide a target with at most %d classes, or a regression target type"
+                                 % MAX_TARGET_CLASSES)
+
+        n_rows += len(chunk)
+
+    if n_rows == 0:
+        raise ValueError("You should provide a non-empty csv")
+
+    if target_classes is not None:
+        target_classes = np.array(sorted(target_classes))
+
+    return CsvScan(encoder.get_vocabulary(), target_classes, n_rows)
+
+
+def encode_csv(csv_path: str,
+               target_name: str,
+               vocabulary: Vocabulary,
+               target_classes: np.ndarray,
+               target_processor: TargetProcessor,
+               n_rows: int,
+               chunk_size: int,
+               output_dir: str,
+               columns: List[str] = None,
+               sample_size: int = None,
+               seed: int = None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Used to perform the second pass over the csv, writing the encoded data into memory-mapped .npy files
+    :param csv_path: where the csv containing both the features and target is located
+    :param target_name: the name of the target/output variable
+    :param vocabulary: the Vocabulary learned on the first pass
+    :param target_classes: the distinct values of the target learned on the first pass, or None when not collected
+    :param target_processor: the TargetProcessor to be used on each chunk
+    :param n_rows: the number of rows of the csv
+    :param chunk_size: how many rows should be read at once
+    :param output_dir: where the encoded files should be written
+    :param columns: (optional) the only columns to be read
+    :param sample_size: (optional) how many rows should be sampled by reservoir, instead of writing all of them
+    :param seed: (optional) the seed used to draw the sampled rows
+    :return: a tuple containing the read-only memory-mapped features and targets
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    X_path = os.path.join(output_dir, ENCODED_FEATURES_FILENAME)
+    y_path = os.path.join(output_dir, ENCODED_TARGETS_FILENAME)
+
+    sampler = ReservoirSampler(sample_size, np.random.RandomState(seed)) if sample_size is not None else None
+    n_written = min(sample_size, n_rows) if sampler is not None else n_rows
+
+    encoder = CategoricalEncoder()
+    X, y = None, None
+    start = 0
+
+    for chunk in read_chunks(csv_path, chunk_size, columns, target_name):
+        if sampler is not None:
+            # only the rows entering the reservoir are encoded, overwriting the ones they replace
+            rows, slots = sampler.update(len(chunk))
+            if not len(rows):
+                continue
+            chunk = chunk.iloc[rows]
+        else:
+            slots = slice(start, start + len(chunk))
+            start += len(chunk)
+
+        X_chunk, y_chunk = get_X_y_columnar(chunk, target_name)
+        X_chunk = encoder.transform(X_chunk, vocabulary)
+        y_chunk = target_processor.process_target_chunk(y_chunk, target_classes)
+
+        if X is None:
+            X = np.lib.format.open_memmap(X_path, mode='w+', dtype=X_chunk.dtype, shape=(n_written, X_chunk.shape[1]))
+            y = np.lib.format.open_memmap(y_path, mode='w+', dtype=y_chunk.dtype,
+                                          shape=(n_written,) + y_chunk.shape[1:])
+
+        X[slots] = X_chunk
+        y[slots] = y_chunk
+
+    if sampler is not None:
+        # the reservoir is reordered as the rows appear in the csv
+        order = sampler.get_order()
+        X[:] = X[order]
+        y[:] = y[order]
+
+    X.flush()
+    y.flush()
+    del X, y
+
+    return np.load(X_path, mmap_mode='r'), np.load(y_path, mmap_mode='r')
@@ -0,0 +1,35 @@
+"""
+Contain methods used to lay out the embedding matrices of every category one after the other, in a single flat table.
+"""
+from typing import List, Tuple
+
+import numpy as np
+
+
+def make_fused_indices(input_dims: List[int], output_dims: List[int]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Used to compute how the encoded categories are mapped into the flat table, the output unit p reading the element
+    offsets[p] + code * strides[p]
+    :param input_dims: the number of unique values of each category
+    :param output_dims: the embedding size of each category
+    :return: a tuple containing, for every output unit, the category it comes from, its offset and its stride
+    """
+    columns = np.repeat(np.arange(len(output_dims)), output_dims)
+    strides = np.repeat(output_dims, output_dims)
+
+    table_offsets = np.concatenate([[0], np.cumsum(np.multiply(input_dims, output_dims))[:-1]])
+    unit_offsets = np.concatenate([np.arange(output_dim) for output_dim in output_dims])
+    offsets = np.repeat(table_offsets, output_dims) + unit_offsets
+
+    return columns.astype('int32'), offsets.astype('int32'), strides.astype('int32')
+
+
+def get_column_slices(input_dims: List[int], output_dims: List[int]) -> List[Tuple[int, int]]:
+    """
+    Used to compute where the embedding matrix of each category is located in the flat table
+    :param input_dims: the number of unique values of each category
+    :param output_dims: the embedding size of each category
+    :return: the list of the (start, end) positions of each embedding matrix
+    """
+    ends = np.cumsum(np.multiply(input_dims, output_dims)).tolist()
+    return list(zip([0] + ends[:-1], ends))
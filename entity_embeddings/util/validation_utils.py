@@ -1,5 +1,7 @@
 import os
+from typing import Callable, List
 
+import numpy as np
 import pandas as pd
 
 # from entity_embeddings.network.assembler import ModelAssembler
@@ -16,6 +18,21 @@ def check_csv_data(csv_path: str) -> None:
         raise ValueError("You should provide an existent csv path")
 
 
+def check_data_source(csv_path: str, df: pd.DataFrame, chunk_size: int) -> None:
+    if df is None:
+        check_csv_data(csv_path)
+    elif chunk_size is not None:
+        raise ValueError("You should provide a csv path instead of a dataframe when reading the data in chunks")
+
+
+def check_encoded_features(X: np.ndarray) -> None:
+    if X.ndim != 2 or X.dtype.kind not in 'iu':
+        raise ValueError("You should provide the encoded features as a 2-dimensional integer array")
+
+    if X.size and X.min() < 0:
+        raise ValueError("You should provide encoded features without negative codes")
+
+
 def check_not_empty_dataframe(df: pd.DataFrame) -> None:
     if df.empty:
         raise ValueError("You should provide a non-empty pandas dataframe")
@@ -26,6 +43,17 @@ def check_target_name(target_name: str) -> None:
         raise ValueError("You should provide a non-empty target name")
 
 
+def check_feature_names(feature_names: List[str], target_name: str) -> None:
+    if feature_names is None:
+        return
+
+    if not feature_names:
+        raise ValueError("You should provide at least one feature name")
+
+    if target_name in feature_names:
+        raise ValueError("You should not provide the target variable among the feature names")
+
+
 def check_target_existent_in_df(target_name: str, df: pd.DataFrame) -> None:
     if target_name not in df.columns:
         raise ValueError("You should provide a target variable that is existent on the dataframe")
@@ -46,6 +74,84 @@ def check_batch_size(batch_size: int) -> None:
         raise ValueError("You should provide a batch size greater than zero")
 
 
+def check_chunk_size(chunk_size: int) -> None:
+    if chunk_size is not None and chunk_size <= 0:
+        raise ValueError("You should provide a chunk size greater than zero")
+
+
+def check_batch_feeding(shuffle_block_size: int, workers: int, max_queue_size: int) -> None:
+    if shuffle_block_size is not None and shuffle_block_size <= 0:
+        raise ValueError("You should provide a shuffle block size greater than zero")
+
+    if workers < 0:
+        raise ValueError("You should provide a non-negative number of workers")
+
+    if max_queue_size <= 0:
+        raise ValueError("You should provide a max queue size greater than zero")
+
+
+def check_pruning(min_frequency: int, max_vocabulary_size: int, encoded: bool) -> None:
+    if min_frequency is not None and min_frequency <= 0:
+        raise ValueError("You should provide a min frequency greater than zero")
+
+    if max_vocabulary_size is not None and max_vocabulary_size <= 0:
+        raise ValueError("You should provide a max vocabulary size greater than zero")
+
+    if encoded and (min_frequency is not None or max_vocabulary_size is not None):
+        raise ValueError("You should provide raw values, instead of encoded ones, for the vocabulary to be pruned")
+
+
+def check_encoding_workers(encoding_workers: int) -> None:
+    if encoding_workers <= 0:
+        raise ValueError("You should provide a number of encoding workers greater than zero")
+
+
+def check_training_control(min_delta: float,
+                           early_stopping_patience: int,
+                           lr_schedule: Callable,
+                           reduce_lr_patience: int,
+                           reduce_lr_factor: float) -> None:
+    if min_delta < 0:
+        raise ValueError("You should provide a non-negative min delta")
+
+    if early_stopping_patience is not None and early_stopping_patience < 0:
+        raise ValueError("You should provide a non-negative early stopping patience")
+
+    if reduce_lr_patience is not None and reduce_lr_patience < 0:
+        raise ValueError("You should provide a non-negative patience for reducing the learning rate")
+
+    if not 0 < reduce_lr_factor < 1:
+        raise ValueError("You should provide a factor between 0 and 1 for reducing the learning rate")
+
+    if lr_schedule is not None and reduce_lr_patience is not None:
+        raise ValueError("You should provide either a learning rate schedule or a patience for reducing it, not both")
+
+
+def check_warm_start(warm_start_path: str, cache: bool, max_parameters: int, max_memory_bytes: int) -> None:
+    if warm_start_path is None:
+        return
+
+    if not os.path.exists(warm_start_path):
+        raise ValueError("You should provide an existent artifacts path to warm start from")
+
+    if cache:
+        raise ValueError("You should not cache the pre-processed data when warm starting, since its codes depend on "
+                         "the previous run")
+
+    if max_parameters is not None or max_memory_bytes is not None:
+        raise ValueError("You should not provide a budget when warm starting, since the embedding sizes are the ones "
+                         "of the previous run")
+
+
+def check_validation_rows(validation_rows: np.ndarray) -> None:
+    if validation_rows is None:
+        return
+
+    validation_rows = np.asarray(validation_rows)
+    if validation_rows.ndim != 1 or validation_rows.dtype.kind not in 'iu' or not len(validation_rows):
+        raise ValueError("You should provide the validation rows as a non-empty 1-dimensional array of indices")
+
+
 def check_weights_output(weights_output: str) -> None:
     if not weights_output:
         raise ValueError("You should provide a output file for the embeddings weights")
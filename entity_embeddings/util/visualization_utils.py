@@ -1,33 +1,31 @@
 """
 Contain methods that are useful to generate visualizations from the weights of the Embedding layers. Also provides
-methods to plot the model history, such as loss over epochs.
+methods to plot the model history, such as loss over epochs. Matplotlib and sklearn are only imported when plotting.
 """
 import os
-import pickle
-from typing import List
+from typing import TYPE_CHECKING, List
 
-import matplotlib.pyplot as plt
 import numpy as np
 import pandas
-from keras.callbacks import History
-from matplotlib.figure import Figure
-from sklearn import manifold
-from sklearn.preprocessing import LabelEncoder
 
 from entity_embeddings import Config
-from sklearn.decomposition import PCA
+from entity_embeddings.artifacts import load_artifacts
 
+if TYPE_CHECKING:
+    from keras.callbacks import History
+    from matplotlib.figure import Figure
+    from sklearn.preprocessing import LabelEncoder
 
 TITLE_FORMAT = 'Weights for %s'
 SCATTER_EMBEDDINGS_FORMAT = '%s_embedding.%s'
 PLOT_LOSS_FORMAT = 'loss_epochs.%s'
 
 
-def make_visualizations(labels: List[LabelEncoder],
+def make_visualizations(labels: List['LabelEncoder'],
                         embeddings: List[np.array],
                         df: pandas.DataFrame,
                         output_path: str = None,
-                        extension: str = 'pdf') -> List[Figure]:
+                        extension: str = 'pdf') -> List['Figure']:
     """
     Used to generate the embedding visualizations for each categorical variable
 
@@ -38,6 +36,9 @@ def make_visualizations(labels: List[LabelEncoder],
     :param extension: (optional) the extension to be used when saving the artifacts
     :return: the list of figures for each categorical variable
     """
+    import matplotlib.pyplot as plt
+    from sklearn.decomposition import PCA
+
     figures = []
     for index in range(df.shape[1] - 1):
         column = df.columns[index]
@@ -46,7 +47,6 @@ def make_visualizations(labels: List[LabelEncoder],
             labels_column = labels[index]
             embeddings_column = embeddings[index]
 
-            # tsne = manifold.TSNE(init='pca', random_state=0, method='exact')
             pca = PCA(n_components=2)
             Y = pca.fit_transform(embeddings_column)
 
@@ -65,34 +65,36 @@ def make_visualizations(labels: List[LabelEncoder],
 
 
 def make_visualizations_from_config(config: Config,
-                                    extension: str = 'pdf') -> List[Figure]:
+                                    extension: str = 'pdf') -> List['Figure']:
     """
     Used to generate the embedding visualizations from a given Config object
     :param config: the Config used
     :param extension: the extension to be saved the artifacts
     :return: the list of figures for each categorical variable
     """
-    with open(config.get_labels_path(), 'rb') as f:
-        labels = pickle.load(f)
-
-    with open(config.get_weights_path(), 'rb') as f:
-        embeddings = pickle.load(f)
+    artifacts = load_artifacts(config.get_embeddings_dir())
+    labels = list(artifacts.vocabulary)
+    embeddings = artifacts.tables
 
-    return make_visualizations(labels, embeddings, config.df, config.get_visualizations_dir(), extension)
+    # only the column names are used, so an empty frame is enough (and works when the csv is read in chunks)
+    columns = [category.alias for category in config.categories] + [config.target_name]
+    return make_visualizations(labels, embeddings, pandas.DataFrame(columns=columns), config.get_visualizations_dir(),
+                               extension)
 
 
-def is_not_single_embedding(label: LabelEncoder) -> bool:
+def is_not_single_embedding(label: 'LabelEncoder') -> bool:
     """
-    Used to check if there is more than one class in a given LabelEncoder
+    Used to check if there is more than one class in a given LabelEncoder. Hashed columns have no classes to be
+    annotated, so they are never plotted
     :param label: label encoder to be checked
     :return: a boolean if the embedding contains more than one class
     """
-    return label.classes_.shape[0] > 1
+    return label.classes_ is not None and label.classes_.shape[0] > 1
 
 
-def make_plot_from_history(history: History,
+def make_plot_from_history(history: 'History',
                            output_path: str = None,
-                           extension: str = 'pdf') -> Figure:
+                           extension: str = 'pdf') -> 'Figure':
     """
     Used to make a Figure object containing the loss curve between the epochs.
     :param history: the history outputted from the model.fit method
@@ -100,6 +102,8 @@ def make_plot_from_history(history: History,
     :param extension: (optional) the extension of the file
     :return: a Figure object containing the plot
     """
+    import matplotlib.pyplot as plt
+
     loss = history.history['loss']
 
     fig = plt.figure(figsize=(10, 10))
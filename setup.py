@@ -29,5 +29,9 @@ setup(
         'Programming Language :: Python :: 3.6',
     ],
     packages=find_packages(),
-    install_requires=read_file('requirements.txt')
+    install_requires=read_file('requirements.txt'),
+    extras_require={
+        # needed to read parquet, feather and arrow files
+        'arrow': ['pyarrow>=3.0'],
+    }
 )
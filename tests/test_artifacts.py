@@ -0,0 +1,159 @@
+import json
+import os
+import shutil
+import unittest
+
+import numpy as np
+
+from entity_embeddings.artifacts import EmbeddingArtifacts, get_warm_start_tables, grow_vocabulary, load_artifacts, \
+    save_artifacts
+from entity_embeddings.artifacts.artifacts import MANIFEST_FILENAME
+from entity_embeddings.artifacts.warm_start import grow_table
+from entity_embeddings.encoder import ColumnVocabulary, HashedColumnVocabulary, Vocabulary
+
+ARTIFACTS_DIR = 'test_artifacts'
+
+
+class TestArtifacts(unittest.TestCase):
+    def setUp(self):
+        self.vocabulary = Vocabulary([ColumnVocabulary('A', np.array(['x', 'y', np.nan], dtype=object)),
+                                      ColumnVocabulary('B', np.array([10, 20])),
+                                      ColumnVocabulary('C', np.array([1, 'a'], dtype=object))])
+        self.weights = [np.random.rand(3, 2), np.random.rand(2, 3), np.random.rand(2, 2)]
+
+    def tearDown(self):
+        shutil.rmtree(ARTIFACTS_DIR, ignore_errors=True)
+
+    def test_save_and_load(self):
+        save_artifacts(EmbeddingArtifacts.from_weights(self.weights, self.vocabulary), ARTIFACTS_DIR)
+        artifacts = load_artifacts(ARTIFACTS_DIR)
+
+        self.assertIsInstance(artifacts.buffer, np.memmap)
+        self.assertEqual(artifacts.buffer.dtype, np.float32)
+        for table, weights in zip(artifacts.tables, self.weights):
+            np.testing.assert_allclose(table, weights, rtol=1e-6)
+
+        self.assertListEqual(artifacts.vocabulary.names, ['A', 'B', 'C'])
+        self.assertListEqual(artifacts.vocabulary['A'].values[:2].tolist(), ['x', 'y'])
+        self.assertTrue(np.isnan(artifacts.vocabulary['A'].values[2]))
+        self.assertIsInstance(artifacts.vocabulary['B'].values, np.memmap)
+        self.assertListEqual(artifacts.vocabulary['C'].values.tolist(), [1, 'a'])
+
+    def test_only_mixed_vocabularies_are_pickled(self):
+        save_artifacts(EmbeddingArtifacts.from_weights(self.weights, self.vocabulary), ARTIFACTS_DIR)
+
+        with open(os.path.join(ARTIFACTS_DIR, MANIFEST_FILENAME)) as f:
+            manifest = json.load(f)
+
+        self.assertListEqual([column['pickled'] for column in manifest['columns']], [False, False, True])
+        self.assertListEqual([column['offset'] for column in manifest['columns']], [0, 6, 12])
+
+    def test_unknown_format_version(self):
+        save_artifacts(EmbeddingArtifacts.from_weights(self.weights, self.vocabulary), ARTIFACTS_DIR)
+
+        manifest_path = os.path.join(ARTIFACTS_DIR, MANIFEST_FILENAME)
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+        manifest['format_version'] = 0
+        with open(manifest_path, 'w') as f:
+            json.dump(manifest, f)
+
+        self.assertRaises(ValueError, load_artifacts, ARTIFACTS_DIR)
+
+    def test_missing_manifest(self):
+        self.assertRaises(ValueError, load_artifacts, ARTIFACTS_DIR)
+
+    def test_weights_not_matching_vocabulary(self):
+        self.assertRaises(ValueError, EmbeddingArtifacts.from_weights, self.weights[:2], self.vocabulary)
+        self.assertRaises(ValueError, EmbeddingArtifacts.from_weights, [np.random.rand(4, 2)] + self.weights[1:],
+                          self.vocabulary)
+
+    def test_save_and_load_hashed_column(self):
+        vocabulary = Vocabulary([self.vocabulary['A'], HashedColumnVocabulary('user', 4, n_hashes=2)])
+        save_artifacts(EmbeddingArtifacts.from_weights([self.weights[0], np.random.rand(4, 2)], vocabulary),
+                       ARTIFACTS_DIR)
+        artifacts = load_artifacts(ARTIFACTS_DIR)
+
+        self.assertIsInstance(artifacts.vocabulary['user'], HashedColumnVocabulary)
+        self.assertEqual(artifacts.vocabulary['user'].n_hashes, 2)
+        self.assertTupleEqual(artifacts.get_table('user').shape, (4, 2))
+
+    def test_save_and_load_pruned_column(self):
+        vocabulary = Vocabulary([ColumnVocabulary('A', np.array(['x', 'y']), other=True)])
+        save_artifacts(EmbeddingArtifacts.from_weights([np.random.rand(3, 2)], vocabulary), ARTIFACTS_DIR)
+        artifacts = load_artifacts(ARTIFACTS_DIR)
+
+        self.assertTrue(artifacts.vocabulary['A'].other)
+        self.assertTupleEqual(artifacts.get_table('A').shape, (3, 2))
+
+    def test_save_grown_vocabulary_with_missing_value(self):
+        previous = ColumnVocabulary('A', np.array(['x', np.nan], dtype=object))
+        current = ColumnVocabulary('A', np.array(['x', 'z', np.nan], dtype=object))
+        vocabulary = grow_vocabulary(Vocabulary([previous]), Vocabulary([current]))
+        save_artifacts(EmbeddingArtifacts.from_weights([np.random.rand(3, 2)], vocabulary), ARTIFACTS_DIR)
+
+        with open(os.path.join(ARTIFACTS_DIR, MANIFEST_FILENAME)) as f:
+            column = json.load(f)['columns'][0]
+        self.assertFalse(column['pickled'])
+        self.assertEqual(column['missing_position'], 1)
+
+        values = load_artifacts(ARTIFACTS_DIR).vocabulary['A'].values
+        self.assertEqual(values[0], 'x')
+        self.assertTrue(np.isnan(values[1]))
+        self.assertEqual(values[2], 'z')
+
+
+class TestWarmStart(unittest.TestCase):
+    def setUp(self):
+        self.previous = Vocabulary([ColumnVocabulary('A', np.array(['x', 'y'])),
+                                    ColumnVocabulary('B', np.array([10, 20])),
+                                    ColumnVocabulary('C', np.array(['a']), other=True)])
+
+    def test_grow_vocabulary_keeps_previous_codes(self):
+        current = Vocabulary([ColumnVocabulary('A', np.array(['w', 'y', 'z'])),
+                              ColumnVocabulary('B', np.array([10, 20])),
+                              ColumnVocabulary('C', np.array(['a', 'b']))])
+        vocabulary = grow_vocabulary(self.previous, current)
+
+        self.assertListEqual(vocabulary['A'].values.tolist(), ['x', 'y', 'w', 'z'])
+        self.assertListEqual(vocabulary['A'].transform(np.array(['x', 'y', 'w', 'z'])).tolist(), [0, 1, 2, 3])
+        self.assertIs(vocabulary['B'], self.previous['B'])
+
+        # a pruned column keeps sharing a single embedding for the values it did not keep
+        self.assertIs(vocabulary['C'], self.previous['C'])
+
+    def test_grow_vocabulary_with_new_dtype(self):
+        current = Vocabulary([ColumnVocabulary('A', np.array(['x'])),
+                              ColumnVocabulary('B', np.array(['30'])),
+                              ColumnVocabulary('C', np.array(['a']))])
+        vocabulary = grow_vocabulary(self.previous, current)
+
+        self.assertListEqual(vocabulary['B'].values.tolist(), [10, 20, '30'])
+
+    def test_grow_vocabulary_with_other_columns(self):
+        current = Vocabulary([ColumnVocabulary('A', np.array(['x'])), ColumnVocabulary('B', np.array([10]))])
+        self.assertRaises(ValueError, grow_vocabulary, self.previous, current)
+
+    def test_grow_vocabulary_with_other_hashing(self):
+        previous = Vocabulary([HashedColumnVocabulary('A', 8)])
+        self.assertIs(grow_vocabulary(previous, Vocabulary([HashedColumnVocabulary('A', 8)]))['A'], previous['A'])
+        self.assertRaises(ValueError, grow_vocabulary, previous, Vocabulary([HashedColumnVocabulary('A', 16)]))
+        self.assertRaises(ValueError, grow_vocabulary, previous, Vocabulary([ColumnVocabulary('A', np.array([1]))]))
+
+    def test_grow_table(self):
+        table = np.array([[1, 2], [3, 4]], dtype=np.float32)
+        grown = grow_table(table, 4)
+
+        self.assertEqual(grown.dtype, np.float32)
+        np.testing.assert_array_equal(grown, [[1, 2], [3, 4], [2, 3], [2, 3]])
+
+    def test_get_warm_start_tables(self):
+        weights = [np.random.rand(2, 2), np.random.rand(2, 3), np.random.rand(2, 2)]
+        artifacts = EmbeddingArtifacts.from_weights(weights, self.previous)
+        current = Vocabulary([ColumnVocabulary('A', np.array(['z'])),
+                              ColumnVocabulary('B', np.array([10])),
+                              ColumnVocabulary('C', np.array(['b']))])
+        tables = get_warm_start_tables(artifacts, grow_vocabulary(self.previous, current))
+
+        self.assertListEqual([table.shape for table in tables], [(3, 2), (2, 3), (2, 2)])
+        np.testing.assert_allclose(tables[0][:2], weights[0], rtol=1e-6)
@@ -0,0 +1,130 @@
+import os
+import shutil
+import time
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from entity_embeddings.cache import PreprocessingCache
+from entity_embeddings.cache.cache import fingerprint_file, fingerprint_dataframe, make_cache_key
+from entity_embeddings.config import Config
+from entity_embeddings.encoder import CategoricalEncoder
+from entity_embeddings.util.dataframe_utils import create_random_csv, remove_random_csv, create_random_dataframe
+from entity_embeddings.util.encoding_utils import encode_data
+from entity_embeddings.util.processor_utils import TargetType
+
+CACHE_DIR = 'test_cache'
+
+
+class TestCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = PreprocessingCache(CACHE_DIR)
+
+    def tearDown(self):
+        shutil.rmtree(CACHE_DIR, ignore_errors=True)
+
+    def test_put_and_get(self):
+        X, y, vocabulary = self.make_dataset()
+
+        self.assertIsNone(self.cache.get('key'))
+        self.cache.put('key', X, y, vocabulary, unique_classes=2)
+        entry = self.cache.get('key')
+
+        self.assertIsInstance(entry.X, np.memmap)
+        self.assertListEqual(entry.X.tolist(), X.tolist())
+        self.assertEqual(entry.X.dtype, np.uint8)
+        self.assertListEqual(entry.y.tolist(), y.tolist())
+        self.assertListEqual(entry.vocabulary.names, vocabulary.names)
+        self.assertEqual(entry.n_rows, len(X))
+        self.assertEqual(entry.unique_classes, 2)
+
+    def test_invalidate_and_clear(self):
+        X, y, vocabulary = self.make_dataset()
+        self.cache.put('first', X, y, vocabulary, unique_classes=2)
+        self.cache.put('second', X, y, vocabulary, unique_classes=2)
+
+        self.cache.invalidate('first')
+        self.assertIsNone(self.cache.get('first'))
+        self.assertIsNotNone(self.cache.get('second'))
+
+        self.cache.clear()
+        self.assertIsNone(self.cache.get('second'))
+        self.assertEqual(self.cache.get_size(), 0)
+
+    def test_least_recently_used_is_evicted(self):
+        X, y, vocabulary = self.make_dataset()
+        self.cache.put('first', X, y, vocabulary, unique_classes=2)
+        entry_size = self.cache.get_size()
+        self.cache.max_bytes = 2 * entry_size
+
+        self.cache.put('second', X, y, vocabulary, unique_classes=2)
+        time.sleep(0.01)
+        self.cache.get('first')
+        time.sleep(0.01)
+        self.cache.put('third', X, y, vocabulary, unique_classes=2)
+
+        self.assertIsNotNone(self.cache.get('first'))
+        self.assertIsNone(self.cache.get('second'))
+        self.assertIsNotNone(self.cache.get('third'))
+        self.assertLessEqual(self.cache.get_size(), self.cache.max_bytes)
+
+    def test_failed_put_removes_its_staging_dir(self):
+        X, y, vocabulary = self.make_dataset()
+
+        with mock.patch.object(vocabulary, 'save', side_effect=OSError('no space left on device')):
+            self.assertRaises(OSError, self.cache.put, 'key', X, y, vocabulary, 2)
+
+        self.assertListEqual(os.listdir(CACHE_DIR), [])
+
+    def test_failed_streaming_encoding_removes_its_staging_dir(self):
+        csv_path = create_random_csv(rows=20)
+        config = Config.make_default_config(csv_path, 'D', TargetType.MULTICLASS_CLASSIFICATION, 0.9,
+                                            artifacts_path=CACHE_DIR, chunk_size=3, cache=True)
+
+        with mock.patch('entity_embeddings.util.streaming_utils.encode_csv', side_effect=KeyboardInterrupt):
+            self.assertRaises(KeyboardInterrupt, encode_data, config)
+
+        self.assertListEqual(os.listdir(config.cache.cache_dir), [])
+        remove_random_csv()
+
+    def test_stale_staging_dirs_are_removed(self):
+        X, y, vocabulary = self.make_dataset()
+        stale, recent = self.cache.make_staging_dir(), self.cache.make_staging_dir()
+        os.utime(stale, (0, 0))
+
+        self.cache.put('key', X, y, vocabulary, unique_classes=2)
+
+        self.assertFalse(os.path.exists(stale))
+        self.assertTrue(os.path.exists(recent))
+
+    def test_fingerprint_file_changes_with_content(self):
+        csv_path = create_random_csv()
+        fingerprint = fingerprint_file(csv_path)
+        self.assertEqual(fingerprint, fingerprint_file(csv_path))
+
+        with open(csv_path, 'a') as f:
+            f.write('1,2,3,4\n')
+
+        self.assertNotEqual(fingerprint, fingerprint_file(csv_path))
+        remove_random_csv()
+
+    def test_fingerprint_dataframe(self):
+        df = create_random_dataframe()
+        fingerprint = fingerprint_dataframe(df)
+        self.assertEqual(fingerprint, fingerprint_dataframe(df.copy()))
+
+        df.iloc[0, 0] = 100
+        self.assertNotEqual(fingerprint, fingerprint_dataframe(df))
+
+    def test_make_cache_key(self):
+        key = make_cache_key('fingerprint', target_name='D')
+
+        self.assertEqual(key, make_cache_key('fingerprint', target_name='D'))
+        self.assertNotEqual(key, make_cache_key('fingerprint', target_name='C'))
+        self.assertNotEqual(key, make_cache_key('other', target_name='D'))
+
+    def make_dataset(self):
+        X, vocabulary = CategoricalEncoder().fit_transform([np.arange(100) % 7, np.arange(100) % 3], ['A', 'B'])
+        y = np.arange(100) % 2
+        return X, y, vocabulary
@@ -1,5 +1,9 @@
+import importlib.util
+import os
+import shutil
 import unittest
 from typing import List
+from unittest.mock import patch
 
 import numpy as np
 import pandas as pd
@@ -7,11 +11,18 @@ from keras.engine import Layer
 from keras.layers import Activation, Dense, Concatenate
 from sklearn.preprocessing import LabelEncoder
 
+from entity_embeddings.artifacts import EmbeddingArtifacts, save_artifacts
+from entity_embeddings.artifacts.artifacts import DEFAULT_EMBEDDINGS_DIRNAME
 from entity_embeddings.config import Config, get_embedding_size
+from entity_embeddings.encoder import CategoricalEncoder, ColumnVocabulary, Vocabulary
 from entity_embeddings.network import ModelAssembler
+from entity_embeddings.options import BatchFeeding, EmbeddingBudget, VocabularyOptions
 from entity_embeddings.processor.processor import TargetProcessor
 from entity_embeddings.processor.target_type import TargetType
-from entity_embeddings.util.dataframe_utils import create_random_csv, remove_random_csv
+from entity_embeddings.util import dataframe_utils
+from entity_embeddings.util.dataframe_utils import create_random_csv, remove_random_csv, create_random_dataframe
+
+WARM_START_DIR = 'test_warm_start'
 
 
 class TestConfig(unittest.TestCase):
@@ -42,6 +53,265 @@ class TestConfig(unittest.TestCase):
         self.assertIsNotNone(config)
         remove_random_csv()
 
+    def test_streaming_config(self):
+        random_csv = create_random_csv(rows=20)
+        target = 'D'
+
+        in_memory = Config.make_default_config(csv_path=random_csv,
+                                               target_name=target,
+                                               target_type=TargetType.MULTICLASS_CLASSIFICATION,
+                                               train_ratio=0.9)
+        streaming = Config.make_default_config(csv_path=random_csv,
+                                               target_name=target,
+                                               target_type=TargetType.MULTICLASS_CLASSIFICATION,
+                                               train_ratio=0.9,
+                                               chunk_size=3)
+
+        self.assertIsNone(streaming.df)
+        self.assertEqual(streaming.n_rows, 20)
+        self.assertEqual(streaming.unique_classes, in_memory.unique_classes)
+        self.assertEqual(streaming.model_assembler.n_unique_classes, in_memory.unique_classes)
+        self.assertListEqual([(category.alias, category.unique_values) for category in streaming.categories],
+                             [(category.alias, category.unique_values) for category in in_memory.categories])
+        remove_random_csv()
+
+    def test_streaming_regression_config_skips_classes(self):
+        random_csv = create_random_csv(rows=20)
+
+        streaming = Config.make_default_config(csv_path=random_csv,
+                                               target_name='D',
+                                               target_type=TargetType.REGRESSION,
+                                               train_ratio=0.9,
+                                               chunk_size=3)
+
+        self.assertIsNone(streaming.target_classes)
+        self.assertIsNone(streaming.unique_classes)
+        remove_random_csv()
+
+    def test_default_config_reads_csv_once(self):
+        random_csv = create_random_csv()
+
+        with patch('entity_embeddings.config.load_guarantee_not_empty',
+                   wraps=dataframe_utils.load_guarantee_not_empty) as load:
+            config = Config.make_default_config(csv_path=random_csv,
+                                                target_name='D',
+                                                target_type=TargetType.BINARY_CLASSIFICATION,
+                                                train_ratio=0.9)
+
+        self.assertEqual(load.call_count, 1)
+        self.assertIsNotNone(config.df)
+        remove_random_csv()
+
+    def test_default_config_from_df(self):
+        df = create_random_dataframe()
+
+        config = Config.make_default_config_from_df(df=df,
+                                                    target_name='D',
+                                                    target_type=TargetType.BINARY_CLASSIFICATION,
+                                                    train_ratio=0.9)
+
+        self.assertIs(config.df, df)
+        self.assertIsNone(config.csv_path)
+        self.assertListEqual([category.alias for category in config.categories], ['A', 'B', 'C'])
+
+    def test_hashed_categories(self):
+        config = Config.make_default_config_from_df(df=create_random_dataframe(),
+                                                    target_name='D',
+                                                    target_type=TargetType.BINARY_CLASSIFICATION,
+                                                    train_ratio=0.9,
+                                                    vocabulary_options=VocabularyOptions({'A': 1000}, n_hashes=2))
+
+        self.assertEqual(config.categories[0].unique_values, 1000)
+        self.assertEqual(config.categories[0].n_hashes, 2)
+        self.assertEqual(config.categories[0].embedding_size, get_embedding_size(1000))
+        self.assertEqual(config.categories[1].n_hashes, 1)
+
+    def test_pruned_categories(self):
+        df = pd.DataFrame({'A': ['a', 'a', 'b', 'c', 'a', 'b'], 'B': [1, 2, 3, 4, 5, 6], 'D': [0, 1, 0, 1, 0, 1]})
+        config = Config.make_default_config_from_df(df=df,
+                                                    target_name='D',
+                                                    target_type=TargetType.BINARY_CLASSIFICATION,
+                                                    train_ratio=0.9,
+                                                    vocabulary_options=VocabularyOptions(min_frequency=2))
+
+        # the values kept plus the one shared by the others
+        self.assertListEqual([category.unique_values for category in config.categories], [3, 1])
+        _, vocabulary = config.get_encoder().fit_transform([df['A'].values, df['B'].values], ['A', 'B'])
+        self.assertListEqual([len(column) for column in vocabulary], [3, 1])
+
+    def test_parallel_categories(self):
+        df = create_random_dataframe()
+        config = Config.make_default_config_from_df(df=df,
+                                                    target_name='D',
+                                                    target_type=TargetType.BINARY_CLASSIFICATION,
+                                                    train_ratio=0.9,
+                                                    vocabulary_options=VocabularyOptions(workers=2))
+
+        self.assertListEqual([category.alias for category in config.categories], ['A', 'B', 'C'])
+        self.assertListEqual([category.unique_values for category in config.categories],
+                             [df[column].nunique() for column in 'ABC'])
+        self.assertEqual(config.get_encoder().workers, 2)
+
+    def test_embedding_budget(self):
+        df = pd.DataFrame({'A': np.arange(200) % 100, 'B': np.arange(200) % 10, 'D': np.arange(200) % 2})
+        config = Config.make_default_config_from_df(df=df,
+                                                    target_name='D',
+                                                    target_type=TargetType.BINARY_CLASSIFICATION,
+                                                    train_ratio=0.9,
+                                                    embedding_budget=EmbeddingBudget(max_parameters=20000))
+
+        self.assertLessEqual(config.embedding_plan.parameters, 20000)
+        self.assertListEqual([category.embedding_size for category in config.categories], config.embedding_plan.sizes)
+        self.assertLess(config.categories[0].embedding_size, get_embedding_size(100))
+
+        self.assertRaises(ValueError, Config.make_default_config_from_df, df=df, target_name='D',
+                          target_type=TargetType.BINARY_CLASSIFICATION, train_ratio=0.9,
+                          embedding_budget=EmbeddingBudget(max_parameters=100))
+
+    def test_embedding_budget_counts_the_optimizer_of_the_assembler(self):
+        df = pd.DataFrame({'A': np.arange(200) % 100, 'B': np.arange(200) % 10, 'D': np.arange(200) % 2})
+        assembler = CustomAssembler()
+        assembler.optimizer = 'sgd'
+
+        config = Config.make_custom_config_from_df(df=df,
+                                                   target_name='D',
+                                                   train_ratio=0.9,
+                                                   target_processor=CustomProcessor(),
+                                                   model_assembler=assembler,
+                                                   embedding_budget=EmbeddingBudget(max_memory_bytes=10 ** 6))
+
+        self.assertEqual(config.embedding_plan.optimizer, 'sgd')
+
+    def test_warm_start(self):
+        vocabulary = Vocabulary([ColumnVocabulary('A', np.array(['x', 'y'])), ColumnVocabulary('B', np.array([1, 2]))])
+        weights = [np.random.rand(2, 3), np.random.rand(2, 4)]
+        save_artifacts(EmbeddingArtifacts.from_weights(weights, vocabulary),
+                       os.path.join(WARM_START_DIR, DEFAULT_EMBEDDINGS_DIRNAME))
+        try:
+            df = pd.DataFrame({'A': ['z', 'y', 'x', 'z'], 'B': [1, 2, 1, 2], 'D': [0, 1, 0, 1]})
+            config = Config.make_default_config_from_df(df=df,
+                                                        target_name='D',
+                                                        target_type=TargetType.BINARY_CLASSIFICATION,
+                                                        train_ratio=0.9,
+                                                        warm_start_path=WARM_START_DIR)
+
+            self.assertListEqual(config.vocabulary['A'].values.tolist(), ['x', 'y', 'z'])
+            self.assertListEqual([category.unique_values for category in config.categories], [3, 2])
+
+            # the embedding sizes are the ones learned by the previous run
+            self.assertListEqual([category.embedding_size for category in config.categories], [3, 4])
+
+            tables = config.get_warm_start_tables()
+            np.testing.assert_allclose(tables[0][:2], weights[0], rtol=1e-6)
+            np.testing.assert_allclose(tables[1], weights[1], rtol=1e-6)
+
+            self.assertRaises(ValueError, Config.make_default_config_from_df, df=df, target_name='D',
+                              target_type=TargetType.BINARY_CLASSIFICATION, train_ratio=0.9,
+                              warm_start_path=WARM_START_DIR, embedding_budget=EmbeddingBudget(max_parameters=1000))
+        finally:
+            shutil.rmtree(WARM_START_DIR, ignore_errors=True)
+
+    def test_custom_config_from_df(self):
+        config = Config.make_custom_config_from_df(df=create_random_dataframe(),
+                                                   target_name='D',
+                                                   train_ratio=0.9,
+                                                   target_processor=CustomProcessor(),
+                                                   model_assembler=CustomAssembler())
+
+        self.assertEqual(len(config.categories), 3)
+
+    def test_grouped_options(self):
+        df = create_random_dataframe()
+        config = Config.make_custom_config_from_df(df=df,
+                                                   target_name='D',
+                                                   train_ratio=0.9,
+                                                   target_processor=CustomProcessor(),
+                                                   model_assembler=CustomAssembler(),
+                                                   batch_feeding=BatchFeeding(workers=2))
+
+        self.assertEqual(config.get_batch_feeding().workers, 2)
+        self.assertIsNone(config.training_control.early_stopping_patience)
+        self.assertEqual(config.sampling, 'bootstrap')
+
+        # the optional arguments are only given by keyword
+        self.assertRaises(TypeError, Config, None, 'D', 0.9, CustomProcessor(), CustomAssembler(), 10, 128, False,
+                          'artifacts', None, df)
+
+    def test_default_config_from_arrays(self):
+        X = np.array([[0, 2], [1, 0], [0, 1]])
+        y = np.array([1, 0, 1])
+
+        config = Config.make_default_config_from_arrays(X=X,
+                                                        y=y,
+                                                        target_type=TargetType.BINARY_CLASSIFICATION,
+                                                        train_ratio=0.9,
+                                                        feature_names=['store', 'day'])
+
+        self.assertTrue(config.encoded)
+        self.assertEqual(config.target_name, 'target')
+        self.assertListEqual([(category.alias, category.unique_values) for category in config.categories],
+                             [('store', 2), ('day', 3)])
+
+    def test_streaming_config_from_df(self):
+        self.assertRaises(ValueError, Config.make_default_config_from_df,
+                          df=create_random_dataframe(),
+                          target_name='D',
+                          target_type=TargetType.BINARY_CLASSIFICATION,
+                          train_ratio=0.9,
+                          chunk_size=2)
+
+    @unittest.skipUnless(importlib.util.find_spec('pyarrow'), 'pyarrow is not installed')
+    def test_default_config_from_parquet_with_projection(self):
+        df = create_random_dataframe(rows=10)
+        df['A'] = ['store_%d' % value for value in df['A']]
+
+        os.makedirs('test_parquet', exist_ok=True)
+        parquet_path = os.path.join('test_parquet', 'data.parquet')
+        df.to_parquet(parquet_path)
+
+        config = Config.make_default_config(csv_path=parquet_path,
+                                            target_name='D',
+                                            target_type=TargetType.BINARY_CLASSIFICATION,
+                                            train_ratio=0.9,
+                                            feature_names=['A', 'C'])
+        shutil.rmtree('test_parquet')
+
+        self.assertEqual(''.join(list(config.df)), 'ACD')
+        self.assertListEqual([(category.alias, category.unique_values) for category in config.categories],
+                             [('A', df['A'].nunique()), ('C', df['C'].nunique())])
+
+    def test_cached_config_does_not_read_data(self):
+        random_csv = create_random_csv(rows=10)
+        artifacts_path = 'test_cached_config'
+
+        first = Config.make_default_config(csv_path=random_csv,
+                                           target_name='D',
+                                           target_type=TargetType.BINARY_CLASSIFICATION,
+                                           train_ratio=0.9,
+                                           artifacts_path=artifacts_path,
+                                           cache=True)
+        self.assertIsNone(first.cache_entry)
+
+        X, vocabulary = CategoricalEncoder().fit_transform([first.df[column].values for column in 'ABC'], list('ABC'))
+        first.cache.put(first.cache_key, X, first.df['D'].values, vocabulary, first.unique_classes)
+
+        with patch('entity_embeddings.config.load_guarantee_not_empty') as load:
+            second = Config.make_default_config(csv_path=random_csv,
+                                                target_name='D',
+                                                target_type=TargetType.BINARY_CLASSIFICATION,
+                                                train_ratio=0.9,
+                                                artifacts_path=artifacts_path,
+                                                cache=True)
+
+        self.assertEqual(load.call_count, 0)
+        self.assertIsNotNone(second.cache_entry)
+        self.assertEqual(second.unique_classes, first.unique_classes)
+        self.assertListEqual([(category.alias, category.unique_values) for category in second.categories],
+                             [(category.alias, category.unique_values) for category in first.categories])
+
+        shutil.rmtree(artifacts_path)
+        remove_random_csv()
+
     def test_embedding_size(self):
         embedding_1 = get_embedding_size(10)
         self.assertEqual(embedding_1, 5)
@@ -0,0 +1,124 @@
+import os
+import shutil
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+
+from entity_embeddings.artifacts import load_artifacts
+from entity_embeddings.config import Config
+from entity_embeddings.processor.target_type import TargetType
+from entity_embeddings.search import CrossValidation
+from entity_embeddings.search.cross_validation import align_table, average_tables, check_cross_validation, get_folds
+from entity_embeddings.util.dataframe_utils import create_random_dataframe
+
+ARTIFACTS_DIR = 'test_cross_validation'
+
+
+def make_rotation(seed):
+    return np.linalg.qr(np.random.RandomState(seed).normal(size=(2, 2)))[0]
+
+
+def fake_trial(parameters, cache_path, candidate, epochs, return_tables=False):
+    # each fold is scored by its first validation row, and learns the same tables rotated by a rotation of its own
+    first_row = int(candidate['validation_rows'][0])
+    summary = {'epochs': epochs, 'best_epoch': epochs - 1, 'best_value': float(first_row), 'seconds': 0.5}
+    if return_tables:
+        rotation = make_rotation(first_row)
+        summary['tables'] = [np.random.RandomState(index).normal(size=(category_values, 2)).dot(rotation)
+                             for index, category_values in enumerate(parameters['category_values'])]
+
+    return summary
+
+
+class TestCrossValidation(unittest.TestCase):
+    def setUp(self):
+        self.df = create_random_dataframe()
+
+    def tearDown(self):
+        shutil.rmtree(ARTIFACTS_DIR, ignore_errors=True)
+
+    def make_config(self, **kwargs) -> Config:
+        return Config.make_default_config_from_df(df=self.df,
+                                                  target_name='D',
+                                                  target_type=TargetType.BINARY_CLASSIFICATION,
+                                                  train_ratio=0.9,
+                                                  epochs=3,
+                                                  artifacts_path=ARTIFACTS_DIR,
+                                                  **kwargs)
+
+    def test_get_folds(self):
+        folds = get_folds(10, 3)
+
+        self.assertListEqual([fold.tolist() for fold in folds], [[0, 1, 2, 3], [4, 5, 6], [7, 8, 9]])
+
+    def test_get_shuffled_folds(self):
+        folds = get_folds(10, 3, shuffle=True, seed=0)
+
+        self.assertListEqual(sorted(np.concatenate(folds).tolist()), list(range(10)))
+        self.assertTrue(all(np.all(np.diff(fold) > 0) for fold in folds))
+        self.assertListEqual([fold.tolist() for fold in get_folds(10, 3, shuffle=True, seed=0)],
+                             [fold.tolist() for fold in folds])
+
+    def test_align_table(self):
+        reference = np.random.RandomState(0).normal(size=(5, 2))
+
+        np.testing.assert_allclose(align_table(reference.dot(make_rotation(1)), reference), reference, atol=1e-8)
+        np.testing.assert_allclose(align_table(-reference, reference), reference, atol=1e-8)
+
+    def test_average_tables(self):
+        reference = np.random.RandomState(0).normal(size=(5, 2))
+        noise = np.random.RandomState(1).normal(scale=0.01, size=(5, 2))
+
+        tables = average_tables([[reference, np.ones((3, 1))],
+                                 [(reference + noise).dot(make_rotation(2)), np.full((3, 1), 3.0)]])
+
+        np.testing.assert_allclose(tables[0], reference + noise / 2, atol=1e-2)
+        np.testing.assert_array_equal(tables[1], np.full((3, 1), 2.0))
+
+    def test_cross_validation_without_cache(self):
+        self.assertRaises(ValueError, CrossValidation, self.make_config())
+
+    @patch('entity_embeddings.search.search.run_trial', side_effect=fake_trial)
+    def test_cross_validation(self, run_trial):
+        cross_validation = CrossValidation(self.make_config(cache=True), n_folds=4)
+        results = cross_validation.run()
+
+        self.assertEqual(run_trial.call_count, 4)
+        self.assertListEqual(results['fold'].tolist(), [0, 1, 2, 3])
+        self.assertEqual(results['validation_rows'].sum(), len(self.df))
+
+        summary = cross_validation.get_summary()
+        self.assertEqual(summary['folds'], 4)
+        self.assertAlmostEqual(summary['mean'], results['best_value'].mean())
+        self.assertAlmostEqual(summary['seconds'], 2.0)
+
+    def test_summary_before_running(self):
+        self.assertRaises(ValueError, CrossValidation(self.make_config(cache=True)).get_summary)
+
+    def test_average_embeddings(self):
+        config = self.make_config(cache=True)
+        category_values = [category.unique_values for category in config.categories]
+
+        def fake_trial_with_categories(parameters, *args):
+            return fake_trial(dict(parameters, category_values=category_values), *args)
+
+        with patch('entity_embeddings.search.search.run_trial', side_effect=fake_trial_with_categories):
+            cross_validation = CrossValidation(config, n_folds=2, average_embeddings=True)
+            cross_validation.run()
+
+        artifacts = load_artifacts(config.get_embeddings_dir())
+        self.assertTrue(os.path.exists(config.get_embeddings_dir()))
+        self.assertListEqual([len(table) for table in artifacts.tables], category_values)
+
+        # the tables of the 2 folds only differ by a rotation, so their average is the tables of the first fold
+        expected = np.random.RandomState(0).normal(size=(category_values[0], 2)).dot(make_rotation(0))
+        np.testing.assert_allclose(artifacts.tables[0], expected, atol=1e-5)
+
+    def test_check_cross_validation(self) -> None:
+        check_cross_validation(object(), 5, 2, None)
+        self.assertRaises(ValueError, check_cross_validation, None, 5, 1, None)
+        self.assertRaises(ValueError, check_cross_validation, object(), 1, 1, None)
+        self.assertRaises(ValueError, check_cross_validation, object(), 5, 0, None)
+        self.assertRaises(ValueError, check_cross_validation, object(), 5, 1, 0)
+        self.assertRaises(ValueError, check_cross_validation, object(), 5, 2, None, lambda epoch, lr: lr)
@@ -1,10 +1,14 @@
+import importlib.util
 import os
+import shutil
 import unittest
 
 import pandas as pd
 
+import numpy as np
+
 from entity_embeddings.util.dataframe_utils import create_random_dataframe, create_random_csv, remove_random_csv, \
-    get_all_columns_except
+    get_all_columns_except, make_dataframe_from_arrays, load_guarantee_not_empty, read_chunks, get_columns_to_load
 from entity_embeddings.util.validation_utils import check_not_empty_dataframe
 
 
@@ -48,6 +52,103 @@ class TestDataframeUtils(unittest.TestCase):
         df = get_all_columns_except(df, to_remove)
         self.assertEqual(''.join(list(df)), columns.replace(to_remove, ''))
 
+    def test_make_dataframe_from_arrays(self):
+        X = np.array([[0, 1], [1, 0]])
+        y = np.array([5, 6])
+
+        df = make_dataframe_from_arrays(X, y)
+
+        self.assertEqual(''.join(list(df)), 'feature_0feature_1target')
+        self.assertListEqual(df['target'].tolist(), [5, 6])
+        self.assertListEqual(df['feature_1'].tolist(), [1, 0])
+
+    def test_get_columns_to_load(self):
+        self.assertIsNone(get_columns_to_load(None, 'D'))
+        self.assertListEqual(get_columns_to_load(['A', 'B'], 'D'), ['A', 'B', 'D'])
+
+    def test_load_csv_with_projection(self):
+        csv_path = create_random_csv(rows=5, cols=4, columns='ABCD')
+
+        df = load_guarantee_not_empty(csv_path, columns=['B', 'D'], target_name='D')
+        remove_random_csv()
+
+        self.assertEqual(''.join(list(df)), 'BD')
+
+    @unittest.skipUnless(importlib.util.find_spec('pyarrow'), 'pyarrow is not installed')
+    def test_load_columnar_formats(self):
+        import pyarrow
+
+        df = self.__make_string_dataframe()
+        table = pyarrow.Table.from_pandas(df, preserve_index=False)
+        paths = self.__write_columnar_files(table)
+
+        for path in paths:
+            loaded = load_guarantee_not_empty(path, columns=['A', 'D'], target_name='D')
+
+            self.assertEqual(''.join(list(loaded)), 'AD')
+            self.assertIsInstance(loaded['A'].dtype, pd.CategoricalDtype)
+            self.assertListEqual(loaded['A'].astype(str).tolist(), df['A'].tolist())
+            self.assertListEqual(loaded['D'].tolist(), df['D'].tolist())
+
+        shutil.rmtree('test_columnar')
+
+    @unittest.skipUnless(importlib.util.find_spec('pyarrow'), 'pyarrow is not installed')
+    def test_read_chunks_columnar_formats(self):
+        import pyarrow
+
+        df = self.__make_string_dataframe()
+        table = pyarrow.Table.from_pandas(df, preserve_index=False)
+        paths = self.__write_columnar_files(table)
+
+        for path in paths:
+            chunks = list(read_chunks(path, chunk_size=3, columns=['A', 'D'], target_name='D'))
+
+            self.assertListEqual([len(chunk) for chunk in chunks], [3, 3, 3, 1])
+            self.assertListEqual(pd.concat(chunks)['D'].tolist(), df['D'].tolist())
+
+        shutil.rmtree('test_columnar')
+
+    @unittest.skipUnless(importlib.util.find_spec('pyarrow'), 'pyarrow is not installed')
+    def test_load_arrow_stream(self):
+        import pyarrow
+
+        df = self.__make_string_dataframe()
+        table = pyarrow.Table.from_pandas(df, preserve_index=False)
+        os.makedirs('test_columnar', exist_ok=True)
+        path = os.path.join('test_columnar', 'data.arrow')
+        with pyarrow.ipc.new_stream(path, table.schema) as writer:
+            writer.write_table(table, max_chunksize=4)
+
+        loaded = load_guarantee_not_empty(path, columns=['A', 'D'], target_name='D')
+        chunks = list(read_chunks(path, chunk_size=3, columns=['A', 'D'], target_name='D'))
+
+        self.assertEqual(''.join(list(loaded)), 'AD')
+        self.assertListEqual(loaded['D'].tolist(), df['D'].tolist())
+        self.assertListEqual([len(chunk) for chunk in chunks], [3, 1, 3, 1, 2])
+        self.assertEqual(''.join(list(chunks[0])), 'AD')
+
+        shutil.rmtree('test_columnar')
+
+    def __make_string_dataframe(self) -> pd.DataFrame:
+        df = create_random_dataframe(rows=10, cols=4, columns='ABCD')
+        df['A'] = ['store_%d' % value for value in df['A']]
+        return df
+
+    def __write_columnar_files(self, table) -> list:
+        import pyarrow
+        import pyarrow.feather
+        import pyarrow.parquet
+
+        os.makedirs('test_columnar', exist_ok=True)
+        paths = [os.path.join('test_columnar', name) for name in ('data.parquet', 'data.feather', 'data.arrow')]
+
+        pyarrow.parquet.write_table(table, paths[0])
+        pyarrow.feather.write_feather(table, paths[1])
+        with pyarrow.ipc.new_file(paths[2], table.schema) as writer:
+            writer.write_table(table)
+
+        return paths
+
     def __check_dataframe_data(self, df: pd.DataFrame, rows: int, cols: int, columns: str) -> None:
         self.assertEqual(df.shape[0], rows)
         self.assertEqual(df.shape[1], cols)
@@ -1,12 +1,13 @@
 import shutil
 import unittest
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 
 import numpy as np
 import os
 
 from entity_embeddings.config import Config
 from entity_embeddings.embedder import Embedder
+from entity_embeddings.options import SamplingOptions
 from entity_embeddings.processor.target_type import TargetType
 from entity_embeddings.util.dataframe_utils import create_random_csv, remove_random_csv
 
@@ -48,3 +49,43 @@ class TestEmbedder(unittest.TestCase):
                                             train_ratio=0.9)
 
         return config
+
+
+class TestEmbedderPreparation(unittest.TestCase):
+    def tearDown(self):
+        remove_random_csv()
+
+    @patch('entity_embeddings.embedder.EmbeddingNetwork')
+    def test_training_rows_are_sampled(self, _):
+        for sampling, expected in (('bootstrap', 1000), ('uniform', 2), ('none', 3)):
+            size = 1000 if sampling == 'bootstrap' else 2
+            config = Config.make_default_config(csv_path=create_random_csv(),
+                                                target_name='D',
+                                                target_type=TargetType.BINARY_CLASSIFICATION,
+                                                train_ratio=0.9,
+                                                sampling_options=SamplingOptions(sampling, size))
+
+            self.assertEqual(len(Embedder(config).X_train), expected)
+
+    @patch('entity_embeddings.embedder.EmbeddingNetwork')
+    def test_validation_rows(self, _):
+        config = Config.make_default_config(csv_path=create_random_csv(),
+                                            target_name='D',
+                                            target_type=TargetType.BINARY_CLASSIFICATION,
+                                            train_ratio=0.9,
+                                            sampling_options=SamplingOptions('none'),
+                                            validation_rows=np.array([0, 2]))
+        embedder = Embedder(config)
+
+        self.assertEqual(len(embedder.X_val), 2)
+        self.assertEqual(len(embedder.X_train), len(config.df) - 2)
+
+    @patch('entity_embeddings.embedder.EmbeddingNetwork')
+    def test_stages_are_timed(self, _):
+        config = Config.make_default_config(csv_path=create_random_csv(),
+                                            target_name='D',
+                                            target_type=TargetType.BINARY_CLASSIFICATION,
+                                            train_ratio=0.9)
+
+        self.assertListEqual(list(Embedder(config).timer.timings),
+                             ['load_data', 'generate_categories', 'build_network', 'prepare_data'])
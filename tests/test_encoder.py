@@ -0,0 +1,256 @@
+import os
+import shutil
+import sys
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+import numpy as np
+import pandas as pd
+
+from entity_embeddings.encoder import CategoricalEncoder, HashedColumnVocabulary, Vocabulary, get_code_dtype
+from entity_embeddings.encoder.encoder import get_kept_values
+from entity_embeddings.encoder.hashing import check_hashing, get_hash_buckets, hash_values
+from entity_embeddings.encoder.parallel import can_fork, map_columns
+from entity_embeddings.util import dataframe_utils
+from entity_embeddings.util.preprocessing_utils import get_X_y_columnar, label_encode_columns
+
+
+def get_length(column: np.ndarray, index: int) -> int:
+    return len(column)
+
+
+class TestEncoder(unittest.TestCase):
+    def test_codes_match_label_encoder(self):
+        df = dataframe_utils.create_random_dataframe(rows=20, cols=4, columns='ABCD')
+        X_columns, _ = get_X_y_columnar(df, 'D')
+
+        expected, labels = label_encode_columns(X_columns)
+        data_encoded, vocabulary = CategoricalEncoder().fit_transform(X_columns, ['A', 'B', 'C'])
+
+        self.assertListEqual(data_encoded.tolist(), expected.tolist())
+        for label, column_vocabulary in zip(labels, vocabulary):
+            self.assertListEqual(label.classes_.tolist(), column_vocabulary.classes_.tolist())
+
+    def test_mixed_columns_are_not_coerced(self):
+        columns = [np.array([3, 1, 3, 2]), np.array(['b', 'a', 'b', 'b'], dtype=object)]
+
+        data_encoded, vocabulary = CategoricalEncoder().fit_transform(columns, ['number', 'text'])
+
+        self.assertListEqual(data_encoded.tolist(), [[2, 1], [0, 0], [2, 1], [1, 1]])
+        self.assertEqual(vocabulary['number'].values.dtype.kind, 'i')
+        self.assertListEqual(vocabulary['text'].values.tolist(), ['a', 'b'])
+
+    def test_missing_values_have_their_own_code(self):
+        columns = [np.array([1.0, np.nan, 2.0, np.nan])]
+
+        data_encoded, vocabulary = CategoricalEncoder().fit_transform(columns, ['A'])
+
+        self.assertListEqual(data_encoded[:, 0].tolist(), [0, 2, 1, 2])
+        self.assertEqual(len(vocabulary['A']), 3)
+
+    def test_categorical_columns(self):
+        column = pd.Categorical(['b', 'a', 'b'], categories=['b', 'a', 'unused'])
+
+        data_encoded, vocabulary = CategoricalEncoder().fit_transform([column], ['A'])
+
+        # categoricals keep the order of their categories, dropping the unused ones
+        self.assertListEqual(data_encoded[:, 0].tolist(), [0, 1, 0])
+        self.assertListEqual(vocabulary['A'].values.tolist(), ['b', 'a'])
+
+    def test_transform_unknown_values(self):
+        encoder = CategoricalEncoder()
+        _, vocabulary = encoder.fit_transform([np.array(['a', 'b'], dtype=object)], ['A'])
+
+        self.assertRaises(ValueError, encoder.transform, [np.array(['b', 'c'], dtype=object)], vocabulary)
+
+        # a pruned vocabulary encodes them with its other code instead
+        pruned = CategoricalEncoder(max_vocabulary_size=1)
+        _, vocabulary = pruned.fit_transform([np.array(['a', 'b', 'b'], dtype=object)], ['A'])
+        data_encoded = pruned.transform([np.array(['b', 'c'], dtype=object)], vocabulary)
+
+        self.assertListEqual(data_encoded[:, 0].tolist(), [0, 1])
+
+    def test_save_and_load(self):
+        columns = [np.array([3, 1, 3]), np.array(['b', 'a', 'c'], dtype=object)]
+        _, vocabulary = CategoricalEncoder().fit_transform(columns, ['number', 'text'])
+
+        path = 'test_vocabulary'
+        os.makedirs(path, exist_ok=True)
+        vocabulary.save(os.path.join(path, 'vocabulary.npz'))
+        loaded = Vocabulary.load(os.path.join(path, 'vocabulary.npz'))
+        shutil.rmtree(path)
+
+        self.assertListEqual(loaded.names, vocabulary.names)
+        for column, loaded_column in zip(vocabulary, loaded):
+            self.assertListEqual(column.values.tolist(), loaded_column.values.tolist())
+        self.assertListEqual(loaded['text'].transform(np.array(['c', 'a'])).tolist(), [2, 0])
+
+    def test_codes_use_narrowest_dtype(self):
+        columns = [np.arange(300) % 3, np.arange(300)]
+        data_encoded, vocabulary = CategoricalEncoder().fit_transform(columns, ['A', 'B'])
+
+        self.assertEqual(data_encoded.dtype, np.uint16)
+        self.assertListEqual(data_encoded[:, 1].tolist(), list(range(300)))
+        self.assertEqual(CategoricalEncoder().transform(columns, vocabulary).dtype, np.uint16)
+
+    def test_code_dtype(self):
+        self.assertEqual(get_code_dtype(256), np.uint8)
+        self.assertEqual(get_code_dtype(257), np.uint16)
+        self.assertEqual(get_code_dtype(65537), np.int32)
+        self.assertEqual(get_code_dtype(128, signed=True), np.int8)
+        self.assertEqual(get_code_dtype(129, signed=True), np.int16)
+
+    def test_hashed_columns_learn_no_vocabulary(self):
+        columns = [np.array(['a', 'b', 'a']), np.arange(3) * 1000]
+        data_encoded, vocabulary = CategoricalEncoder({'B': 16}).fit_transform(columns, ['A', 'B'])
+
+        self.assertIsInstance(vocabulary['B'], HashedColumnVocabulary)
+        self.assertEqual(len(vocabulary['B']), 16)
+        self.assertTrue(np.all(data_encoded[:, 1] < 16))
+        self.assertListEqual(data_encoded[:, 1].tolist(), (hash_values(columns[1]) % 16).tolist())
+        self.assertEqual(data_encoded.dtype, np.uint8)
+
+    def test_hashed_values_do_not_depend_on_dtype(self):
+        typed = hash_values(np.array([10, 20]))
+        mixed = hash_values(np.array([10, '20'], dtype=object))
+        missing = hash_values(np.array([None, np.nan, 'x'], dtype=object))
+
+        self.assertListEqual(typed.tolist(), mixed.tolist())
+        self.assertEqual(missing[0], missing[1])
+        self.assertNotEqual(missing[0], missing[2])
+
+    def test_hashed_integral_floats_match_integers(self):
+        integers = hash_values(np.array([10, 20, 30]))
+        floats = hash_values(np.array([10.0, np.nan, 20.0, 30.5]))
+        mixed = hash_values(np.array([np.float64(10), 20.0, '30'], dtype=object))
+
+        self.assertListEqual(floats[[0, 2]].tolist(), integers[:2].tolist())
+        self.assertListEqual(mixed.tolist(), integers.tolist())
+        self.assertEqual(floats[1], hash_values(np.array([None], dtype=object))[0])
+        self.assertNotEqual(floats[3], integers[2])
+
+    def test_multiple_hashes_encode_fingerprints(self):
+        column = np.array(['a', 'b', 'c'])
+        data_encoded, vocabulary = CategoricalEncoder({'A': 10}, n_hashes=3).fit_transform([column], ['A'])
+
+        self.assertEqual(data_encoded.dtype, np.int32)
+        buckets = vocabulary['A'].get_buckets(data_encoded[:, 0])
+        self.assertTupleEqual(buckets.shape, (3, 3))
+        self.assertTrue(np.all(buckets < 10))
+        self.assertListEqual(buckets[:, 0].tolist(), (hash_values(column) % 10).tolist())
+        np.testing.assert_array_equal(buckets, get_hash_buckets(hash_values(column), 10, 3))
+
+    def test_partial_fit_with_hashed_columns(self):
+        encoder = CategoricalEncoder({'B': 8}, n_hashes=2)
+        encoder.partial_fit([np.array(['a', 'b']), np.array([1, 2])], ['A', 'B'])
+        encoder.partial_fit([np.array(['c']), np.array([3])], ['A', 'B'])
+        vocabulary = encoder.get_vocabulary()
+
+        self.assertListEqual(vocabulary['A'].values.tolist(), ['a', 'b', 'c'])
+        self.assertEqual(vocabulary['B'].n_hashes, 2)
+        self.assertRaises(ValueError, vocabulary['B'].inverse_transform, np.array([0]))
+
+    def test_save_and_load_hashed_columns(self):
+        _, vocabulary = CategoricalEncoder({'B': 8}, n_hashes=2).fit_transform(
+            [np.array(['a', 'b']), np.array([1, 2])], ['A', 'B'])
+
+        path = 'test_hashed_vocabulary'
+        os.makedirs(path, exist_ok=True)
+        vocabulary.save(os.path.join(path, 'vocabulary.npz'))
+        loaded = Vocabulary.load(os.path.join(path, 'vocabulary.npz'))
+        shutil.rmtree(path)
+
+        self.assertIsInstance(loaded['B'], HashedColumnVocabulary)
+        self.assertEqual((loaded['B'].n_buckets, loaded['B'].n_hashes), (8, 2))
+        self.assertListEqual(loaded['A'].values.tolist(), ['a', 'b'])
+
+    def test_rare_values_share_a_code(self):
+        column = np.array(['a', 'b', 'a', 'c', 'a', 'b', None], dtype=object)
+        data_encoded, vocabulary = CategoricalEncoder(min_frequency=2).fit_transform([column], ['A'])
+
+        self.assertListEqual(vocabulary['A'].values.tolist(), ['a', 'b'])
+        self.assertEqual(len(vocabulary['A']), 3)
+        self.assertListEqual(data_encoded[:, 0].tolist(), [0, 1, 0, 2, 0, 1, 2])
+        self.assertListEqual(vocabulary['A'].transform(np.array(['b', 'unseen'], dtype=object)).tolist(), [1, 2])
+        self.assertListEqual(vocabulary['A'].inverse_transform(np.array([0, 2])).tolist(), ['a', '<other>'])
+
+    def test_max_vocabulary_size_keeps_most_frequent(self):
+        column = np.array(['a', 'b', 'b', 'c', 'c', 'c'])
+        data_encoded, vocabulary = CategoricalEncoder(max_vocabulary_size=2).fit_transform([column], ['A'])
+
+        self.assertListEqual(vocabulary['A'].values.tolist(), ['b', 'c'])
+        self.assertListEqual(data_encoded[:, 0].tolist(), [2, 0, 0, 1, 1, 1])
+
+    def test_kept_values(self):
+        counts = np.array([5, 1, 3, 3])
+
+        self.assertListEqual(get_kept_values(counts, min_frequency=3).tolist(), [True, False, True, True])
+        self.assertListEqual(get_kept_values(counts, max_vocabulary_size=2).tolist(), [True, False, True, False])
+        self.assertListEqual(get_kept_values(counts, 4, 2).tolist(), [True, False, False, False])
+
+    def test_pruned_partial_fit_matches_fit_transform(self):
+        column = np.array([3, 1, 3, 2, 2, 3, 5, np.nan, np.nan])
+        _, expected = CategoricalEncoder(min_frequency=2).fit_transform([column], ['A'])
+
+        encoder = CategoricalEncoder(min_frequency=2)
+        for start in range(0, len(column), 4):
+            encoder.partial_fit([column[start:start + 4]], ['A'])
+        vocabulary = encoder.get_vocabulary()
+
+        np.testing.assert_array_equal(vocabulary['A'].values, expected['A'].values)
+        self.assertTrue(vocabulary['A'].other)
+
+    def test_parallel_encoding_matches_serial(self):
+        df = dataframe_utils.create_random_dataframe(1000, 6, 'ABCDEF')
+        df['A'] = df['A'].astype(str)
+        columns = [df[column].values for column in df.columns]
+        names = list(df.columns)
+        expected, expected_vocabulary = CategoricalEncoder(hashed_buckets={'B': 16}).fit_transform(columns, names)
+
+        for use_multiprocessing in (False, True):
+            encoder = CategoricalEncoder(hashed_buckets={'B': 16}, workers=3, use_multiprocessing=use_multiprocessing)
+            data_encoded, vocabulary = encoder.fit_transform(columns, names)
+
+            np.testing.assert_array_equal(data_encoded, expected)
+            self.assertListEqual([column.name for column in vocabulary], names)
+            np.testing.assert_array_equal(vocabulary['A'].values, expected_vocabulary['A'].values)
+
+    def test_map_columns_keeps_order(self):
+        columns = [np.arange(size) for size in range(1, 8)]
+
+        self.assertListEqual(map_columns(get_length, columns), list(range(1, 8)))
+        self.assertListEqual(map_columns(get_length, columns, workers=4), list(range(1, 8)))
+        self.assertListEqual(map_columns(get_length, columns, workers=4, use_multiprocessing=True), list(range(1, 8)))
+
+    def test_concurrent_map_columns(self):
+        # the callers run on threads of their own, so the worker processes are spawned instead of forked
+        columns = [[np.arange(size) for size in range(start, start + 4)] for start in (1, 10)]
+        with ThreadPoolExecutor(2) as executor:
+            results = list(executor.map(lambda caller: map_columns(get_length, caller, 2, True), columns))
+
+        self.assertListEqual(results, [[1, 2, 3, 4], [10, 11, 12, 13]])
+
+    def test_cannot_fork_after_keras(self):
+        with mock.patch.dict(sys.modules, keras=mock.MagicMock()):
+            self.assertFalse(can_fork())
+
+    def test_save_and_load_pruned_columns(self):
+        _, vocabulary = CategoricalEncoder(min_frequency=2).fit_transform([np.array(['a', 'a', 'b'])], ['A'])
+
+        path = 'test_pruned_vocabulary'
+        os.makedirs(path, exist_ok=True)
+        vocabulary.save(os.path.join(path, 'vocabulary.npz'))
+        loaded = Vocabulary.load(os.path.join(path, 'vocabulary.npz'))
+        shutil.rmtree(path)
+
+        self.assertTrue(loaded['A'].other)
+        self.assertEqual(len(loaded['A']), 2)
+
+    def test_check_hashing(self) -> None:
+        check_hashing(None, 1, True, True)
+        check_hashing({'A': 100}, 2, False, False)
+        self.assertRaises(ValueError, check_hashing, {'A': 0}, 1, False, False)
+        self.assertRaises(ValueError, check_hashing, {'A': 100}, 0, False, False)
+        self.assertRaises(ValueError, check_hashing, {'A': 100}, 1, True, False)
+        self.assertRaises(ValueError, check_hashing, {'A': 100}, 2, False, True)
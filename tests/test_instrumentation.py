@@ -0,0 +1,107 @@
+import json
+import logging
+import os
+import unittest
+from unittest.mock import Mock
+
+from entity_embeddings.config import Config
+from entity_embeddings.instrumentation import CallbackSink, JsonSink, LogSink, StageTimer
+from entity_embeddings.instrumentation.summary import get_training_summary, is_increasing_metric
+from entity_embeddings.network.callbacks import ThroughputCallback
+from entity_embeddings.processor.target_type import TargetType
+from entity_embeddings.util.dataframe_utils import create_random_csv, remove_random_csv
+
+METRICS_PATH = 'test_metrics.jsonl'
+
+
+class TestInstrumentation(unittest.TestCase):
+    def tearDown(self):
+        if os.path.exists(METRICS_PATH):
+            os.remove(METRICS_PATH)
+
+    def test_stage_timer(self):
+        metrics = []
+        timer = StageTimer([CallbackSink(metrics.append)])
+
+        with timer.stage('load_data'):
+            pass
+        with timer.stage('load_data'):
+            pass
+
+        self.assertListEqual(list(timer.timings), ['load_data'])
+        self.assertEqual(len(metrics), 2)
+        self.assertEqual(metrics[0]['event'], 'stage')
+        self.assertEqual(metrics[0]['stage'], 'load_data')
+        self.assertAlmostEqual(timer.timings['load_data'], metrics[0]['seconds'] + metrics[1]['seconds'])
+
+    def test_stage_is_timed_when_raising(self):
+        timer = StageTimer()
+
+        with self.assertRaises(ValueError):
+            with timer.stage('fit'):
+                raise ValueError()
+
+        self.assertIn('fit', timer.timings)
+
+    def test_json_sink(self):
+        sink = JsonSink(METRICS_PATH)
+        sink.emit({'event': 'stage', 'stage': 'fit', 'seconds': 1.5})
+        sink.emit({'event': 'stage', 'stage': 'plot_history', 'seconds': 0.5})
+
+        with open(METRICS_PATH) as f:
+            metrics = [json.loads(line) for line in f]
+
+        self.assertListEqual([metric['stage'] for metric in metrics], ['fit', 'plot_history'])
+
+    def test_log_sink(self):
+        with self.assertLogs('entity_embeddings.instrumentation.sinks', level=logging.INFO) as logs:
+            LogSink().emit({'event': 'stage', 'stage': 'fit', 'seconds': 1.5})
+
+        self.assertIn('"stage": "fit"', logs.output[0])
+
+    def test_throughput_callback(self):
+        metrics = []
+        callback = ThroughputCallback([CallbackSink(metrics.append)])
+
+        callback.on_epoch_begin(0)
+        for batch in range(4):
+            callback.on_batch_begin(batch)
+            callback.on_batch_end(batch, {'size': 32, 'loss': 0.5})
+        callback.on_epoch_end(0, {'loss': 0.5, 'val_loss': 0.6})
+
+        self.assertEqual(len(metrics), 1)
+        self.assertEqual(metrics[0]['event'], 'epoch')
+        self.assertEqual(metrics[0]['samples'], 128)
+        self.assertEqual(metrics[0]['steps'], 4)
+        self.assertGreater(metrics[0]['samples_per_second'], 0)
+        self.assertLessEqual(metrics[0]['step_ms_p50'], metrics[0]['step_ms_p99'])
+        self.assertEqual(metrics[0]['val_loss'], 0.6)
+
+    def test_training_summary(self):
+        history = Mock(epoch=[0, 1, 2, 3], history={'val_loss': [0.5, 0.3, 0.4, 0.45]})
+        summary = get_training_summary(history, 10, 'val_loss')
+
+        self.assertEqual(summary['event'], 'training')
+        self.assertEqual(summary['epochs'], 4)
+        self.assertEqual(summary['epochs_saved'], 6)
+        self.assertEqual(summary['best_epoch'], 1)
+        self.assertEqual(summary['best_value'], 0.3)
+
+        self.assertTrue(is_increasing_metric('val_acc'))
+        self.assertFalse(is_increasing_metric('val_loss'))
+
+    def test_config_times_the_loading_of_the_data(self):
+        metrics = []
+        config = Config.make_default_config(csv_path=create_random_csv(),
+                                            target_name='D',
+                                            target_type=TargetType.BINARY_CLASSIFICATION,
+                                            train_ratio=0.9,
+                                            metrics_sinks=[CallbackSink(metrics.append)])
+        remove_random_csv()
+
+        self.assertListEqual(list(config.timer.timings), ['load_data', 'generate_categories'])
+        self.assertListEqual([metric['stage'] for metric in metrics], ['load_data', 'generate_categories'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+import subprocess
+import sys
+import types
+import unittest
+
+import entity_embeddings
+from entity_embeddings.util.lazy_utils import LazyModule, make_lazy
+
+HEAVY_MODULES = ('keras', 'tensorflow', 'sklearn', 'matplotlib', 'pandas')
+
+
+class TestLazyUtils(unittest.TestCase):
+    def setUp(self):
+        self.module = types.ModuleType('lazy_test_package')
+        sys.modules['lazy_test_package'] = self.module
+
+    def tearDown(self):
+        del sys.modules['lazy_test_package']
+
+    def test_names_are_imported_on_first_use(self):
+        make_lazy('lazy_test_package', {'OrderedDict': 'collections'})
+
+        self.assertIsInstance(self.module, LazyModule)
+        self.assertNotIn('OrderedDict', self.module.__dict__)
+        self.assertIn('OrderedDict', dir(self.module))
+        self.assertListEqual(self.module.__all__, ['OrderedDict'])
+
+        from collections import OrderedDict
+        self.assertIs(self.module.OrderedDict, OrderedDict)
+        self.assertIn('OrderedDict', self.module.__dict__)
+
+    def test_unknown_name(self):
+        make_lazy('lazy_test_package', {'OrderedDict': 'collections'})
+
+        self.assertRaises(AttributeError, getattr, self.module, 'Counter')
+
+    def test_public_names_of_the_package(self):
+        from entity_embeddings.inference import EmbeddingStore
+
+        self.assertIs(entity_embeddings.EmbeddingStore, EmbeddingStore)
+        self.assertIn('Config', entity_embeddings.__all__)
+
+    def test_inference_does_not_import_the_training_backends(self):
+        code = ('import sys\n'
+                'from entity_embeddings.inference import EmbeddingStore\n'
+                'from entity_embeddings.similarity import CategorySimilarity\n'
+                'print(",".join(name for name in %r if name in sys.modules))' % (HEAVY_MODULES,))
+        output = subprocess.run([sys.executable, '-c', code], stdout=subprocess.PIPE, universal_newlines=True,
+                                check=True)
+
+        self.assertEqual(output.stdout.strip(), '')
+
+    def test_visualization_utils_imports_matplotlib_when_plotting(self):
+        code = ('import sys\n'
+                'import entity_embeddings.util.visualization_utils\n'
+                'print(",".join(name for name in %r if name in sys.modules))' % (HEAVY_MODULES[:-1],))
+        output = subprocess.run([sys.executable, '-c', code], stdout=subprocess.PIPE, universal_newlines=True,
+                                check=True)
+
+        self.assertEqual(output.stdout.strip(), '')
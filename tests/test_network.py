@@ -3,9 +3,12 @@ import unittest
 from keras.layers import Embedding
 
 from entity_embeddings.config import Config, get_embedding_size
+from entity_embeddings.network.hashed import HashedEmbedding
 from entity_embeddings.network.network import EmbeddingNetwork
+from entity_embeddings.options import TrainingControl, VocabularyOptions
 from entity_embeddings.processor.target_type import TargetType
-from entity_embeddings.util.dataframe_utils import create_random_csv, remove_random_csv
+from entity_embeddings.util import model_utils
+from entity_embeddings.util.dataframe_utils import create_random_csv, create_random_dataframe, remove_random_csv
 
 
 class TestNetwork(unittest.TestCase):
@@ -28,6 +31,63 @@ class TestNetwork(unittest.TestCase):
 
         remove_random_csv()
 
+    def test_fused_embeddings_have_single_input(self):
+        random_csv = create_random_csv()
+        target = 'D'
+
+        config = Config.make_default_config(csv_path=random_csv,
+                                            target_name=target,
+                                            target_type=TargetType.BINARY_CLASSIFICATION,
+                                            train_ratio=0.9,
+                                            fused_embeddings=True)
+
+        network = EmbeddingNetwork(config)
+        self.assertEqual(len(network.model.inputs), 1)
+
+        weights = model_utils.get_weights(network.model, config)
+        for category, category_weights in zip(config.categories, weights):
+            self.assertTupleEqual(category_weights.shape, (category.unique_values, category.embedding_size))
+
+        remove_random_csv()
+
+    def test_hashed_embeddings_keep_their_weights_shape(self):
+        random_csv = create_random_csv()
+        target = 'D'
+
+        config = Config.make_default_config(csv_path=random_csv,
+                                            target_name=target,
+                                            target_type=TargetType.BINARY_CLASSIFICATION,
+                                            train_ratio=0.9,
+                                            vocabulary_options=VocabularyOptions({'A': 64}, n_hashes=2))
+
+        network = EmbeddingNetwork(config)
+        self.assertIsInstance(network.model.get_layer('A'), HashedEmbedding)
+
+        weights = model_utils.get_weights(network.model, config)
+        self.assertTupleEqual(weights[0].shape, (64, get_embedding_size(64)))
+
+        remove_random_csv()
+
+    def test_early_stopping_restores_best_weights(self):
+        df = create_random_dataframe(200, 4, 'ABCD')
+        df['D'] += 1
+        config = Config.make_default_config_from_df(df=df,
+                                                    target_name='D',
+                                                    target_type=TargetType.REGRESSION,
+                                                    train_ratio=0.8,
+                                                    epochs=50,
+                                                    training_control=TrainingControl(early_stopping_patience=1,
+                                                                                     reduce_lr_patience=0))
+
+        network = EmbeddingNetwork(config)
+        X = df[['A', 'B', 'C']].values
+        y = df['D'].values
+        network.fit(X[:160], y[:160], X[160:], y[160:])
+
+        summary = network.training_summary
+        self.assertEqual(summary['epochs'] + summary['epochs_saved'], 50)
+        self.assertLess(summary['best_epoch'], summary['epochs'])
+
     def test_output_for_regression(self):
         pass
 
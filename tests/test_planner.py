@@ -0,0 +1,89 @@
+import unittest
+
+import numpy as np
+
+from entity_embeddings.config import Category, get_embedding_size
+from entity_embeddings.planner import EmbeddingPlan, SizeWeighting, plan_embedding_sizes
+from entity_embeddings.planner.planner import BYTES_PER_PARAMETER, MIN_EMBEDDING_SIZE, check_budget, get_effective_size
+
+
+class TestPlanner(unittest.TestCase):
+    def setUp(self):
+        self.categories = [Category('A', 10000), Category('B', 1000), Category('C', 10)]
+
+    def test_memory_of_plan(self):
+        plan = EmbeddingPlan(['A', 'B'], [100, 10], [8, 4], optimizer='adam', hidden_units=1000)
+
+        self.assertListEqual(plan.table_parameters, [800, 40])
+        self.assertEqual(plan.concatenated_size, 12)
+        self.assertEqual(plan.parameters, 800 + 40 + 12 * 1000)
+        self.assertEqual(plan.memory_bytes, plan.parameters * BYTES_PER_PARAMETER * 3)
+
+        report = plan.report()
+        self.assertIn('A', report)
+        self.assertIn(str(plan.parameters), report)
+
+    def test_no_budget_keeps_default_sizes(self):
+        plan = plan_embedding_sizes(self.categories)
+
+        self.assertListEqual(plan.sizes, [category.embedding_size for category in self.categories])
+
+    def test_fits_parameters(self):
+        default = plan_embedding_sizes(self.categories)
+        plan = plan_embedding_sizes(self.categories, max_parameters=default.parameters // 2)
+
+        self.assertLessEqual(plan.parameters, default.parameters // 2)
+        self.assertTrue(all(MIN_EMBEDDING_SIZE <= size <= desired for size, desired in zip(plan.sizes, default.sizes)))
+
+    def test_fits_memory(self):
+        plan = plan_embedding_sizes(self.categories, max_memory_bytes=2 * 10 ** 6, optimizer='sgd')
+
+        self.assertLessEqual(plan.memory_bytes, 2 * 10 ** 6)
+        self.assertEqual(plan.bytes_per_parameter, BYTES_PER_PARAMETER)
+
+    def test_budget_too_small(self):
+        self.assertRaises(ValueError, plan_embedding_sizes, self.categories, max_parameters=1000)
+
+    def test_apply(self):
+        plan = plan_embedding_sizes(self.categories, max_parameters=100000)
+        plan.apply(self.categories)
+
+        self.assertListEqual([category.embedding_size for category in self.categories], plan.sizes)
+
+    def test_frequency_weighting(self):
+        # the first column has 1000 values, but almost every row holds the same one
+        counts = [np.append(10 ** 6, np.ones(9999)), np.ones(1000), np.ones(10)]
+        plan = plan_embedding_sizes(self.categories, weighting=SizeWeighting.FREQUENCY, counts=counts)
+
+        self.assertLess(plan.sizes[0], get_embedding_size(10000))
+        self.assertEqual(plan.sizes[1], get_embedding_size(1000))
+        self.assertRaises(ValueError, plan_embedding_sizes, self.categories, weighting=SizeWeighting.FREQUENCY)
+
+    def test_effective_size(self):
+        self.assertEqual(get_effective_size(np.ones(40)), 40)
+        self.assertEqual(get_effective_size([100, 0, 0]), 1)
+
+    def test_invalid_options(self):
+        self.assertRaises(ValueError, plan_embedding_sizes, self.categories, weighting='entropy')
+        self.assertRaises(ValueError, plan_embedding_sizes, self.categories, optimizer='lbfgs')
+
+    def test_optimizer_object(self):
+        class SGD:
+            pass
+
+        plan = plan_embedding_sizes(self.categories, optimizer=SGD())
+
+        self.assertEqual(plan.optimizer, 'sgd')
+        self.assertEqual(plan.bytes_per_parameter, BYTES_PER_PARAMETER)
+
+    def test_check_budget(self) -> None:
+        check_budget(None, None, 'cardinality', 10)
+        check_budget(1000, 10 ** 6, 'frequency', None)
+        self.assertRaises(ValueError, check_budget, 0, None, 'cardinality', None)
+        self.assertRaises(ValueError, check_budget, None, 0, 'cardinality', None)
+        self.assertRaises(ValueError, check_budget, None, None, 'entropy', None)
+        self.assertRaises(ValueError, check_budget, 1000, None, 'frequency', 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
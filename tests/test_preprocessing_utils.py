@@ -3,7 +3,8 @@ import unittest
 import numpy as np
 
 from entity_embeddings.util import dataframe_utils
-from entity_embeddings.util.preprocessing_utils import transpose_to_list, series_to_list, get_X_y, label_encode
+from entity_embeddings.util.preprocessing_utils import transpose_to_list, series_to_list, get_X_y, label_encode, \
+    get_X_y_columnar, label_encode_columns
 
 
 class TestPreprocessingUtils(unittest.TestCase):
@@ -15,6 +16,16 @@ class TestPreprocessingUtils(unittest.TestCase):
         self.assertEqual(len(feature_list), X_array.shape[1])
         self.__check_items(X_array, feature_list)
 
+    def test_transpose_to_list_returns_views(self):
+        X_array = np.random.randint(0, 10, size=(10, 4)).astype(np.uint8)
+
+        feature_list = transpose_to_list(X_array)
+
+        for feature in feature_list:
+            self.assertEqual(feature.dtype, np.uint8)
+            self.assertTupleEqual(feature.shape, (10, 1))
+            self.assertTrue(np.shares_memory(feature, X_array))
+
     def test_series_to_list(self):
         df = dataframe_utils.create_random_dataframe(rows=5, cols=5, columns='ABCDE')
 
@@ -31,6 +42,7 @@ class TestPreprocessingUtils(unittest.TestCase):
 
         self.assertEqual(labels[0].classes_[0], 0)
         self.assertEqual(labels[0].classes_[1], 1)
+        self.assertEqual(data_encoded.dtype, np.uint8)
 
     def test_get_X_y(self):
         df = dataframe_utils.create_random_dataframe(rows=5, cols=5, columns='ABCDE')
@@ -48,6 +60,40 @@ class TestPreprocessingUtils(unittest.TestCase):
 
                 self.assertEqual(current_df, item_x)
 
+    def test_get_X_y_columnar(self):
+        df = dataframe_utils.create_random_dataframe(rows=5, cols=5, columns='ABCDE')
+        target = 'E'
+
+        X_columns, y = get_X_y_columnar(df, target)
+        X_list, y_list = get_X_y(df, target)
+
+        self.assertListEqual(y.tolist(), y_list)
+        self.assertEqual(len(X_columns), df.shape[1] - 1)
+
+        for index_list, X_row in enumerate(X_list):
+            for index_item, item_x in enumerate(X_row):
+                self.assertEqual(X_columns[index_item][index_list], item_x)
+
+    def test_get_X_y_columnar_keeps_dtypes(self):
+        df = dataframe_utils.create_random_dataframe(rows=5, cols=3, columns='ABC')
+        df['A'] = df['A'].astype(str)
+
+        X_columns, y = get_X_y_columnar(df, 'C')
+
+        self.assertIsInstance(X_columns[0][0], str)
+        self.assertEqual(X_columns[1].dtype, df['B'].dtype)
+
+    def test_label_encode_columns(self):
+        df = dataframe_utils.create_random_dataframe(rows=10, cols=4, columns='ABCD')
+        X_list, _ = get_X_y(df, 'D')
+        X_columns, _ = get_X_y_columnar(df, 'D')
+
+        expected, _ = label_encode(X_list)
+        data_encoded, labels = label_encode_columns(X_columns)
+
+        self.assertListEqual(data_encoded.tolist(), expected.tolist())
+        self.assertEqual(len(labels), len(X_columns))
+
     def __check_items(self, X_array, feature_list):
         for index in range(X_array.shape[1]):
             for item_index, item_value in enumerate(X_array[index:index + 1, :-1].tolist()[0]):
@@ -0,0 +1,116 @@
+import unittest
+
+import numpy as np
+
+from entity_embeddings.util.sampling_utils import ReservoirSampler, RowSubset, Sampling, check_sampling, \
+    get_default_sampling, get_strata, sample_training_data, split_rows
+
+
+class TestSamplingUtils(unittest.TestCase):
+    def setUp(self):
+        self.X = np.arange(2000).reshape(1000, 2)
+        self.y = np.append(np.zeros(900), np.ones(100))
+
+    def test_none_keeps_every_row(self):
+        X, y = sample_training_data(self.X, self.y, Sampling.NONE, 10)
+
+        self.assertIs(X, self.X)
+        self.assertIs(y, self.y)
+
+    def test_bootstrap(self):
+        X, y = sample_training_data(self.X, self.y, Sampling.BOOTSTRAP, 1500, seed=0)
+
+        self.assertEqual(len(X), 1500)
+        np.testing.assert_array_equal(X[:, 0] // 2, np.arange(1000)[X[:, 0] // 2])
+
+    def test_uniform_has_no_repeated_rows(self):
+        X, y = sample_training_data(self.X, self.y, Sampling.UNIFORM, 100, seed=0)
+
+        self.assertEqual(len(np.unique(X[:, 0])), 100)
+        np.testing.assert_array_equal(y, self.y[X[:, 0] // 2])
+
+    def test_stratified_keeps_proportions(self):
+        X, y = sample_training_data(self.X, self.y, Sampling.STRATIFIED, 50, seed=0)
+
+        self.assertEqual(len(np.unique(X[:, 0])), 50)
+        self.assertEqual(int(y.sum()), 5)
+
+    def test_stratified_one_hot_and_continuous_targets(self):
+        one_hot = np.eye(3)[np.arange(30) % 3]
+        self.assertListEqual(get_strata(one_hot).tolist(), (np.arange(30) % 3).tolist())
+
+        continuous = np.random.RandomState(0).rand(1000)
+        self.assertEqual(len(np.unique(get_strata(continuous))), 10)
+
+        X, y = sample_training_data(self.X, continuous, Sampling.STRATIFIED, 100, seed=0)
+        self.assertEqual(len(X), 100)
+
+    def test_reservoir_is_uniform(self):
+        hits = np.zeros(100)
+        for seed in range(500):
+            sampler = ReservoirSampler(10, np.random.RandomState(seed))
+            reservoir = np.zeros(10, dtype=int)
+            start = 0
+            for chunk in (7, 30, 63):
+                rows, slots = sampler.update(chunk)
+                reservoir[slots] = start + rows
+                start += chunk
+            self.assertListEqual(np.sort(reservoir).tolist(), sampler.get_indices().tolist())
+            hits[reservoir] += 1
+
+        # every row is expected to be sampled 500 * 10 / 100 = 50 times
+        self.assertLess(np.abs(hits - 50).max(), 25)
+
+    def test_reservoir_smaller_than_sample(self):
+        sampler = ReservoirSampler(10)
+        rows, slots = sampler.update(4)
+
+        self.assertListEqual(rows.tolist(), [0, 1, 2, 3])
+        self.assertListEqual(slots.tolist(), [0, 1, 2, 3])
+        self.assertListEqual(sampler.get_indices().tolist(), [0, 1, 2, 3])
+
+    def test_reservoir_is_already_sampled(self):
+        X, y = sample_training_data(self.X, self.y, Sampling.RESERVOIR, 100)
+        self.assertIs(X, self.X)
+
+    def test_sample_larger_than_rows(self):
+        X, _ = sample_training_data(self.X, self.y, Sampling.UNIFORM, 5000)
+
+        self.assertIs(X, self.X)
+
+    def test_default_sampling(self):
+        self.assertEqual(get_default_sampling(False), Sampling.BOOTSTRAP)
+        self.assertEqual(get_default_sampling(True), Sampling.NONE)
+
+    def test_split_rows(self):
+        X_train, X_val, y_train, y_val = split_rows(self.X, self.y, np.array([950, 0]))
+
+        np.testing.assert_array_equal(X_val, [[0, 1], [1900, 1901]])
+        np.testing.assert_array_equal(y_val, [0, 1])
+        self.assertEqual(len(X_train), 998)
+        np.testing.assert_array_equal(X_train[0], [2, 3])
+
+    def test_split_rows_lazily(self):
+        X_train, X_val, y_train, y_val = split_rows(self.X, self.y, np.arange(100, 200), lazy=True)
+
+        self.assertIsInstance(X_train, RowSubset)
+        self.assertEqual(len(X_train), 900)
+        np.testing.assert_array_equal(X_train[99:101], [[198, 199], [400, 401]])
+        np.testing.assert_array_equal(X_val[:1], [[200, 201]])
+        self.assertEqual(len(y_train), 900)
+
+        # the lazy rows can still be sampled
+        X, y = sample_training_data(X_train, y_train, Sampling.UNIFORM, 10, seed=0)
+        self.assertTupleEqual(X.shape, (10, 2))
+
+    def test_check_sampling(self) -> None:
+        check_sampling(None, 1000)
+        check_sampling('stratified', 10)
+        self.assertRaises(ValueError, check_sampling, 'reservoir', 10)
+        check_sampling('reservoir', 10, chunk_size=64)
+        self.assertRaises(ValueError, check_sampling, 'systematic', 1000)
+        self.assertRaises(ValueError, check_sampling, 'uniform', 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+import shutil
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+
+from entity_embeddings.cache import CacheEntry
+from entity_embeddings.config import Config
+from entity_embeddings.options import SamplingOptions, TrainingControl, VocabularyOptions
+from entity_embeddings.processor.target_type import TargetType
+from entity_embeddings.search import HyperparameterSearch, make_grid, make_random_candidates
+from entity_embeddings.search.search import check_search, get_ranking, get_trial_parameters, preprocess
+from entity_embeddings.util.dataframe_utils import create_random_dataframe
+
+ARTIFACTS_DIR = 'test_search'
+
+
+def fake_trial(parameters, cache_path, candidate, epochs, return_tables=False):
+    # the smaller the batch size and the more epochs, the lower the loss
+    return {'epochs': epochs, 'best_epoch': epochs - 1, 'best_value': candidate['batch_size'] / epochs, 'seconds': 0.1}
+
+
+class TestSearch(unittest.TestCase):
+    def setUp(self):
+        self.df = create_random_dataframe()
+
+    def tearDown(self):
+        shutil.rmtree(ARTIFACTS_DIR, ignore_errors=True)
+
+    def make_config(self, **kwargs) -> Config:
+        return Config.make_default_config_from_df(df=self.df,
+                                                  target_name='D',
+                                                  target_type=TargetType.BINARY_CLASSIFICATION,
+                                                  train_ratio=0.9,
+                                                  epochs=8,
+                                                  artifacts_path=ARTIFACTS_DIR,
+                                                  **kwargs)
+
+    def test_make_grid(self):
+        candidates = make_grid({'batch_size': [32, 64], 'epochs': [1, 2, 3]})
+
+        self.assertEqual(len(candidates), 6)
+        self.assertDictEqual(candidates[0], {'batch_size': 32, 'epochs': 1})
+        self.assertDictEqual(candidates[-1], {'batch_size': 64, 'epochs': 3})
+
+    def test_make_random_candidates(self):
+        space = {'batch_size': [32, 64], 'min_delta': lambda random_state: random_state.uniform(0, 0.1)}
+        candidates = make_random_candidates(space, 5, seed=1)
+
+        self.assertEqual(len(candidates), 5)
+        self.assertTrue(all(candidate['batch_size'] in (32, 64) for candidate in candidates))
+        self.assertTrue(all(0 <= candidate['min_delta'] < 0.1 for candidate in candidates))
+        self.assertListEqual(make_random_candidates(space, 5, seed=1), candidates)
+
+    def test_get_ranking(self):
+        values = np.array([0.3, np.nan, 0.1, 0.2])
+
+        self.assertListEqual(get_ranking(values, False).tolist(), [2, 3, 0, 1])
+        self.assertListEqual(get_ranking(values, True).tolist(), [0, 3, 2, 1])
+
+    def test_search_without_cache(self):
+        self.assertRaises(ValueError, HyperparameterSearch, self.make_config(), [{'batch_size': 32}])
+
+    def test_trials_share_the_preprocessed_data(self):
+        config = self.make_config(cache=True)
+        cache_path = preprocess(config)
+
+        trial_config = Config(**dict(get_trial_parameters(config), cache_entry=CacheEntry(cache_path)))
+
+        self.assertIsNone(trial_config.df)
+        self.assertEqual(trial_config.n_rows, len(self.df))
+        self.assertListEqual([category.unique_values for category in trial_config.categories],
+                             [category.unique_values for category in config.categories])
+        self.assertEqual(preprocess(config), cache_path)
+
+    @patch('entity_embeddings.search.search.run_trial', side_effect=fake_trial)
+    def test_grid_search(self, run_trial):
+        search = HyperparameterSearch(self.make_config(cache=True), make_grid({'batch_size': [64, 16, 32]}))
+        results = search.run()
+
+        self.assertEqual(run_trial.call_count, 3)
+        self.assertListEqual(results['batch_size'].tolist(), [16, 32, 64])
+        self.assertListEqual(results['round_epochs'].tolist(), [8, 8, 8])
+        self.assertDictEqual(search.get_best_candidate(), {'batch_size': 16})
+
+    @patch('entity_embeddings.search.search.run_trial', side_effect=fake_trial)
+    def test_successive_halving(self, run_trial):
+        candidates = make_grid({'batch_size': [16, 32, 64, 128]})
+        search = HyperparameterSearch(self.make_config(cache=True), candidates, halving_factor=2, min_epochs=2)
+        results = search.run()
+
+        # 4 trials of 2 epochs, the best 2 of them with 4 epochs and the best one with 8
+        self.assertListEqual([call[0][3] for call in run_trial.call_args_list], [2, 2, 2, 2, 4, 4, 8])
+        self.assertListEqual(results['round'].tolist(), [2, 1, 1, 0, 0, 0, 0])
+        self.assertDictEqual(search.get_best_candidate(), {'batch_size': 16})
+
+    def test_best_candidate_before_running(self):
+        search = HyperparameterSearch(self.make_config(cache=True), [{'batch_size': 32}])
+        self.assertRaises(ValueError, search.get_best_candidate)
+
+    def test_check_search(self) -> None:
+        check_search(object(), [{'epochs': 1}], 2, None, 3, 1)
+        self.assertRaises(ValueError, check_search, None, [{'epochs': 1}], 1, None, None, 1)
+        self.assertRaises(ValueError, check_search, object(), [], 1, None, None, 1)
+        self.assertRaises(ValueError, check_search, object(), [{'epochs': 1}], 0, None, None, 1)
+        self.assertRaises(ValueError, check_search, object(), [{'epochs': 1}], 1, 0, None, 1)
+        self.assertRaises(ValueError, check_search, object(), [{'epochs': 1}], 1, None, 1, 1)
+        self.assertRaises(ValueError, check_search, object(), [{'epochs': 1}], 1, None, 2, 0)
+
+    def test_check_search_preprocessing(self) -> None:
+        check_search(object(), [{'sampling_options': SamplingOptions('uniform', 10)}], 1, None, None, 1)
+        pruning = VocabularyOptions(min_frequency=2)
+
+        self.assertRaises(ValueError, check_search, object(), [{'vocabulary_options': pruning}], 1, None, None, 1)
+        self.assertRaises(ValueError, check_search, object(), [{'epochs': 1}, {'chunk_size': 10}], 1, None, None, 1)
+        self.assertRaises(ValueError, check_search, object(), [{'sampling_options': SamplingOptions('reservoir')}], 1,
+                          None, None, 1)
+        self.assertRaises(ValueError, check_search, object(), [{'sampling_options': SamplingOptions(size=10)}], 1, None,
+                          None, 1, None, 'reservoir')
+
+    def test_check_search_lr_schedule(self) -> None:
+        control = TrainingControl(lr_schedule=lambda epoch, lr: lr)
+
+        check_search(object(), [{'training_control': control}], 1, None, None, 1)
+        check_search(object(), [{'epochs': 1}], 2, None, None, 1, np.sqrt)
+        self.assertRaises(ValueError, check_search, object(), [{'training_control': control}], 2, None, None, 1)
+        self.assertRaises(ValueError, check_search, object(), [{'epochs': 1}], 2, None, None, 1, control.lr_schedule)
@@ -0,0 +1,81 @@
+import os
+import shutil
+import unittest
+
+import numpy as np
+
+from entity_embeddings.network.sequence import EncodedSequence, get_block_size, make_batches
+
+SEQUENCE_DIR = 'test_sequence'
+
+
+class TestSequence(unittest.TestCase):
+    def setUp(self):
+        os.makedirs(SEQUENCE_DIR, exist_ok=True)
+        X = np.lib.format.open_memmap(os.path.join(SEQUENCE_DIR, 'X.npy'), mode='w+', dtype=int, shape=(10, 2))
+        X[:, 0] = np.arange(10)
+        X[:, 1] = np.arange(10) * 10
+        X.flush()
+
+        self.X = np.load(os.path.join(SEQUENCE_DIR, 'X.npy'), mmap_mode='r')
+        self.y = np.arange(10)
+
+    def tearDown(self):
+        del self.X
+        shutil.rmtree(SEQUENCE_DIR)
+
+    def test_batches_in_order(self):
+        sequence = EncodedSequence(self.X, self.y, batch_size=4)
+
+        self.assertEqual(len(sequence), 3)
+
+        X_batch, y_batch = sequence[2]
+        self.assertEqual(len(X_batch), 2)
+        self.assertListEqual(X_batch[0].tolist(), [[8], [9]])
+        self.assertListEqual(X_batch[1].tolist(), [[80], [90]])
+        self.assertListEqual(y_batch.tolist(), [8, 9])
+
+    def test_shuffle_keeps_blocks_contiguous(self):
+        sequence = EncodedSequence(self.X, self.y, batch_size=2, shuffle=True, block_size=4, seed=1)
+
+        for _ in range(3):
+            rows = []
+            for index in range(len(sequence)):
+                X_batch, y_batch = sequence[index]
+                self.assertListEqual(X_batch[0].ravel().tolist(), y_batch.tolist())
+                rows.append(sorted(y_batch.tolist()))
+
+            self.assertListEqual(sorted(row for batch in rows for row in batch), list(range(10)))
+            for batch in rows:
+                self.assertEqual(batch[0] // 4, batch[-1] // 4)
+
+            sequence.on_epoch_end()
+
+    def test_shuffled_batches_only_change_on_epoch_end(self):
+        sequence = EncodedSequence(self.X, self.y, batch_size=2, shuffle=True, seed=1)
+
+        first = [sequence[index][1].tolist() for index in range(len(sequence))]
+        second = [sequence[index][1].tolist() for index in reversed(range(len(sequence)))]
+
+        self.assertListEqual(first, second[::-1])
+        for batch in first:
+            self.assertListEqual(batch, list(range(batch[0], batch[0] + 2)))
+
+    def test_target_transform(self):
+        sequence = EncodedSequence(self.X, self.y, batch_size=5, target_transform=lambda y: y * 2)
+
+        _, y_batch = sequence[1]
+        self.assertListEqual(y_batch.tolist(), [10, 12, 14, 16, 18])
+
+    def test_different_lengths(self):
+        with self.assertRaises(ValueError):
+            EncodedSequence(self.X, self.y[:5], batch_size=2)
+
+    def test_block_size(self):
+        self.assertEqual(get_block_size(4), 4)
+        self.assertEqual(get_block_size(4, 10), 12)
+        self.assertEqual(get_block_size(4, 8), 8)
+
+    def test_make_batches(self):
+        self.assertListEqual(make_batches(10, 4, 8), [(0, 4), (4, 8), (8, 10)])
+        self.assertListEqual(make_batches(0, 4, 8), [])
@@ -0,0 +1,129 @@
+import asyncio
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+import numpy as np
+
+from entity_embeddings.encoder import CategoricalEncoder
+from entity_embeddings.inference import EmbeddingStore, OutOfVocabulary
+from entity_embeddings.inference.histogram import Histogram
+from entity_embeddings.inference.server import LookupServer
+
+
+class TestServer(unittest.TestCase):
+    def setUp(self):
+        columns = [np.array(['x', 'y', 'z'], dtype=object), np.array([10, 20, 30])]
+        _, vocabulary = CategoricalEncoder().fit_transform(columns, ['A', 'B'])
+        weights = [np.arange(6, dtype=np.float32).reshape(3, 2), np.arange(6, dtype=np.float32).reshape(3, 2) + 100]
+
+        self.store = EmbeddingStore.from_weights(weights, vocabulary, OutOfVocabulary.ERROR)
+        self.socket_dir = tempfile.mkdtemp()
+        self.socket_path = os.path.join(self.socket_dir, 'embeddings.sock')
+
+        self.loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self.loop)
+
+    def tearDown(self):
+        self.loop.close()
+        asyncio.set_event_loop(None)
+        shutil.rmtree(self.socket_dir)
+
+    def test_concurrent_lookups_are_batched(self):
+        server = LookupServer(self.store, max_delay=0.01)
+
+        async def run():
+            await server.start(path=self.socket_path)
+            results = await asyncio.gather(*[self.request({'rows': [['y', 30], {'A': 'x', 'B': 10}]})
+                                             for _ in range(10)])
+            stats = await self.request({'stats': True})
+            await server.close()
+            return results, stats
+
+        results, stats = self.loop.run_until_complete(run())
+
+        for result in results:
+            self.assertListEqual(result['embeddings'], [[2, 3, 104, 105], [0, 1, 100, 101]])
+
+        self.assertEqual(stats['latency_seconds']['count'], 10)
+        self.assertEqual(stats['batch_size']['total'], 20)
+        self.assertLess(stats['batch_size']['count'], 10)
+
+    def test_bad_lookup_does_not_fail_the_batch(self):
+        server = LookupServer(self.store, max_delay=0.01)
+
+        async def run():
+            await server.start(path=self.socket_path)
+            results = await asyncio.gather(self.request({'rows': [['w', 30]]}),
+                                           self.request({'rows': [['z', 20]]}),
+                                           self.request({'rows': [['z']]}))
+            await server.close()
+            return results
+
+        unknown, known, missing = self.loop.run_until_complete(run())
+
+        self.assertIn('error', unknown)
+        self.assertListEqual(known['embeddings'], [[4, 5, 102, 103]])
+        self.assertIn('error', missing)
+
+    def test_unexpected_error_does_not_stop_the_server(self):
+        server = LookupServer(self.store, max_delay=0.01)
+        transform = self.store.transform
+
+        def fail_on_short_rows(columns):
+            if '' in columns[0].tolist():
+                raise IndexError('string index out of range')
+            return transform(columns)
+
+        async def run():
+            await server.start(path=self.socket_path)
+            malformed = await self.request({'rows': [['', 20]]})
+            valid = await self.request({'rows': [['z', 20]]})
+            await server.close()
+            return malformed, valid
+
+        with mock.patch.object(self.store, 'transform', side_effect=fail_on_short_rows):
+            malformed, valid = self.loop.run_until_complete(asyncio.wait_for(run(), 5))
+
+        self.assertIn('error', malformed)
+        self.assertListEqual(valid['embeddings'], [[4, 5, 102, 103]])
+
+    def test_invalid_messages(self):
+        server = LookupServer(self.store, max_delay=0.01)
+
+        async def run():
+            await server.start(path=self.socket_path)
+            results = [await self.send(line) for line in (b'{"rows"', b'[1]', b'"x"', b'3', b'null')]
+            valid = await self.request({'rows': [['z', 20]]})
+            await server.close()
+            return results, valid
+
+        results, valid = self.loop.run_until_complete(asyncio.wait_for(run(), 5))
+
+        for result in results:
+            self.assertIn('error', result)
+        self.assertListEqual(valid['embeddings'], [[4, 5, 102, 103]])
+
+    def test_histogram(self):
+        histogram = Histogram([1, 2, 4, 8])
+        for value in [0.5, 1.5, 3, 3, 100]:
+            histogram.record(value)
+
+        self.assertEqual(histogram.count, 5)
+        self.assertListEqual(histogram.counts.tolist(), [1, 1, 2, 0, 1])
+        self.assertEqual(histogram.percentile(50), 4)
+        self.assertEqual(histogram.percentile(99), 100)
+        self.assertAlmostEqual(histogram.mean, 21.6)
+
+    async def request(self, message):
+        return await self.send(json.dumps(message).encode())
+
+    async def send(self, line):
+        reader, writer = await asyncio.open_unix_connection(self.socket_path)
+        writer.write(line + b'\n')
+        response = json.loads((await reader.readline()).decode())
+        writer.close()
+        return response
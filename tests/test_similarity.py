@@ -0,0 +1,177 @@
+import os
+import shutil
+import unittest
+
+import numpy as np
+
+from entity_embeddings.artifacts import EmbeddingArtifacts, save_artifacts
+from entity_embeddings.artifacts.artifacts import DEFAULT_EMBEDDINGS_DIRNAME, load_artifacts
+from entity_embeddings.encoder import ColumnVocabulary, Vocabulary
+from entity_embeddings.similarity import CategorySimilarity, IVFIndex, Metric, exact_search
+from entity_embeddings.similarity.similarity import get_index_dir
+
+ARTIFACTS_DIR = 'test_similarity_artifacts'
+INDEX_DIR = 'test_similarity_index'
+
+
+def brute_force(table: np.ndarray, queries: np.ndarray, k: int, metric: str) -> np.ndarray:
+    if metric == Metric.COSINE:
+        table = table / np.linalg.norm(table, axis=1, keepdims=True)
+        queries = queries / np.linalg.norm(queries, axis=1, keepdims=True)
+        return np.argsort(-np.dot(queries, table.T), axis=1)[:, :k]
+
+    distances = np.linalg.norm(queries[:, np.newaxis] - table[np.newaxis], axis=2)
+    return np.argsort(distances, axis=1)[:, :k]
+
+
+class TestExactSearch(unittest.TestCase):
+    def setUp(self):
+        random_state = np.random.RandomState(0)
+        self.table = random_state.rand(500, 8).astype(np.float32)
+        self.queries = random_state.rand(20, 8).astype(np.float32)
+
+    def test_cosine_matches_brute_force(self):
+        ids, scores = exact_search(self.table, self.queries, 5, Metric.COSINE, block_size=64)
+
+        np.testing.assert_array_equal(ids, brute_force(self.table, self.queries, 5, Metric.COSINE))
+        self.assertTrue(np.all(np.diff(scores, axis=1) <= 0))
+        self.assertTrue(np.all(scores <= 1 + 1e-6))
+
+    def test_l2_matches_brute_force(self):
+        ids, distances = exact_search(self.table, self.queries, 5, Metric.L2, block_size=64)
+
+        np.testing.assert_array_equal(ids, brute_force(self.table, self.queries, 5, Metric.L2))
+        expected = np.linalg.norm(self.queries[:, np.newaxis] - self.table[ids], axis=2)
+        np.testing.assert_allclose(distances, expected, rtol=1e-4, atol=1e-5)
+
+    def test_block_size_does_not_change_results(self):
+        ids, _ = exact_search(self.table, self.queries, 10, block_size=7)
+        expected, _ = exact_search(self.table, self.queries, 10, block_size=len(self.table))
+
+        np.testing.assert_array_equal(ids, expected)
+
+    def test_single_query_and_k_greater_than_rows(self):
+        ids, scores = exact_search(self.table[:3], self.queries[0], 10)
+
+        self.assertTupleEqual(ids.shape, (1, 3))
+        self.assertTupleEqual(scores.shape, (1, 3))
+
+    def test_unknown_metric(self):
+        self.assertRaises(ValueError, exact_search, self.table, self.queries, 5, 'manhattan')
+
+
+class TestIVFIndex(unittest.TestCase):
+    def setUp(self):
+        random_state = np.random.RandomState(0)
+        centers = random_state.randn(20, 16) * 5
+        self.table = (centers[random_state.randint(0, 20, 2000)] + random_state.randn(2000, 16)).astype(np.float32)
+        self.queries = self.table[random_state.choice(2000, 50, replace=False)]
+
+    def tearDown(self):
+        shutil.rmtree(INDEX_DIR, ignore_errors=True)
+
+    def test_recall_against_exact_search(self):
+        for metric in Metric.OPTIONS:
+            index = IVFIndex.build(self.table, metric, n_lists=20, seed=0)
+            expected, _ = exact_search(self.table, self.queries, 10, metric)
+            ids, _ = index.search(self.queries, 10, n_probe=5)
+
+            recall = np.mean([len(np.intersect1d(found, exact)) / 10 for found, exact in zip(ids, expected)])
+            self.assertGreaterEqual(recall, 0.9)
+
+    def test_probing_every_list_is_exact(self):
+        index = IVFIndex.build(self.table, Metric.L2, n_lists=10, seed=0)
+        ids, distances = index.search(self.queries, 5, n_probe=10)
+        expected_ids, expected_distances = exact_search(self.table, self.queries, 5, Metric.L2)
+
+        np.testing.assert_array_equal(ids, expected_ids)
+        # the distances of a query to itself are only accurate up to the float32 cancellation of the expansion
+        np.testing.assert_allclose(distances, expected_distances, rtol=1e-4, atol=0.05)
+
+    def test_lists_partition_every_row(self):
+        index = IVFIndex.build(self.table, n_lists=10, seed=0)
+
+        self.assertEqual(index.list_offsets[-1], len(self.table))
+        np.testing.assert_array_equal(np.sort(index.ids), np.arange(len(self.table)))
+
+    def test_save_and_load(self):
+        index = IVFIndex.build(self.table, Metric.L2, n_lists=10, seed=0)
+        index.save(INDEX_DIR)
+        loaded = IVFIndex.load(INDEX_DIR)
+
+        self.assertEqual(loaded.metric, Metric.L2)
+        self.assertIsInstance(loaded.vectors, np.memmap)
+        np.testing.assert_array_equal(loaded.search(self.queries, 5)[0], index.search(self.queries, 5)[0])
+
+    def test_load_missing_index(self):
+        self.assertRaises(ValueError, IVFIndex.load, INDEX_DIR)
+
+
+class TestCategorySimilarity(unittest.TestCase):
+    def setUp(self):
+        self.column = ColumnVocabulary('store', np.array(['a', 'b', 'c', 'd'], dtype=object))
+        self.table = np.array([[1, 0], [0.9, 0.1], [0, 1], [-1, 0]], dtype=np.float32)
+
+    def tearDown(self):
+        shutil.rmtree(ARTIFACTS_DIR, ignore_errors=True)
+
+    def test_most_similar_excludes_the_value(self):
+        similar = CategorySimilarity(self.table, self.column).most_similar('a', k=2)
+
+        self.assertListEqual([value for value, _ in similar], ['b', 'c'])
+        self.assertGreater(similar[0][1], similar[1][1])
+
+    def test_most_similar_unknown_value(self):
+        self.assertRaises(KeyError, CategorySimilarity(self.table, self.column).most_similar, 'z')
+
+    def test_most_similar_on_pruned_column(self):
+        column = ColumnVocabulary('store', np.array(['a', 'c', 'd'], dtype=object), other=True)
+        similarity = CategorySimilarity(self.table[[0, 2, 3, 1]], column)
+
+        self.assertListEqual([value for value, _ in similarity.most_similar('a', k=3)], ['c', 'd'])
+        self.assertRaises(KeyError, similarity.most_similar, 'b')
+
+    def test_index_with_other_metric(self):
+        index = IVFIndex.build(self.table, Metric.L2, n_lists=2, seed=0)
+        self.assertRaises(ValueError, CategorySimilarity, self.table, self.column, Metric.COSINE, index)
+
+    def test_from_artifacts_with_saved_index(self):
+        other = ColumnVocabulary('product', np.array([1, 2, 3]))
+        path = os.path.join(ARTIFACTS_DIR, DEFAULT_EMBEDDINGS_DIRNAME)
+        save_artifacts(EmbeddingArtifacts.from_weights([np.random.rand(3, 2), self.table],
+                                                       Vocabulary([other, self.column])), path)
+
+        similarity = CategorySimilarity.from_artifacts(ARTIFACTS_DIR, 'store')
+        self.assertIsNone(similarity.index)
+
+        similarity.build_index(n_lists=2, seed=0)
+        similarity.save_index(get_index_dir(path, 'store', load_artifacts(path)))
+
+        loaded = CategorySimilarity.from_artifacts(ARTIFACTS_DIR, 'store')
+        self.assertIsInstance(loaded.index, IVFIndex)
+        self.assertListEqual([value for value, _ in loaded.most_similar('a', k=3, n_probe=2)], ['b', 'c', 'd'])
+
+    def test_from_artifacts_after_regrowing(self):
+        path = os.path.join(ARTIFACTS_DIR, DEFAULT_EMBEDDINGS_DIRNAME)
+        save_artifacts(EmbeddingArtifacts.from_weights([self.table], Vocabulary([self.column])), path)
+
+        similarity = CategorySimilarity.from_artifacts(ARTIFACTS_DIR, 'store')
+        similarity.build_index(n_lists=2, seed=0)
+        index_dir = get_index_dir(path, 'store', load_artifacts(path))
+        similarity.save_index(index_dir)
+
+        # a warm start grows the column, so the saved index no longer covers every value
+        grown = ColumnVocabulary('store', np.array(['a', 'b', 'c', 'd', 'e'], dtype=object))
+        table = np.vstack([self.table, [[0.5, 0.5]]]).astype(np.float32)
+        save_artifacts(EmbeddingArtifacts.from_weights([table], Vocabulary([grown])), path)
+        self.assertFalse(os.path.exists(index_dir))
+
+        # an index saved over the former embeddings is ignored as well
+        similarity.save_index(index_dir)
+        loaded = CategorySimilarity.from_artifacts(ARTIFACTS_DIR, 'store')
+        self.assertIsNone(loaded.index)
+        self.assertEqual(len(loaded.most_similar('a', k=4)), 4)
+
+    def test_index_over_other_table(self):
+        index = IVFIndex.build(self.table[:3], n_lists=2, seed=0)
+        self.assertRaises(ValueError, CategorySimilarity, self.table, self.column, Metric.COSINE, index)
@@ -0,0 +1,107 @@
+import shutil
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from entity_embeddings.artifacts import EmbeddingArtifacts, save_artifacts
+from entity_embeddings.encoder import CategoricalEncoder, HashedColumnVocabulary, Vocabulary
+from entity_embeddings.inference import EmbeddingStore, OutOfVocabulary
+from entity_embeddings.inference.oov import check_oov
+
+STORE_DIR = 'test_store'
+
+
+class TestStore(unittest.TestCase):
+    def setUp(self):
+        self.df = pd.DataFrame({'A': ['x', 'y', 'z', 'x'], 'B': [10, 20, 10, np.nan]})
+        _, self.vocabulary = CategoricalEncoder().fit_transform([self.df['A'].values, self.df['B'].values], ['A', 'B'])
+        self.weights = [np.arange(6, dtype=np.float32).reshape(3, 2),
+                        np.arange(9, dtype=np.float32).reshape(3, 3) + 100]
+
+    def test_transform_concatenates_embeddings(self):
+        store = EmbeddingStore.from_weights(self.weights, self.vocabulary)
+        embeddings = store.transform(self.df)
+
+        self.assertEqual(embeddings.dtype, np.float32)
+        self.assertTupleEqual(embeddings.shape, (4, 5))
+        self.assertListEqual(embeddings[0].tolist(), [0, 1, 100, 101, 102])
+        self.assertListEqual(embeddings[1].tolist(), [2, 3, 103, 104, 105])
+        self.assertListEqual(embeddings[3].tolist(), [0, 1, 106, 107, 108])
+
+    def test_transform_row_matches_batch(self):
+        store = EmbeddingStore.from_weights(self.weights, self.vocabulary)
+        embeddings = store.transform(self.df)
+
+        for index, row in enumerate(self.df.itertuples(index=False)):
+            self.assertListEqual(store.transform_row(list(row)).tolist(), embeddings[index].tolist())
+
+        self.assertListEqual(store.transform_row({'A': 'z', 'B': 20}).tolist(),
+                             embeddings[2, :2].tolist() + [103, 104, 105])
+
+    def test_out_of_vocabulary_zeros(self):
+        store = EmbeddingStore.from_weights(self.weights, self.vocabulary, OutOfVocabulary.ZEROS)
+
+        self.assertListEqual(store.transform_row(['w', 10]).tolist(), [0, 0, 100, 101, 102])
+        self.assertListEqual(store.transform([np.array(['w']), np.array([30])]).tolist(), [[0] * 5])
+
+    def test_out_of_vocabulary_mean(self):
+        store = EmbeddingStore.from_weights(self.weights, self.vocabulary, OutOfVocabulary.MEAN)
+
+        self.assertListEqual(store.transform_row(['w', 10]).tolist(), [2, 3, 100, 101, 102])
+
+    def test_out_of_vocabulary_error(self):
+        store = EmbeddingStore.from_weights(self.weights, self.vocabulary, OutOfVocabulary.ERROR)
+
+        self.assertRaises(ValueError, store.transform_row, ['w', 10])
+        self.assertRaises(ValueError, store.transform, pd.DataFrame({'A': ['x'], 'B': [30]}))
+
+    def test_invalid_out_of_vocabulary(self):
+        self.assertRaises(ValueError, EmbeddingStore.from_weights, self.weights, self.vocabulary, 'random')
+
+    def test_get_table(self):
+        store = EmbeddingStore.from_weights(self.weights, self.vocabulary)
+
+        self.assertListEqual(store.get_table('B').tolist(), self.weights[1].tolist())
+        self.assertEqual(store.embedding_size, 5)
+
+    def test_load(self):
+        save_artifacts(EmbeddingArtifacts.from_weights(self.weights, self.vocabulary), STORE_DIR)
+
+        store = EmbeddingStore.load(STORE_DIR)
+        self.assertIsInstance(store.buffer, np.memmap)
+        self.assertListEqual(store.transform(self.df).tolist(),
+                             EmbeddingStore.from_weights(self.weights, self.vocabulary).transform(self.df).tolist())
+
+        del store
+        shutil.rmtree(STORE_DIR)
+
+    def test_hashed_columns(self):
+        df = pd.DataFrame({'A': ['x', 'y', 'z'], 'user': ['u1', 'u2', 'never seen']})
+        vocabulary = Vocabulary([self.vocabulary['A'], HashedColumnVocabulary('user', 5, n_hashes=3)])
+        user_weights = np.arange(10, dtype=np.float32).reshape(5, 2) * 10
+
+        store = EmbeddingStore.from_weights([self.weights[0], user_weights], vocabulary, OutOfVocabulary.ERROR)
+        embeddings = store.transform(df)
+
+        buckets = vocabulary['user'].get_buckets(vocabulary['user'].transform(df['user'].values))
+        np.testing.assert_array_equal(embeddings[:, :2], self.weights[0])
+        np.testing.assert_array_equal(embeddings[:, 2:], user_weights[buckets].sum(axis=1))
+
+        for index, row in enumerate(df.itertuples(index=False)):
+            np.testing.assert_array_equal(store.transform_row(list(row)), embeddings[index])
+
+    def test_pruned_columns_embed_unknown_values_as_other(self):
+        df = pd.DataFrame({'A': ['x', 'x', 'y']})
+        _, vocabulary = CategoricalEncoder(min_frequency=2).fit_transform([df['A'].values], ['A'])
+        weights = [np.array([[1, 1], [2, 2]], dtype=np.float32)]
+
+        store = EmbeddingStore.from_weights(weights, vocabulary, OutOfVocabulary.ERROR)
+
+        self.assertListEqual(store.transform(np.array([['x'], ['y'], ['unseen']], dtype=object)).tolist(),
+                             [[1, 1], [2, 2], [2, 2]])
+        self.assertListEqual(store.transform_row(['unseen']).tolist(), [2, 2])
+
+    def test_check_oov(self) -> None:
+        check_oov('mean')
+        self.assertRaises(ValueError, check_oov, 'random')
@@ -0,0 +1,97 @@
+import shutil
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+
+from entity_embeddings.encoder import CategoricalEncoder
+from entity_embeddings.processor import BinaryClassificationProcessor, MulticlassClassificationProcessor
+from entity_embeddings.util.dataframe_utils import create_random_csv, remove_random_csv, load_guarantee_not_empty
+from entity_embeddings.util.preprocessing_utils import get_X_y_columnar
+from entity_embeddings.util.sampling_utils import ReservoirSampler
+from entity_embeddings.util.streaming_utils import scan_csv, encode_csv
+
+
+class TestStreamingUtils(unittest.TestCase):
+    def setUp(self):
+        self.csv_path = create_random_csv(rows=50, cols=4, columns='ABCD')
+        self.df = load_guarantee_not_empty(self.csv_path)
+
+    def tearDown(self):
+        remove_random_csv()
+
+    def test_scan_csv_matches_in_memory_encoding(self):
+        csv_scan = scan_csv(self.csv_path, 'D', chunk_size=7)
+
+        X, y = get_X_y_columnar(self.df, 'D')
+        _, expected = CategoricalEncoder().fit_transform(X, ['A', 'B', 'C'])
+
+        self.assertEqual(csv_scan.n_rows, 50)
+        self.assertListEqual(csv_scan.target_classes.tolist(), np.unique(y).tolist())
+        self.assertListEqual(csv_scan.vocabulary.names, expected.names)
+        for column, expected_column in zip(csv_scan.vocabulary, expected):
+            self.assertListEqual(column.values.tolist(), expected_column.values.tolist())
+
+    def test_encode_csv(self):
+        csv_scan = scan_csv(self.csv_path, 'D', chunk_size=7)
+        target_classes = csv_scan.target_classes
+        output_dir = 'test_encoded'
+
+        X_encoded, y_encoded = encode_csv(self.csv_path, 'D', csv_scan.vocabulary, target_classes,
+                                          MulticlassClassificationProcessor(), csv_scan.n_rows, 7, output_dir)
+
+        X, y = get_X_y_columnar(self.df, 'D')
+        expected, _ = CategoricalEncoder().fit_transform(X, ['A', 'B', 'C'])
+
+        self.assertIsInstance(X_encoded, np.memmap)
+        self.assertEqual(X_encoded.dtype, expected.dtype)
+        self.assertListEqual(X_encoded.tolist(), expected.tolist())
+        self.assertListEqual(y_encoded.argmax(axis=1).tolist(), np.searchsorted(target_classes, y).tolist())
+        self.assertEqual(y_encoded.shape[1], len(target_classes))
+
+        del X_encoded, y_encoded
+        shutil.rmtree(output_dir)
+
+    def test_encode_csv_by_reservoir(self):
+        csv_scan = scan_csv(self.csv_path, 'D', chunk_size=7)
+        output_dir = 'test_encoded'
+
+        X_encoded, y_encoded = encode_csv(self.csv_path, 'D', csv_scan.vocabulary, csv_scan.target_classes,
+                                          MulticlassClassificationProcessor(), csv_scan.n_rows, 7, output_dir,
+                                          sample_size=10, seed=0)
+
+        # the same rows are drawn when the sampler is fed the same chunks
+        sampler = ReservoirSampler(10, np.random.RandomState(0))
+        for _ in range(7):
+            sampler.update(7)
+        sampler.update(1)
+
+        X, _ = get_X_y_columnar(self.df, 'D')
+        expected, _ = CategoricalEncoder().fit_transform(X, ['A', 'B', 'C'])
+
+        self.assertEqual(X_encoded.shape, (10, 3))
+        self.assertListEqual(X_encoded.tolist(), expected[sampler.get_indices()].tolist())
+        self.assertEqual(len(y_encoded), 10)
+
+        del X_encoded, y_encoded
+        shutil.rmtree(output_dir)
+
+    def test_scan_csv_without_classes(self):
+        csv_scan = scan_csv(self.csv_path, 'D', chunk_size=7, collect_classes=False)
+
+        self.assertIsNone(csv_scan.target_classes)
+        self.assertEqual(csv_scan.n_rows, 50)
+
+    def test_scan_csv_too_many_classes(self):
+        with patch('entity_embeddings.util.streaming_utils.MAX_TARGET_CLASSES', 2):
+            self.assertRaises(ValueError, scan_csv, self.csv_path, 'D', 7)
+
+    def test_scan_csv_target_not_existent(self):
+        self.assertRaises(ValueError, scan_csv, self.csv_path, 'E', 7)
+
+    def test_binary_processor_chunk_is_stable(self):
+        processor = BinaryClassificationProcessor()
+        classes = np.array([3, 7])
+
+        # a chunk containing a single class keeps the encoding of the whole dataset
+        self.assertListEqual(processor.process_target_chunk(np.array([7, 7]), classes).tolist(), [1, 1])
@@ -0,0 +1,34 @@
+import unittest
+
+import numpy as np
+
+from entity_embeddings.util.table_utils import make_fused_indices, get_column_slices
+
+
+class TestTableUtils(unittest.TestCase):
+    def setUp(self):
+        self.input_dims = [3, 5, 2]
+        self.output_dims = [2, 3, 2]
+
+    def test_column_slices(self):
+        self.assertListEqual(get_column_slices(self.input_dims, self.output_dims), [(0, 6), (6, 21), (21, 25)])
+
+    def test_fused_gather_matches_per_column_lookup(self):
+        table = np.arange(np.dot(self.input_dims, self.output_dims))
+        matrices = [table[start:end].reshape(input_dim, output_dim)
+                    for (start, end), input_dim, output_dim in zip(get_column_slices(self.input_dims, self.output_dims),
+                                                                   self.input_dims, self.output_dims)]
+        X = np.array([[0, 4, 1],
+                      [2, 0, 0],
+                      [1, 3, 1]])
+
+        columns, offsets, strides = make_fused_indices(self.input_dims, self.output_dims)
+        fused = table[X[:, columns] * strides + offsets]
+
+        expected = np.concatenate([matrices[column][X[:, column]] for column in range(X.shape[1])], axis=1)
+        self.assertListEqual(fused.tolist(), expected.tolist())
+
+    def test_fused_indices_dtype(self):
+        for indices in make_fused_indices(self.input_dims, self.output_dims):
+            self.assertEqual(indices.dtype, np.int32)
+            self.assertEqual(len(indices), sum(self.output_dims))
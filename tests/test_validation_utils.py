@@ -1,11 +1,14 @@
 import unittest
 
+import numpy as np
 import pandas as pd
 
 from entity_embeddings.util import dataframe_utils
 from entity_embeddings.util.validation_utils import check_csv_data, check_not_empty_dataframe, check_target_name, \
     check_target_existent_in_df, check_train_ratio, check_epochs, check_batch_size, check_weights_output, \
-    check_target_processor, check_model_assembler
+    check_target_processor, check_model_assembler, check_chunk_size, check_data_source, check_encoded_features, \
+    check_batch_feeding, check_pruning, check_encoding_workers, check_training_control, check_warm_start, \
+    check_validation_rows
 
 
 class TestValidationUtils(unittest.TestCase):
@@ -64,3 +67,62 @@ class TestValidationUtils(unittest.TestCase):
     def test_check_model_assembler(self) -> None:
         invalid_assembler = ()
         self.assertRaises(ValueError, check_model_assembler, invalid_assembler)
+
+    def test_check_chunk_size(self) -> None:
+        chunk_size = 0
+        self.assertRaises(ValueError, check_chunk_size, chunk_size)
+
+    def test_check_batch_feeding(self) -> None:
+        check_batch_feeding(None, 0, 10)
+        self.assertRaises(ValueError, check_batch_feeding, 0, 1, 10)
+        self.assertRaises(ValueError, check_batch_feeding, None, -1, 10)
+        self.assertRaises(ValueError, check_batch_feeding, None, 1, 0)
+
+    def test_check_pruning(self) -> None:
+        check_pruning(None, None, True)
+        check_pruning(5, 100, False)
+        self.assertRaises(ValueError, check_pruning, 0, None, False)
+        self.assertRaises(ValueError, check_pruning, None, 0, False)
+        self.assertRaises(ValueError, check_pruning, 5, None, True)
+
+    def test_check_encoding_workers(self) -> None:
+        check_encoding_workers(4)
+        self.assertRaises(ValueError, check_encoding_workers, 0)
+
+    def test_check_training_control(self) -> None:
+        check_training_control(0.0, None, None, None, 0.1)
+        check_training_control(0.001, 5, None, 2, 0.5)
+        self.assertRaises(ValueError, check_training_control, -1.0, None, None, None, 0.1)
+        self.assertRaises(ValueError, check_training_control, 0.0, -1, None, None, 0.1)
+        self.assertRaises(ValueError, check_training_control, 0.0, None, None, -1, 0.1)
+        self.assertRaises(ValueError, check_training_control, 0.0, None, None, 2, 1.5)
+        self.assertRaises(ValueError, check_training_control, 0.0, None, lambda epoch: 0.01, 2, 0.1)
+
+    def test_check_warm_start(self) -> None:
+        check_warm_start(None, True, 1000, None)
+        check_warm_start('.', False, None, None)
+        self.assertRaises(ValueError, check_warm_start, 'not_existent_artifacts', False, None, None)
+        self.assertRaises(ValueError, check_warm_start, '.', True, None, None)
+        self.assertRaises(ValueError, check_warm_start, '.', False, 1000, None)
+
+    def test_check_validation_rows(self) -> None:
+        check_validation_rows(None)
+        check_validation_rows(np.array([0, 5]))
+        self.assertRaises(ValueError, check_validation_rows, np.array([]))
+        self.assertRaises(ValueError, check_validation_rows, np.array([0.5]))
+        self.assertRaises(ValueError, check_validation_rows, np.zeros((2, 2), dtype=int))
+
+    def test_check_data_source_without_csv_nor_df(self) -> None:
+        self.assertRaises(ValueError, check_data_source, None, None, None)
+
+    def test_check_data_source_chunks_from_df(self) -> None:
+        df = dataframe_utils.create_random_dataframe()
+        self.assertRaises(ValueError, check_data_source, None, df, 10)
+
+    def test_check_encoded_features_not_integer(self) -> None:
+        X = np.array([[0.5, 1.0]])
+        self.assertRaises(ValueError, check_encoded_features, X)
+
+    def test_check_encoded_features_negative(self) -> None:
+        X = np.array([[0, -1]])
+        self.assertRaises(ValueError, check_encoded_features, X)